@@ -0,0 +1,229 @@
+# Bounded alert fan-out for high-confidence signals.
+# Alerts are queued without blocking the caller, coalesced into one digest per window,
+# and sent by one long-lived worker per channel under a per-channel rate limit. While a
+# channel is rate-limited its pending digests merge into as few messages as fit within
+# `max_digest` alerts and MAX_MESSAGE_CHARS characters; the rest wait for the next send.
+import queue
+import threading
+import time
+
+import batch_queue
+
+# === CONFIGURATION ===
+QUEUE_SIZE = 1000  # alerts waiting for the next digest; more are dropped
+DIGEST_WINDOW = 5.0  # seconds an alert may wait for others to join its digest
+MAX_DIGEST = 50  # alerts per digest at most
+MAX_MESSAGE_CHARS = 4096  # Telegram's limit; a longer digest is split across messages
+RATE_LIMITS = {"telegram": (20, 60), "email": (6, 60)}  # channel -> (messages, per seconds)
+
+
+def format_alert(signal):
+    return (f"{signal['symbol']} - {signal['direction']} ({signal['reason']})\n"
+            f"Confidence: {signal['confidence']}\n"
+            f"Time: {signal['timestamp']}")
+
+
+def format_digest(signals):
+    """(subject, text) for one message covering `signals`."""
+    if len(signals) == 1:
+        return "Signal Alert", "🔔 Signal Alert!\n" + format_alert(signals[0])
+    lines = "\n\n".join(format_alert(signal) for signal in signals)
+    return f"{len(signals)} Signal Alerts", f"🔔 {len(signals)} Signal Alerts\n\n{lines}"
+
+
+def digest_size(signals, max_alerts, max_chars):
+    """How many leading `signals` fit one message (always at least one)."""
+    count = 1
+    while count < min(len(signals), max_alerts) and len(format_digest(signals[:count + 1])[1]) <= max_chars:
+        count += 1
+    return count
+
+
+# === CHANNELS ===
+class TelegramChannel:
+    """
+    python-telegram-bot >= 20 is async and its pooled HTTP client stays bound to the loop
+    it first ran on, so every send from this channel's worker thread runs on one loop.
+    """
+    name = "telegram"
+
+    def __init__(self, token, chat_id):
+        self.token = token
+        self.chat_id = chat_id
+        self.bot = None
+        self.loop = None
+
+    def send(self, subject, text):
+        if self.bot is None:
+            from telegram import Bot
+            self.bot = Bot(token=self.token)
+        result = self.bot.send_message(chat_id=self.chat_id, text=text)
+        if hasattr(result, "__await__"):
+            self._run(result)
+
+    def _run(self, coro):
+        if self.loop is None:
+            import asyncio
+            self.loop = asyncio.new_event_loop()
+        return self.loop.run_until_complete(coro)
+
+    def close(self):
+        if self.loop is None:
+            return
+        try:
+            if hasattr(self.bot, "shutdown"):
+                self._run(self.bot.shutdown())
+        except Exception:
+            pass
+        self.loop.close()
+        self.loop = None
+
+
+class EmailChannel:
+    """Keeps one SMTP session open across digests and reconnects only after a failure."""
+    name = "email"
+
+    def __init__(self, user, password, receiver):
+        self.user = user
+        self.password = password
+        self.receiver = receiver
+        self.smtp = None
+
+    def send(self, subject, text):
+        if self.smtp is None:
+            import yagmail
+            self.smtp = yagmail.SMTP(self.user, self.password)
+        try:
+            self.smtp.send(to=self.receiver, subject=subject, contents=text)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.close()
+            except Exception:
+                pass
+            self.smtp = None
+
+
+class MemoryChannel:
+    """Local stand-in that records messages instead of sending them."""
+
+    def __init__(self, name="memory"):
+        self.name = name
+        self.messages = []
+
+    def send(self, subject, text):
+        self.messages.append((subject, text))
+
+
+# === DISPATCHER ===
+class RateLimiter:
+    """Token bucket allowing `rate` messages per `per` seconds."""
+
+    def __init__(self, rate, per):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+
+    def delay(self):
+        """Seconds until a message may be sent (0 when one may be sent now)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.fill_rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class AlertDispatcher:
+    def __init__(self, channels, window=DIGEST_WINDOW, maxsize=QUEUE_SIZE, max_digest=MAX_DIGEST, rate_limits=None,
+                 max_chars=MAX_MESSAGE_CHARS):
+        self.channels = channels
+        self.window = window
+        self.max_digest = max_digest
+        self.max_chars = max_chars
+        rate_limits = RATE_LIMITS if rate_limits is None else rate_limits
+        self.limiters = {c.name: RateLimiter(*rate_limits[c.name]) for c in channels if c.name in rate_limits}
+        self.queue = batch_queue.BatchQueue(maxsize)
+        self.dropped = 0
+        self.sent = {c.name: 0 for c in channels}
+        self._closing = threading.Event()
+        self.channel_queues = {c.name: queue.Queue() for c in channels}
+        self.threads = [threading.Thread(target=self._collect, name="alert-digest", daemon=True)]
+        self.threads += [threading.Thread(target=self._deliver, args=(c,), name=f"alert-{c.name}", daemon=True)
+                         for c in channels]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, signal):
+        try:
+            self.queue.put_nowait(signal)
+        except queue.Full:
+            self.dropped += 1
+            print(f"[Alert] Queue full, dropped {signal['symbol']} alert ({self.dropped} total)")
+
+    def close(self, timeout=None):
+        """Send whatever is pending (ignoring rate limits) and stop the workers."""
+        self._closing.set()
+        self.queue.put(batch_queue.STOP)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self.threads)
+
+    def _collect(self):
+        while True:
+            batch = self.queue.next_batch(self.max_digest, self.window)
+            signals, stopped = batch_queue.split(batch)
+            for q in self.channel_queues.values():
+                if signals:
+                    q.put(signals)
+                if stopped:
+                    q.put(batch_queue.STOP)
+            if stopped:
+                return
+
+    def _deliver(self, channel):
+        q = self.channel_queues[channel.name]
+        limiter = self.limiters.get(channel.name)
+        backlog = []  # signals waiting for a message, oldest first
+        stopping = False
+
+        def take(digest):
+            if digest is batch_queue.STOP:
+                return True
+            backlog.extend(digest)
+            return False
+
+        while True:
+            if not backlog and not stopping:
+                stopping = take(q.get())
+            if limiter and backlog:
+                delay = limiter.delay()
+                while delay > 0 and not self._closing.wait(delay):
+                    delay = limiter.delay()
+                limiter.take()
+            # Digests that queued up while rate-limited join the backlog; each message takes as
+            # many of its alerts as fit, the rest go out with the next one.
+            while not stopping:
+                try:
+                    stopping = take(q.get_nowait())
+                except queue.Empty:
+                    break
+            if backlog:
+                count = digest_size(backlog, self.max_digest, self.max_chars)
+                signals, backlog = backlog[:count], backlog[count:]
+                try:
+                    channel.send(*format_digest(signals))
+                    self.sent[channel.name] += 1
+                except Exception as e:
+                    print(f"[Alert] {channel.name} failed: {e}")
+            if stopping and not backlog:
+                if hasattr(channel, "close"):
+                    channel.close()
+                return
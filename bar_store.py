@@ -0,0 +1,201 @@
+import os
+import json
+import functools
+
+import numpy as np
+import pandas as pd
+
+# === CONFIGURATION ===
+DEFAULT_TIMEFRAME = "H1"
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+TIME_DTYPE = "datetime64[ns]"
+
+
+def _stat_fingerprint(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _replace_with(path, write):
+    """Write to a temp file with `write(tmp_path)` and rename it over `path`, so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_prefix(path, size, data, tmp_path):
+    """Copy the first `size` bytes of `path` to `tmp_path`, followed by `data`."""
+    with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+        dst.write(src.read(size))
+        dst.write(data)
+
+
+def _atomic_write_json(path, obj):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f)
+    os.replace(tmp_path, path)
+
+
+# === CSV BACKEND (compatibility) ===
+class CsvBarStore:
+    """One `{symbol}_{timeframe}.csv` per symbol, as Module A has always written."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        return os.path.join(self.folder, f"{symbol}_{timeframe}.csv")
+
+    def exists(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        return os.path.exists(self.path(symbol, timeframe))
+
+    def fingerprint(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        """Changes whenever the stored bars change; None if the symbol has no data."""
+        return _stat_fingerprint(self.path(symbol, timeframe))
+
+    def write(self, symbol, df, timeframe=DEFAULT_TIMEFRAME):
+        _replace_with(self.path(symbol, timeframe), df.to_csv)
+
+    def append(self, symbol, df, timeframe=DEFAULT_TIMEFRAME):
+        path = self.path(symbol, timeframe)
+        df.to_csv(path, mode="a", header=not os.path.exists(path))
+
+    def read(self, symbol, columns=None, timeframe=DEFAULT_TIMEFRAME):
+        usecols = None if columns is None else ["time", *columns]
+        return pd.read_csv(self.path(symbol, timeframe), parse_dates=["time"], index_col="time", usecols=usecols)
+
+    def truncate(self, symbol, rows, timeframe=DEFAULT_TIMEFRAME):
+        path = self.path(symbol, timeframe)
+        _replace_with(path, pd.read_csv(path, index_col="time").iloc[:rows].to_csv)
+
+    def last_time(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        if not self.exists(symbol, timeframe):
+            return None
+        index = self.read(symbol, columns=[], timeframe=timeframe).index
+        return index[-1] if len(index) else None
+
+
+# === COLUMNAR BACKEND ===
+class ColumnarBarStore:
+    """
+    One directory per symbol/timeframe holding a raw little-endian file per column
+    plus `meta.json` (schema and committed row count). Columns are memory-mapped on
+    read so callers only touch the columns they project; appends write the new rows
+    to each column file and then commit the row count atomically.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        return os.path.join(self.folder, f"{symbol}_{timeframe}")
+
+    def exists(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        return os.path.exists(os.path.join(self.path(symbol, timeframe), META_FILE))
+
+    def load_meta(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        with open(os.path.join(self.path(symbol, timeframe), META_FILE)) as f:
+            return json.load(f)
+
+    def fingerprint(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        """Changes whenever rows are committed; meta.json is replaced on every write, append and truncate."""
+        return _stat_fingerprint(os.path.join(self.path(symbol, timeframe), META_FILE))
+
+    @staticmethod
+    def _column_arrays(df):
+        arrays = {"time": np.asarray(df.index, dtype=TIME_DTYPE).view("int64")}
+        for column in df.columns:
+            arrays[column] = np.ascontiguousarray(df[column].to_numpy())
+        return arrays
+
+    def write(self, symbol, df, timeframe=DEFAULT_TIMEFRAME):
+        directory = self.path(symbol, timeframe)
+        os.makedirs(directory, exist_ok=True)
+        arrays = self._column_arrays(df)
+        for column, values in arrays.items():
+            # Each column file is replaced, not rewritten in place, so open memory maps keep the old bytes.
+            _replace_with(os.path.join(directory, f"{column}.bin"), values.astype(values.dtype.newbyteorder("<")).tofile)
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": len(df),
+            "columns": {column: values.dtype.newbyteorder("<").str for column, values in arrays.items()},
+        }
+        _atomic_write_json(os.path.join(directory, META_FILE), meta)
+
+    def append(self, symbol, df, timeframe=DEFAULT_TIMEFRAME):
+        if not self.exists(symbol, timeframe):
+            return self.write(symbol, df, timeframe)
+        directory = self.path(symbol, timeframe)
+        meta = self.load_meta(symbol, timeframe)
+        arrays = self._column_arrays(df)
+        if set(arrays) != set(meta["columns"]):
+            raise ValueError(f"Schema mismatch appending to {symbol}_{timeframe}: {sorted(arrays)}")
+
+        rows = meta["rows"]
+        for column, dtype in meta["columns"].items():
+            dtype = np.dtype(dtype)
+            path = os.path.join(directory, f"{column}.bin")
+            committed = rows * dtype.itemsize
+            data = arrays[column].astype(dtype).tobytes()
+            if os.path.getsize(path) > committed:
+                # Bytes past the committed rows (a truncate, or an interrupted append) may still be
+                # mapped by readers: write a new file instead of shrinking or overwriting this one.
+                _replace_with(path, functools.partial(_write_prefix, path, committed, data))
+            else:
+                with open(path, "ab") as f:
+                    f.write(data)
+        meta["rows"] = rows + len(df)
+        _atomic_write_json(os.path.join(directory, META_FILE), meta)
+
+    def read(self, symbol, columns=None, timeframe=DEFAULT_TIMEFRAME):
+        directory = self.path(symbol, timeframe)
+        meta = self.load_meta(symbol, timeframe)
+        rows = meta["rows"]
+        wanted = [c for c in meta["columns"] if c != "time"] if columns is None else list(columns)
+
+        def column_values(column):
+            dtype = np.dtype(meta["columns"][column])
+            if rows == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(os.path.join(directory, f"{column}.bin"), dtype=dtype, mode="r", shape=(rows,))
+
+        # Copied: the index must not keep the memory map alive (the columns are copied by the DataFrame).
+        index = pd.DatetimeIndex(np.array(column_values("time")).view(TIME_DTYPE), name="time")
+        return pd.DataFrame({column: column_values(column) for column in wanted}, index=index)
+
+    def truncate(self, symbol, rows, timeframe=DEFAULT_TIMEFRAME):
+        """Drop rows past `rows`; the next append replaces the column files without them."""
+        meta = self.load_meta(symbol, timeframe)
+        if rows < meta["rows"]:
+            meta["rows"] = rows
+            _atomic_write_json(os.path.join(self.path(symbol, timeframe), META_FILE), meta)
+
+    def last_time(self, symbol, timeframe=DEFAULT_TIMEFRAME):
+        if not self.exists(symbol, timeframe):
+            return None
+        meta = self.load_meta(symbol, timeframe)
+        if meta["rows"] == 0:
+            return None
+        with open(os.path.join(self.path(symbol, timeframe), "time.bin"), "rb") as f:
+            f.seek((meta["rows"] - 1) * 8)
+            return pd.Timestamp(np.frombuffer(f.read(8), dtype="<i8")[0].astype(TIME_DTYPE))
+
+
+BACKENDS = {
+    "csv": CsvBarStore,
+    "columnar": ColumnarBarStore,
+}
+
+
+def open_store(backend, folder):
+    try:
+        return BACKENDS[backend](folder)
+    except KeyError:
+        raise ValueError(f"Unknown bar store backend: {backend}")
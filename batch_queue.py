@@ -0,0 +1,55 @@
+# Bounded queue drained in batches by a consumer thread.
+# A batch closes when it holds `max_batch` items or `flush_interval` seconds after its first
+# item, whichever comes first, or as soon as the STOP marker is taken. Used by the SQLite
+# writer, the router's destination sinks, the alert digests and Module B's dispatcher.
+import queue
+import time
+
+STOP = object()  # put on a queue to stop its consumer once everything before it is handled
+
+
+class BatchQueue(queue.Queue):
+    def next_batch(self, max_batch, flush_interval, idle_timeout=None):
+        """
+        Wait up to `idle_timeout` seconds (forever if None) for a first item, then collect
+        more for up to `flush_interval` seconds. Returns [] if nothing arrived.
+        """
+        try:
+            first = self.get(timeout=idle_timeout)
+        except queue.Empty:
+            return []
+        batch = [first]
+        if first is STOP:
+            return batch
+        deadline = time.monotonic() + flush_interval
+        while len(batch) < max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.get(timeout=remaining) if remaining > 0 else self.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is STOP:
+                break
+        return batch
+
+    def batch_done(self, batch):
+        for _ in batch:
+            self.task_done()
+
+    def wait_done(self, timeout=None):
+        """Block until every item put so far has been marked done; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.all_tasks_done:
+            while self.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.all_tasks_done.wait(remaining)
+        return True
+
+
+def split(batch):
+    """(items, stopped): the batch without the STOP marker, and whether it held one."""
+    items = [item for item in batch if item is not STOP]
+    return items, len(items) < len(batch)
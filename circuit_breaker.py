@@ -0,0 +1,140 @@
+# Destination health tracking for the router.
+# A CircuitBreaker fails fast while a destination is down and lets a single trial call
+# through after `reset_timeout`; a SpillBuffer holds work for an unhealthy destination,
+# in memory up to `memory_items` and in a JSON-lines file beyond that, so an outage costs
+# neither router throughput nor unbounded memory.
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+
+# === CONFIGURATION ===
+FAILURE_THRESHOLD = 5  # consecutive failures that open the circuit
+RESET_TIMEOUT = 10.0  # seconds open before a half-open trial
+SPILL_FOLDER = "router_spill"
+MEMORY_ITEMS = 1000
+MAX_ITEMS = 1_000_000
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one trial call at a time."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._trial = False
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logging.info(f"[Circuit] {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                logging.warning(f"[Circuit] {self.name} open after {self.failures} failures")
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+
+class SpillBuffer:
+    """
+    FIFO of JSON-serializable tuples; overflow past `memory_items` goes to disk and
+    survives restarts. Items read back from disk are tuples again.
+    """
+
+    def __init__(self, name, folder=SPILL_FOLDER, memory_items=MEMORY_ITEMS, max_items=MAX_ITEMS):
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"{name}.jsonl")
+        self.memory_items = memory_items
+        self.max_items = max_items
+        self.memory = deque()
+        self.spilled = 0
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.spilled = sum(1 for _ in f)
+
+    def __len__(self):
+        return len(self.memory) + self.spilled
+
+    def push(self, items):
+        """Append items; returns those dropped because the buffer is full."""
+        dropped = []
+        with self._lock:
+            overflow = []
+            for item in items:
+                if len(self.memory) + self.spilled + len(overflow) >= self.max_items:
+                    dropped.append(item)
+                elif not self.spilled and not overflow and len(self.memory) < self.memory_items:
+                    self.memory.append(item)
+                else:
+                    # Once anything is on disk, newer items follow it there to keep FIFO order.
+                    overflow.append(item)
+            if overflow:
+                with open(self.path, "a") as f:
+                    f.writelines(json.dumps(item) + "\n" for item in overflow)
+                self.spilled += len(overflow)
+        return dropped
+
+    def push_front(self, items):
+        """Return items taken by `pop` that could not be delivered, ahead of everything else."""
+        with self._lock:
+            self.memory.extendleft(reversed(items))
+
+    def pop(self, n):
+        with self._lock:
+            if not self.memory and self.spilled:
+                self._load()
+            return [self.memory.popleft() for _ in range(min(n, len(self.memory)))]
+
+    def _load(self):
+        with open(self.path) as f:
+            lines = f.readlines()
+        keep = max(self.memory_items, 1)
+        head, rest = lines[:keep], lines[keep:]
+        for line in head:
+            try:
+                self.memory.append(tuple(json.loads(line)))
+            except ValueError:
+                logging.error(f"[Spill] Skipping unreadable entry in {self.path}")
+        if rest:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.writelines(rest)
+            os.replace(tmp_path, self.path)
+        else:
+            os.remove(self.path)
+        self.spilled = len(rest)
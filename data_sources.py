@@ -0,0 +1,146 @@
+import time
+
+import numpy as np
+
+import bar_store
+
+# === TIMEFRAMES ===
+# Same codes as MetaTrader5.TIMEFRAME_*, so callers do not need the terminal package to name them.
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 0x4000 | 1
+TIMEFRAME_H4 = 0x4000 | 4
+TIMEFRAME_D1 = 0x4000 | 24
+
+TIMEFRAME_LABELS = {
+    TIMEFRAME_M1: "M1",
+    TIMEFRAME_M5: "M5",
+    TIMEFRAME_M15: "M15",
+    TIMEFRAME_M30: "M30",
+    TIMEFRAME_H1: "H1",
+    TIMEFRAME_H4: "H4",
+    TIMEFRAME_D1: "D1",
+}
+TIMEFRAME_SECONDS = {
+    TIMEFRAME_M1: 60,
+    TIMEFRAME_M5: 300,
+    TIMEFRAME_M15: 900,
+    TIMEFRAME_M30: 1800,
+    TIMEFRAME_H1: 3600,
+    TIMEFRAME_H4: 14400,
+    TIMEFRAME_D1: 86400,
+}
+
+# Record layout returned by MetaTrader5.copy_rates_from_pos
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+
+
+# === LIVE SOURCE ===
+class MT5DataSource:
+    """Thin wrapper over the MetaTrader5 terminal API, imported on first use."""
+
+    def __init__(self):
+        self._mt5 = None
+
+    @property
+    def mt5(self):
+        if self._mt5 is None:
+            import MetaTrader5
+            self._mt5 = MetaTrader5
+        return self._mt5
+
+    def initialize(self):
+        return self.mt5.initialize()
+
+    def shutdown(self):
+        if self._mt5 is not None:
+            self._mt5.shutdown()
+
+    def last_error(self):
+        return self.mt5.last_error()
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        return self.mt5.copy_rates_from_pos(symbol, timeframe, start_pos, count)
+
+
+# === REPLAY SOURCE ===
+class ReplayDataSource:
+    """
+    Serves stored OHLC history as if it were the terminal. A virtual clock decides
+    which bars exist: only bars that have fully closed by `now` are returned, so
+    strategies never see the future. `play` advances the clock bar by bar, either
+    as fast as possible (speed=None) or at `speed` times real time.
+    """
+
+    def __init__(self, folder, backend="columnar", speed=None, start=None):
+        self.store = bar_store.open_store(backend, folder)
+        self.speed = speed
+        self.now = start
+        self._history = {}
+
+    def initialize(self):
+        return True
+
+    def shutdown(self):
+        self._history.clear()
+
+    def last_error(self):
+        return (0, "")
+
+    def history(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        if key not in self._history:
+            df = self.store.read(symbol, timeframe=TIMEFRAME_LABELS[timeframe])
+            rates = np.zeros(len(df), dtype=RATES_DTYPE)
+            rates["time"] = np.asarray(df.index, dtype="datetime64[s]").astype("int64")
+            for field in RATES_DTYPE.names[1:]:
+                if field in df.columns:
+                    rates[field] = df[field].to_numpy()
+            self._history[key] = rates
+        return self._history[key]
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        try:
+            rates = self.history(symbol, timeframe)
+        except FileNotFoundError:
+            return None
+        if self.now is None:
+            end = len(rates)
+        else:
+            closes = rates["time"] + TIMEFRAME_SECONDS[timeframe]
+            end = int(np.searchsorted(closes, self.now, side="right"))
+        end -= start_pos
+        if end <= 0:
+            return None
+        return rates[max(0, end - count):end].copy()
+
+    def play(self, symbol, timeframe=TIMEFRAME_H1, start=None, end=None):
+        """Step the clock to each bar close of `symbol` in [start, end], yielding the new time."""
+        closes = self.history(symbol, timeframe)["time"] + TIMEFRAME_SECONDS[timeframe]
+        if start is not None:
+            closes = closes[closes >= start]
+        if end is not None:
+            closes = closes[closes <= end]
+        if len(closes) == 0:
+            return
+
+        wall_start = time.monotonic()
+        first = int(closes[0])
+        for close_time in closes:
+            if self.speed:
+                delay = (close_time - first) / self.speed - (time.monotonic() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+            self.now = int(close_time)
+            yield self.now
@@ -0,0 +1,200 @@
+# Client for the economic filter service.
+# Answers are cached per (symbol, time bucket) for `ttl` seconds, so signals for the same
+# symbol in the same minute cost one round trip. Concurrent identical lookups share a single
+# request, `check_many` resolves a batch of signals in one POST, and when the service is
+# unavailable a recent answer for the same (symbol, bucket) is served, or UNKNOWN_RESULT, which
+# neither blocks nor penalizes the signal. Answers from other buckets never stand in.
+# A LocalEconomicFilter can answer from an event calendar snapshot without any round trip.
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+import requests
+
+import event_index
+import timeutil
+
+# === CONFIGURATION ===
+FILTER_ENDPOINT = "http://localhost:8010/filter_signal"
+BATCH_ENDPOINT = "http://localhost:8010/filter_signals"
+TIMEOUT = 3
+BUCKET_SECONDS = 60  # signals for one symbol within the same bucket get the same answer
+CACHE_TTL = 60
+CACHE_CAPACITY = 10_000
+STALE_IF_ERROR = 300  # seconds an expired answer for the same key may stand in during an outage
+UNKNOWN_RESULT = (None, 0.0)  # service down and nothing recent known: pass is unknown, no adjustment
+BATCH_UNSUPPORTED_STATUS = (404, 405, 501)
+SNAPSHOT_SYNC_INTERVAL = 30
+
+
+def signal_time(signal):
+    try:
+        return timeutil.to_epoch(signal["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+
+
+def cache_key(signal, bucket_seconds=BUCKET_SECONDS):
+    return signal.get("symbol"), int(signal_time(signal) // bucket_seconds)
+
+
+class BatchUnsupported(Exception):
+    pass
+
+
+def parse_result(data):
+    return bool(data.get("pass", False)), float(data.get("adjustment", 0.0))
+
+
+class LocalEconomicFilter:
+    """Blackout check against an event calendar file, re-read at most every `sync_interval` seconds."""
+
+    def __init__(self, path, sync_interval=SNAPSHOT_SYNC_INTERVAL, clock=time.monotonic):
+        self.index = event_index.EventIndex(path)
+        self.sync_interval = sync_interval
+        self.clock = clock
+        self.synced_at = None
+
+    def sync(self):
+        now = self.clock()
+        if self.synced_at is None or now - self.synced_at >= self.sync_interval:
+            self.index.refresh()
+            self.synced_at = now
+
+    def check(self, signal):
+        self.sync()
+        return not self.index.in_blackout(signal.get("symbol"), signal_time(signal)), 0.0
+
+
+class EconomicFilterClient:
+    def __init__(self, endpoint=FILTER_ENDPOINT, batch_endpoint=BATCH_ENDPOINT, timeout=TIMEOUT,
+                 ttl=CACHE_TTL, bucket_seconds=BUCKET_SECONDS, capacity=CACHE_CAPACITY,
+                 stale_if_error=STALE_IF_ERROR, local=None, clock=time.monotonic):
+        self.endpoint = endpoint
+        self.batch_endpoint = batch_endpoint
+        self.timeout = timeout
+        self.ttl = ttl
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.stale_if_error = stale_if_error
+        self.local = local
+        self.clock = clock
+        self.batch_supported = batch_endpoint is not None
+        self.cache = {}  # key -> (fetched_at, result), kept past the TTL for stale-if-error
+        self.in_flight = {}  # key -> Future shared by concurrent lookups
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    # === CACHE ===
+    def cached(self, key):
+        entry = self.cache.get(key)
+        if entry is not None and self.clock() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def store(self, key, result):
+        now = self.clock()
+        with self._lock:
+            if len(self.cache) >= self.capacity:
+                self.cache = {k: v for k, v in self.cache.items() if now - v[0] < max(self.ttl, self.stale_if_error)}
+                if len(self.cache) >= self.capacity:
+                    self.cache.pop(next(iter(self.cache)))
+            self.cache[key] = (now, result)
+
+    def fallback(self, key, error):
+        """Answer for a lookup that failed: a recent answer for the same key, else UNKNOWN_RESULT."""
+        logging.error(f"[EconomicFilter] Error: {error}")
+        entry = self.cache.get(key)
+        if entry is not None and self.clock() - entry[0] < self.stale_if_error:
+            return entry[1]
+        return UNKNOWN_RESULT
+
+    # === LOOKUPS ===
+    def _claim(self, keys):
+        """Split keys into futures owned by this caller and futures already being fetched by another."""
+        owned, waiting = {}, {}
+        with self._lock:
+            for key in keys:
+                future = self.in_flight.get(key)
+                if future is None:
+                    future = owned[key] = self.in_flight[key] = Future()
+                else:
+                    waiting[key] = future
+        return owned, waiting
+
+    def _settle(self, owned, results):
+        with self._lock:
+            for key in owned:
+                del self.in_flight[key]
+        for key, future in owned.items():
+            future.set_result(results.get(key))
+
+    def check(self, signal):
+        """(pass, confidence adjustment) for one signal."""
+        return self.check_many([signal])[0]
+
+    def check_many(self, signals):
+        """(pass, confidence adjustment) per signal, with at most one request for all uncached keys."""
+        if self.local is not None:
+            return [self.local.check(signal) for signal in signals]
+        keys = [cache_key(signal, self.bucket_seconds) for signal in signals]
+        answers = {key: self.cached(key) for key in set(keys)}
+        missing = {key: signal for key, signal in zip(keys, signals) if answers[key] is None}
+        if missing:
+            owned, waiting = self._claim(missing)
+            results = {}
+            try:
+                if owned:
+                    results = self.fetch([missing[key] for key in owned], list(owned))
+            finally:
+                self._settle(owned, results)
+            answers.update(results)
+            for key, future in waiting.items():
+                answers[key] = future.result()
+        return [answers[key] if answers[key] is not None else self.fallback(key, "no answer") for key in keys]
+
+    def fetch(self, signals, keys):
+        """
+        Query the service for one representative signal per key; failed keys fall back.
+        Uses the batch endpoint when the service has one, else one POST per signal.
+        """
+        if len(signals) > 1 and self.batch_supported:
+            try:
+                results = self.post_batch(signals, keys)
+            except BatchUnsupported as e:
+                logging.warning(f"[EconomicFilter] Batch endpoint unavailable ({e}), using per-signal lookups")
+                self.batch_supported = False
+            except Exception as e:
+                return {key: self.fallback(key, e) for key in keys}
+            else:
+                for key, result in results.items():
+                    self.store(key, result)
+                return results
+        results = {}
+        for key, signal in zip(keys, signals):
+            try:
+                results[key] = self.post_one(signal)
+            except Exception as e:
+                results[key] = self.fallback(key, e)
+            else:
+                self.store(key, results[key])
+        return results
+
+    def post_one(self, signal):
+        self.requests += 1
+        res = requests.post(self.endpoint, json=signal, timeout=self.timeout)
+        res.raise_for_status()
+        return parse_result(res.json())
+
+    def post_batch(self, signals, keys):
+        self.requests += 1
+        res = requests.post(self.batch_endpoint, json={"signals": signals}, timeout=self.timeout)
+        if res.status_code in BATCH_UNSUPPORTED_STATUS:
+            raise BatchUnsupported(f"HTTP {res.status_code}")
+        res.raise_for_status()
+        data = res.json()
+        results = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(results, list) or len(results) != len(signals):
+            raise BatchUnsupported("unexpected response body")
+        return {key: parse_result(item) for key, item in zip(keys, results)}
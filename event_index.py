@@ -0,0 +1,110 @@
+# Economic event calendar indexed for blackout checks.
+# Events are grouped per affected symbol into sorted epoch arrays, so "is this signal
+# within an event's blackout window" is a bisect instead of a scan of the whole calendar.
+# The calendar file is re-read only when its mtime/size changes.
+import os
+import json
+import bisect
+import threading
+
+from timeutil import to_epoch
+
+# === CONFIGURATION ===
+DEFAULT_BLACKOUT_SECONDS = 3600
+# Blackout half-width per event "importance"; events without a listed importance use the default.
+BLACKOUT_SECONDS = {}
+
+
+class SymbolEvents:
+    def __init__(self, entries):
+        entries.sort(key=lambda entry: entry[0])
+        self.times = [entry[0] for entry in entries]
+        self.windows = [entry[1] for entry in entries]
+        self.events = [entry[2] for entry in entries]
+        self.max_window = max(self.windows, default=0)
+
+
+class EventIndex:
+    def __init__(self, path, blackout_seconds=None, default_blackout=DEFAULT_BLACKOUT_SECONDS):
+        self.path = path
+        self.blackout_seconds = BLACKOUT_SECONDS if blackout_seconds is None else blackout_seconds
+        self.default_blackout = default_blackout
+        self.symbols = {}
+        self.skipped = 0
+        self.loaded = False
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def window(self, event):
+        return self.blackout_seconds.get(event.get("importance"), self.default_blackout)
+
+    def load(self, events):
+        """Build the per-symbol index from a list of calendar events; malformed events are skipped."""
+        by_symbol, skipped = {}, 0
+        for event in events:
+            try:
+                entry = (to_epoch(event["time"]), float(self.window(event)), event)
+                symbols = event["affected_symbols"]
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+            for symbol in symbols:
+                by_symbol.setdefault(symbol, []).append(entry)
+        # Swapped in whole, so concurrent readers see either the old or the new calendar.
+        self.symbols = {symbol: SymbolEvents(entries) for symbol, entries in by_symbol.items()}
+        self.skipped = skipped
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def refresh(self):
+        """Reload the calendar if the file changed since the last load; returns True on reload."""
+        stamp = self._file_stamp()
+        if self.loaded and stamp == self._stamp:
+            return False
+        with self._lock:
+            if self.loaded and stamp == self._stamp:
+                return False
+            events = []
+            if stamp is not None:
+                try:
+                    with open(self.path) as f:
+                        events = json.load(f).get("events", [])
+                except (OSError, ValueError) as e:
+                    print(f"[EventIndex] Failed to load {self.path}: {e}")
+                    return False
+            self.load(events)
+            self._stamp = stamp
+            self.loaded = True
+            return True
+
+    def blocking_events(self, symbol, timestamp):
+        """Events whose blackout window covers `timestamp` for `symbol`."""
+        entry = self.symbols.get(symbol)
+        if entry is None:
+            return []
+        t = to_epoch(timestamp)
+        lo = bisect.bisect_right(entry.times, t - entry.max_window)
+        hi = bisect.bisect_left(entry.times, t + entry.max_window)
+        return [entry.events[i] for i in range(lo, hi) if abs(t - entry.times[i]) < entry.windows[i]]
+
+    def in_blackout(self, symbol, timestamp):
+        return bool(self.blocking_events(symbol, timestamp))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def shared_index(path):
+    """One hot-reloading index per calendar file for the whole process."""
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = EventIndex(path)
+    index.refresh()
+    return index
@@ -0,0 +1,242 @@
+import math
+
+import indicator_kernels as kernels
+
+# === CONFIGURATION ===
+MOMENTUM_PERIOD = 10
+VOLATILITY_WINDOW = 14
+MA_FAST = 20
+MA_SLOW = 50
+RSI_PERIOD = 14
+INDICATOR_COLUMNS = ["returns", "momentum", "volatility", "ma_20", "ma_50", "rsi"]
+
+# Closes needed before every indicator is defined (MA50 is the longest window).
+WARMUP_BARS = MA_SLOW
+# Closes replayed when seeding: Wilder RSI has infinite memory, and after 400 bars the
+# contribution of older history is below 1e-12.
+SEED_BARS = 400
+
+NAN = float("nan")
+
+
+# === ROLLING ACCUMULATORS ===
+class RollingMean:
+    """Fixed-window mean kept as a ring buffer plus a running sum."""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, value):
+        if self.count < self.window:
+            self.count += 1
+        else:
+            self.total -= self.buffer[self.index]
+        self.buffer[self.index] = value
+        self.total += value
+        self.index = (self.index + 1) % self.window
+        if self.index == 0:
+            # Resync once per lap so the running sum never drifts (amortized O(1)).
+            self.total = math.fsum(self.buffer[:self.count])
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return NAN
+        return self.total / self.window
+
+
+class WilderAverage:
+    """Wilder smoothing (EWM with alpha=1/period, adjust=False), valid after `period` values."""
+
+    def __init__(self, period):
+        self.alpha = 1 / period
+        self.period = period
+        self.count = 0
+        self.average = 0.0
+
+    def push(self, value):
+        self.count += 1
+        if self.count == 1:
+            self.average = value
+        else:
+            self.average += self.alpha * (value - self.average)
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.period:
+            return NAN
+        return self.average
+
+
+class RollingStd:
+    """Fixed-window sample standard deviation (ddof=1) using a sliding Welford update."""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.index = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value):
+        if self.count < self.window:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        else:
+            old = self.buffer[self.index]
+            new_mean = self.mean + (value - old) / self.window
+            self.m2 += (value - old) * (value - new_mean + old - self.mean)
+            self.mean = new_mean
+        self.buffer[self.index] = value
+        self.index = (self.index + 1) % self.window
+        if self.index == 0 and self.count == self.window:
+            self.mean = math.fsum(self.buffer) / self.window
+            self.m2 = math.fsum((x - self.mean) ** 2 for x in self.buffer)
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+
+
+# === PER-SYMBOL STATE ===
+class IndicatorState:
+    """Rolling indicator state for one symbol; `update` costs O(1) per closed bar."""
+
+    def __init__(self):
+        self.prev_close = None
+        self.closes = [0.0] * (MOMENTUM_PERIOD + 1)
+        self.close_index = 0
+        self.bars = 0
+        self.volatility = RollingStd(VOLATILITY_WINDOW)
+        self.ma_fast = RollingMean(MA_FAST)
+        self.ma_slow = RollingMean(MA_SLOW)
+        self.avg_gain = WilderAverage(RSI_PERIOD)
+        self.avg_loss = WilderAverage(RSI_PERIOD)
+
+    @property
+    def ready(self):
+        return self.bars >= WARMUP_BARS
+
+    def update(self, close):
+        close = float(close)
+        self.closes[self.close_index] = close
+        self.close_index = (self.close_index + 1) % len(self.closes)
+        self.bars += 1
+
+        if self.prev_close is None:
+            returns = NAN
+            delta = 0.0
+        else:
+            returns = close / self.prev_close - 1
+            delta = close - self.prev_close
+            self.volatility.push(returns)
+        self.prev_close = close
+
+        if self.bars > MOMENTUM_PERIOD:
+            # The slot about to be overwritten holds the close MOMENTUM_PERIOD bars back.
+            momentum = close - self.closes[self.close_index]
+        else:
+            momentum = NAN
+
+        avg_gain = self.avg_gain.push(delta if delta > 0 else 0.0)
+        avg_loss = self.avg_loss.push(-delta if delta < 0 else 0.0)
+        if avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        return {
+            "returns": returns,
+            "momentum": momentum,
+            "volatility": self.volatility.value,
+            "ma_20": self.ma_fast.push(close),
+            "ma_50": self.ma_slow.push(close),
+            "rsi": rsi,
+        }
+
+
+# === ENGINE ===
+class IndicatorEngine:
+    """Keeps an IndicatorState per symbol and extends it as new bars close."""
+
+    def __init__(self):
+        self.states = {}
+
+    def reset(self, symbol=None):
+        if symbol is None:
+            self.states.clear()
+        else:
+            self.states.pop(symbol, None)
+
+    def has_state(self, symbol):
+        return symbol in self.states
+
+    def seed(self, symbol, closes):
+        """Rebuild a symbol's state from its most recent closes (only the last SEED_BARS are replayed)."""
+        state = IndicatorState()
+        for close in list(closes)[-SEED_BARS:]:
+            state.update(close)
+        self.states[symbol] = state
+        return state
+
+    def update(self, symbol, close):
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = IndicatorState()
+        return state.update(close)
+
+    def update_frame(self, symbol, df):
+        """Append indicator columns for newly closed bars in `df`, one O(1) update per row."""
+        rows = [self.update(symbol, close) for close in df["close"]]
+        out = df.copy()
+        for column in INDICATOR_COLUMNS:
+            out[column] = [row[column] for row in rows]
+        return out
+
+    def compute_batch(self, symbol, df):
+        """Full-history computation (same columns as `compute_indicators`) that also seeds state."""
+        out = compute_indicators(df)
+        self.seed(symbol, df["close"])
+        return out
+
+
+# === BATCH MODE ===
+def compute_indicator_arrays(close):
+    """All Module A indicators for a (symbols, bars) close matrix in one vectorized pass."""
+    returns = kernels.pct_change(close)
+    return {
+        "returns": returns,
+        "momentum": kernels.momentum(close, MOMENTUM_PERIOD),
+        "volatility": kernels.rolling_std(returns, VOLATILITY_WINDOW),
+        "ma_20": kernels.rolling_mean(close, MA_FAST),
+        "ma_50": kernels.rolling_mean(close, MA_SLOW),
+        "rsi": kernels.rsi(close, RSI_PERIOD),
+    }
+
+
+def compute_indicators_batch(frames):
+    """Compute indicators for many symbols' frames at once; warm-up rows are dropped as before."""
+    arrays = compute_indicator_arrays(kernels.stack([df["close"].to_numpy() for df in frames]))
+    results = []
+    for row, df in enumerate(frames):
+        df = df.copy()
+        for column in INDICATOR_COLUMNS:
+            df[column] = arrays[column][row, arrays[column].shape[1] - len(df):]
+        results.append(df.dropna())
+    return results
+
+
+def compute_indicators(df):
+    return compute_indicators_batch([df])[0]
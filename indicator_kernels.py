@@ -0,0 +1,84 @@
+# Vectorized indicator kernels shared by Module A and Module G.
+# Every kernel takes a 2-D float array shaped (symbols, bars), oldest bar first, and
+# returns an array of the same shape. Series of different lengths are right-aligned and
+# left-padded with NaN (see `stack`); a value stays NaN until its window is populated,
+# matching pandas `rolling` / `ewm(min_periods=...)`.
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def stack(series_list):
+    """Right-align 1-D series into one (symbols, bars) matrix, padding the left with NaN."""
+    width = max((len(s) for s in series_list), default=0)
+    out = np.full((len(series_list), width), np.nan)
+    for row, values in enumerate(series_list):
+        if len(values):
+            out[row, width - len(values):] = np.asarray(values, dtype=float)
+    return out
+
+
+def shift(x, periods=1):
+    out = np.full_like(x, np.nan)
+    if periods < x.shape[1]:
+        out[:, periods:] = x[:, :-periods]
+    return out
+
+
+def momentum(x, periods):
+    return x - shift(x, periods)
+
+
+def pct_change(x):
+    return x / shift(x, 1) - 1
+
+
+def rolling_mean(x, window):
+    out = np.full_like(x, np.nan)
+    if window <= x.shape[1]:
+        out[:, window - 1:] = sliding_window_view(x, window, axis=1).mean(axis=2)
+    return out
+
+
+def rolling_std(x, window, ddof=1):
+    out = np.full_like(x, np.nan)
+    if window <= x.shape[1]:
+        out[:, window - 1:] = sliding_window_view(x, window, axis=1).std(axis=2, ddof=ddof)
+    return out
+
+
+def ewm_mean(x, alpha, min_periods):
+    """pandas `ewm(alpha=alpha, adjust=False, min_periods=...)`, seeded at each row's first value."""
+    out = np.full_like(x, np.nan)
+    state = np.full(x.shape[0], np.nan)
+    seen = np.zeros(x.shape[0], dtype=int)
+    for t in range(x.shape[1]):
+        value = x[:, t]
+        valid = ~np.isnan(value)
+        state = np.where(np.isnan(state), value, np.where(valid, (1 - alpha) * state + alpha * value, state))
+        seen += valid
+        out[:, t] = np.where(seen >= min_periods, state, np.nan)
+    return out
+
+
+def ema(x, span):
+    return ewm_mean(x, 2 / (span + 1), span)
+
+
+def macd(x, fast=12, slow=26):
+    return ema(x, fast) - ema(x, slow)
+
+
+def rsi(x, period=14):
+    """Wilder RSI, as `ta.momentum.RSIIndicator` computes it."""
+    delta = x - shift(x, 1)
+    # The first bar of each series has no change; count it as flat like `ta` does.
+    first = np.isnan(delta) & ~np.isnan(x)
+    delta = np.where(first, 0.0, delta)
+    with np.errstate(invalid="ignore"):
+        gain = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+        loss = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+    avg_gain = ewm_mean(gain, 1 / period, period)
+    avg_loss = ewm_mean(loss, 1 / period, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 100.0, values)
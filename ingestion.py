@@ -0,0 +1,202 @@
+# Module A's ingestion pipeline over a data source, a bar store and an indicator engine.
+# A full ingestion fetches symbols on a thread pool, then computes indicators for all of
+# them as stacked (symbols x bars) chunks, one chunk per worker process. A delta update
+# fetches only bars newer than the stored tail and extends the engine's rolling state.
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+import indicator_engine
+
+# === CONFIGURATION ===
+BARS = 300  # Historical bars to fetch
+FETCH_WORKERS = 8  # Concurrent MT5 fetches
+COMPUTE_WORKERS = 4  # Indicator worker processes; 0 computes in this process
+OVERLAP_BARS = 2  # Already-stored bars re-fetched each cycle to catch revisions
+
+
+def validate_data(df):
+    if df.isnull().sum().sum() > 0:
+        raise ValueError("Data contains nulls")
+    if df.empty:
+        raise ValueError("Data is empty")
+    return True
+
+
+def timed_compute(frames):
+    """Indicators for a chunk of frames, timed inside the worker so pool queueing is not counted."""
+    started = time.perf_counter()
+    results = indicator_engine.compute_indicators_batch(frames)
+    return results, time.perf_counter() - started
+
+
+def _run_inline(fn, *args):
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class Ingestor:
+    def __init__(self, source, store, engine, timeframe, bars=BARS, overlap_bars=OVERLAP_BARS):
+        self.source = source
+        self.store = store
+        self.engine = engine
+        self.timeframe = timeframe
+        self.bars = bars
+        self.overlap_bars = overlap_bars
+
+    def get_data(self, symbol, bars):
+        rates = self.source.copy_rates_from_pos(symbol, self.timeframe, 0, bars)
+        if rates is None:
+            raise ValueError(f"No data for {symbol}")
+        df = pd.DataFrame(rates)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        df.set_index('time', inplace=True)
+        return df
+
+    def fetch_symbol(self, symbol):
+        started = time.perf_counter()
+        df = self.get_data(symbol, self.bars)
+        validate_data(df)
+        return df, time.perf_counter() - started
+
+    def ingest_symbols(self, symbols, fetch_workers=FETCH_WORKERS, compute_workers=COMPUTE_WORKERS):
+        """
+        Fetch on a thread pool, then compute indicators for all fetched symbols as stacked
+        (symbols x bars) chunks, one chunk per worker process. Errors are isolated per symbol.
+        """
+        report = {symbol: {"status": "pending"} for symbol in symbols}
+        frames = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as fetch_pool:
+            fetches = {fetch_pool.submit(self.fetch_symbol, symbol): symbol for symbol in symbols}
+            for future in as_completed(fetches):
+                symbol = fetches[future]
+                try:
+                    frames[symbol], report[symbol]["fetch_s"] = future.result()
+                except Exception as e:
+                    report[symbol].update(status="error", stage="fetch", error=str(e), traceback=traceback.format_exc())
+
+        fetched = [symbol for symbol in symbols if symbol in frames]
+        if not fetched:
+            return report
+        chunk_count = max(1, min(compute_workers, len(fetched)))
+        chunks = [fetched[i::chunk_count] for i in range(chunk_count)]
+
+        compute_pool = ProcessPoolExecutor(max_workers=chunk_count) if compute_workers > 0 else None
+        try:
+            computes = {}
+            for chunk in chunks:
+                chunk_frames = [frames[symbol] for symbol in chunk]
+                if compute_pool is None:
+                    future = _run_inline(timed_compute, chunk_frames)
+                else:
+                    future = compute_pool.submit(timed_compute, chunk_frames)
+                computes[future] = chunk
+
+            for future in as_completed(computes):
+                chunk = computes[future]
+                try:
+                    results, compute_s = future.result()
+                except Exception as e:
+                    for symbol in chunk:
+                        report[symbol].update(status="error", stage="compute", error=str(e),
+                                              traceback=traceback.format_exc())
+                    continue
+                for symbol, df in zip(chunk, results):
+                    entry = report[symbol]
+                    entry["compute_s"] = compute_s
+                    try:
+                        self.engine.seed(symbol, frames[symbol]["close"])
+                        started = time.perf_counter()
+                        self.store.write(symbol, df)
+                        entry.update(status="ok", rows=len(df), save_s=time.perf_counter() - started)
+                    except Exception as e:
+                        entry.update(status="error", stage="save", error=str(e), traceback=traceback.format_exc())
+        finally:
+            if compute_pool is not None:
+                compute_pool.shutdown()
+
+        return report
+
+    # === DELTA UPDATES ===
+    def fetch_delta(self, symbol, last_time):
+        """Fetch bars newer than `last_time` plus `overlap_bars` stored ones; None if the gap exceeds `bars`."""
+        count = self.overlap_bars + 1
+        df = self.get_data(symbol, count)
+        while df.index[0] > last_time and count < self.bars:
+            count = min(count * 4, self.bars)
+            df = self.get_data(symbol, count)
+        if df.index[0] > last_time:
+            return None
+        validate_data(df)
+        return df
+
+    def seed_engine(self, symbol, new_rows):
+        """
+        Seed the symbol's state from the `bars` raw closes before `new_rows`: the same window a
+        full ingestion seeds from. Stored closes would not do, having lost their warm-up rows.
+        """
+        window = self.get_data(symbol, self.bars + len(new_rows))
+        self.engine.seed(symbol, window.loc[window.index < new_rows.index[0], "close"].iloc[-self.bars:])
+
+    def update_symbol(self, symbol):
+        """Append newly closed bars to the store; returns rows written, or None if a full fetch is needed."""
+        last_time = self.store.last_time(symbol)
+        if last_time is None:
+            return None
+        df = self.fetch_delta(symbol, last_time)
+        if df is None:
+            return None
+
+        stored = self.store.read(symbol, columns=list(df.columns))
+        overlap = df.loc[df.index <= last_time]
+        changed = (overlap != stored.reindex(overlap.index)).any(axis=1)
+
+        if changed.any():
+            # A stored bar was revised (usually the bar that was still forming): rewind to it.
+            resume = changed.idxmax()
+            self.store.truncate(symbol, int((stored.index < resume).sum()))
+            new_rows = df.loc[df.index >= resume]
+            reseed = True
+        else:
+            new_rows = df.loc[df.index > last_time]
+            reseed = not self.engine.has_state(symbol)
+
+        if new_rows.empty:
+            return 0
+        if reseed:
+            self.seed_engine(symbol, new_rows)
+        self.store.append(symbol, self.engine.update_frame(symbol, new_rows))
+        return len(new_rows)
+
+    def update_symbols(self, symbols, fetch_workers=FETCH_WORKERS):
+        """Delta-update symbols concurrently; returns the report and the symbols that need a full fetch."""
+        report = {}
+        needs_full = []
+
+        def timed_update(symbol):
+            started = time.perf_counter()
+            return self.update_symbol(symbol), time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as pool:
+            futures = {pool.submit(timed_update, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    rows, elapsed = future.result()
+                except Exception as e:
+                    report[symbol] = {"status": "error", "stage": "delta", "error": str(e),
+                                      "traceback": traceback.format_exc()}
+                    continue
+                if rows is None:
+                    needs_full.append(symbol)
+                else:
+                    report[symbol] = {"status": "ok", "mode": "delta", "rows": rows, "update_s": elapsed}
+
+        return report, [symbol for symbol in symbols if symbol in needs_full]
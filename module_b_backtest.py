@@ -0,0 +1,91 @@
+import argparse
+
+import pandas as pd
+
+import bar_store
+import strategy_registry
+
+# === CONFIGURATION ===
+DATA_FOLDER = "market_data"
+STORAGE_BACKEND = "columnar"
+SYMBOLS = ["EURUSD", "GBPUSD", "USDJPY"]
+BACKTEST_COLUMNS = ["close", "momentum", "rsi", "ma_20", "ma_50"]
+HOLD_BARS = 1  # Module B signals expire after EXPIRY_MINUTES, i.e. one H1 bar
+
+
+# === DATA ===
+def load_history(symbols=SYMBOLS, folder=DATA_FOLDER, backend=STORAGE_BACKEND, timeframe="H1"):
+    store = bar_store.open_store(backend, folder)
+    return {symbol: store.read(symbol, columns=BACKTEST_COLUMNS, timeframe=timeframe) for symbol in symbols}
+
+
+def to_wide(frames):
+    """{symbol: frame} -> {column: DataFrame(bars x symbols)} aligned on the union of bar times."""
+    return {column: pd.DataFrame({symbol: df[column] for symbol, df in frames.items()}) for column in BACKTEST_COLUMNS}
+
+
+# === ENGINE ===
+def max_drawdown(equity):
+    return float((equity - equity.cummax()).min()) if len(equity) else 0.0
+
+
+def backtest_strategy(wide, long, short, confidence, hold_bars=HOLD_BARS):
+    """
+    `long` / `short` are (bars x symbols) signal masks. Enter at the close of a signal
+    bar and hold for `hold_bars` bars (a new signal in the same direction extends the
+    hold, an opposite one reverses it). Returns per-bar entry/exit masks, positions
+    and PnL (fractional returns) plus summary stats.
+    """
+    signal = long.astype(int) - short.astype(int)
+    position = signal.where(signal != 0)
+    if hold_bars > 1:
+        position = position.ffill(limit=hold_bars - 1)
+    position = position.fillna(0)
+
+    previous = position.shift(1).fillna(0)
+    entries = (position != 0) & (position != previous)
+    exits = (previous != 0) & (position != previous)
+    pnl = previous * wide["close"].pct_change(fill_method=None).fillna(0)
+
+    # PnL realised on bar t belongs to the trade that was open at t-1.
+    trade_ids = entries.cumsum().shift(1).where(previous != 0)
+    per_bar = pd.DataFrame({
+        "pnl": pnl.stack(future_stack=True),
+        "trade": trade_ids.stack(future_stack=True),
+    }).dropna(subset=["trade"])
+    trades = per_bar.groupby([per_bar.index.get_level_values(1), "trade"])["pnl"].sum()
+
+    equity = pnl.sum(axis=1).cumsum()
+    stats = {
+        "trades": int(entries.to_numpy().sum()),
+        "hit_rate": float((trades > 0).mean()) if len(trades) else 0.0,
+        "pnl": float(pnl.to_numpy().sum()),
+        "weighted_pnl": float(pnl.to_numpy().sum() * confidence),
+        "max_drawdown": max_drawdown(equity),
+        "confidence": confidence,
+    }
+    return {"entries": entries, "exits": exits, "position": position, "pnl": pnl, "equity": equity, "stats": stats}
+
+
+def run_backtest(frames, strategies=None, hold_bars=HOLD_BARS):
+    """Backtest each strategy name in the registry (the same rules Module B trades live) over every symbol."""
+    wide = to_wide(frames)
+    masks = strategy_registry.group_masks(wide, strategies)
+    return {name: backtest_strategy(wide, long, short, confidence, hold_bars)
+            for name, (long, short, confidence) in masks.items()}
+
+
+def summarize(results):
+    return pd.DataFrame({name: result["stats"] for name, result in results.items()}).T
+
+
+# === MAIN ENTRY ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest Module B strategies over stored bar history")
+    parser.add_argument("--symbols", nargs="+", default=SYMBOLS)
+    parser.add_argument("--timeframe", default="H1")
+    parser.add_argument("--hold-bars", type=int, default=HOLD_BARS)
+    args = parser.parse_args()
+
+    results = run_backtest(load_history(args.symbols, timeframe=args.timeframe), hold_bars=args.hold_bars)
+    print(summarize(results).to_string())
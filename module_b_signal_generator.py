@@ -1,17 +1,26 @@
-import os
 import json
 import sqlite3
 import datetime
+import queue
+import threading
+import time
 import traceback
 import pandas as pd
 import requests
 import redis
 from flask import Flask, jsonify, render_template_string
-from cryptography.fernet import Fernet
-from tenacity import retry, stop_after_attempt, wait_fixed
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+import bar_store
+import batch_queue
+import signal_envelope
+import sqlite_writer
+import strategy_registry
 
 # === CONFIGURATION ===
 DATA_FOLDER = "market_data"
+STORAGE_BACKEND = "columnar"  # must match Module A
+SIGNAL_COLUMNS = ["momentum", "rsi", "ma_20", "ma_50"]  # only columns the strategies read
 SIGNAL_OUTPUT_FILE = "active_signals.json"
 AI_WEEKLY_SIGNAL_FILE = "ai_weekly_signal.csv"
 DB_FILE = "signal_logs.db"
@@ -21,9 +30,11 @@ MODULE_I_ENDPOINT = "http://localhost:8004/execute_trade"
 EXPIRY_MINUTES = 60
 SYMBOLS = ["EURUSD", "GBPUSD", "USDJPY"]
 AUTO_TRIGGER_MODULE_I = True
-ENABLE_ENCRYPTION = True
-ENCRYPTION_KEY = Fernet.generate_key()
-fernet = Fernet(ENCRYPTION_KEY)
+ENABLE_ENCRYPTION = True  # key and cipher come from signal_envelope configuration
+ASYNC_DISPATCH = True  # fan signals out to sinks on background workers
+DISPATCH_QUEUE_SIZE = 1000  # per sink; signals beyond this are dropped for that sink
+DISPATCH_WORKERS_PER_SINK = 2
+DAEMON_POLL_INTERVAL = 0.25  # seconds between bar store checks in daemon mode
 
 # === REDIS CONNECTION ===
 try:
@@ -32,8 +43,11 @@ except:
     redis_client = None
 
 # === DATABASE INIT ===
+INSERT_SIGNAL_SQL = '''INSERT INTO signals (timestamp, symbol, direction, reason, confidence, expires)
+                         VALUES (?, ?, ?, ?, ?, ?)'''
+
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite_writer.connect(DB_FILE)
     cursor = conn.cursor()
     cursor.execute('''CREATE TABLE IF NOT EXISTS signals (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,22 +58,141 @@ def init_db():
         confidence REAL,
         expires TEXT
     )''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals (timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals (symbol)")
     conn.commit()
     conn.close()
 
+# === SIGNAL DISPATCH ===
+class SignalDispatcher:
+    """
+    Bounded per-sink queues drained by background workers, so slow sinks never block generation.
+    Sinks are stopped in the order given, so a sink that submits to another (module_c triggers
+    module_i) must come before it.
+    """
+
+    def __init__(self, sinks, maxsize=DISPATCH_QUEUE_SIZE, workers_per_sink=DISPATCH_WORKERS_PER_SINK):
+        self.sinks = sinks
+        self.queues = {name: batch_queue.BatchQueue(maxsize) for name in sinks}
+        self.dropped = {name: 0 for name in sinks}
+        self.closed = set()
+        self.workers_per_sink = workers_per_sink
+        self.threads = {name: [] for name in sinks}
+        self._lock = threading.Lock()
+        for name, sink in sinks.items():
+            for i in range(workers_per_sink):
+                thread = threading.Thread(target=self._work, args=(name, sink), name=f"dispatch-{name}-{i}", daemon=True)
+                thread.start()
+                self.threads[name].append(thread)
+
+    def submit(self, signal, payload=None, sinks=None):
+        for name in sinks or self.sinks:
+            # Under the lock, so an item is either queued ahead of the sink's STOP markers or counted as dropped.
+            with self._lock:
+                reason = "closed" if name in self.closed else None
+                if reason is None:
+                    try:
+                        self.queues[name].put_nowait((signal, payload))
+                    except queue.Full:
+                        reason = "queue full"
+                if reason:
+                    self.dropped[name] += 1
+            if reason:
+                print(f"[Dispatch] {name} {reason}, dropped {signal['symbol']} signal")
+
+    def _work(self, name, sink):
+        q = self.queues[name]
+        while True:
+            item = q.get()
+            try:
+                if item is batch_queue.STOP:
+                    return
+                signal, payload = item
+                sink(signal, payload)
+            except Exception as e:
+                print(f"[Dispatch] {name} failed for {signal['symbol']}: {e}")
+            finally:
+                q.task_done()
+
+    def drain(self, timeout=None):
+        """Wait until every queued signal has been handled; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for q in self.queues.values():
+            if not q.wait_done(None if deadline is None else max(0, deadline - time.monotonic())):
+                return False
+        return True
+
+    def close(self, timeout=None):
+        """
+        Drain, then stop each sink's workers in order. A sink is stopped only once the sinks
+        before it have exited, so work they hand on downstream is still delivered; if one is
+        still busy after `timeout`, the sinks after it are left running and False is returned.
+        """
+        drained = self.drain(timeout)
+        for name, q in self.queues.items():
+            if name not in self.closed:
+                with self._lock:
+                    self.closed.add(name)
+                for _ in range(self.workers_per_sink):
+                    q.put(batch_queue.STOP)
+            for thread in self.threads[name]:
+                thread.join(timeout)
+            if any(thread.is_alive() for thread in self.threads[name]):
+                return False
+        return drained
+
 # === SIGNAL GENERATOR ===
 class SignalGenerator:
     def __init__(self):
-        self.signals = []
+        self.signals = []  # signals produced by the current cycle only
+        self.store = bar_store.open_store(STORAGE_BACKEND, DATA_FOLDER)
+        # Warm state kept between daemon cycles.
+        self.frames = {}
+        self.fingerprints = {}
+        self.active_signals = {}  # latest signals per symbol (plus "ai_weekly"), exported together
+        self._http = threading.local()
+        self.db_writer = sqlite_writer.BatchedWriter(DB_FILE, INSERT_SIGNAL_SQL)
+        self.dispatcher = None
+        if ASYNC_DISPATCH:
+            self.dispatcher = SignalDispatcher({
+                "module_c": self.send_to_module_c,
+                "module_i": self.auto_trigger_module_i,
+                "redis": self.push_to_redis,
+            })
 
     def load_data(self, symbol):
         try:
-            file_path = os.path.join(DATA_FOLDER, f"{symbol}_H1.csv")
-            return pd.read_csv(file_path, parse_dates=["time"], index_col="time")
+            return self.store.read(symbol, columns=SIGNAL_COLUMNS)
         except Exception as e:
             print(f"[ERROR] Loading {symbol}: {e}")
             return None
 
+    def refresh_frames(self, symbols):
+        """Reload only symbols whose stored bars changed since the last load; returns those symbols."""
+        changed = []
+        for symbol in symbols:
+            fingerprint = self.store.fingerprint(symbol)
+            if fingerprint == self.fingerprints.get(symbol):
+                continue
+            df = self.load_data(symbol) if fingerprint is not None else None
+            if fingerprint is not None and self.store.fingerprint(symbol) != fingerprint:
+                # Written while we read: the frame may be torn, so keep the old one and retry next cycle.
+                continue
+            self.fingerprints[symbol] = fingerprint
+            if df is not None and len(df):
+                self.frames[symbol] = df
+            else:
+                self.frames.pop(symbol, None)
+            changed.append(symbol)
+        return changed
+
+    def http(self):
+        """Per-thread keep-alive session, so sink workers reuse their connections."""
+        session = getattr(self._http, "session", None)
+        if session is None:
+            session = self._http.session = requests.Session()
+        return session
+
     def build_signal(self, symbol, direction, reason, confidence):
         signal = {
             "symbol": symbol,
@@ -70,28 +203,34 @@ class SignalGenerator:
             "expires": (datetime.datetime.utcnow() + datetime.timedelta(minutes=EXPIRY_MINUTES)).isoformat()
         }
 
+        # Serialized and encrypted once; every sink reuses the same payload.
+        payload = self.seal(signal)
         self.log_signal_to_db(signal)
-        self.send_to_module_c(signal)
-        self.push_to_redis(signal)
+        if self.dispatcher:
+            # Module I is triggered by the Module C sink once C accepts the signal.
+            self.dispatcher.submit(signal, payload, sinks=["module_c", "redis"])
+        else:
+            self.send_to_module_c(signal, payload)
+            self.push_to_redis(signal, payload)
         return signal
 
-    def generate_momentum_signal(self, df, symbol):
-        try:
-            if df["momentum"].iloc[-1] > 0 and df["rsi"].iloc[-1] > 55:
-                return self.build_signal(symbol, 1, "Momentum Long", 0.75)
-            elif df["momentum"].iloc[-1] < 0 and df["rsi"].iloc[-1] < 45:
-                return self.build_signal(symbol, -1, "Momentum Short", 0.75)
-        except: pass
-        return None
-
-    def generate_ma_crossover(self, df, symbol):
-        try:
-            if df["ma_20"].iloc[-2] < df["ma_50"].iloc[-2] and df["ma_20"].iloc[-1] > df["ma_50"].iloc[-1]:
-                return self.build_signal(symbol, 1, "MA Bullish Crossover", 0.65)
-            elif df["ma_20"].iloc[-2] > df["ma_50"].iloc[-2] and df["ma_20"].iloc[-1] < df["ma_50"].iloc[-1]:
-                return self.build_signal(symbol, -1, "MA Bearish Crossover", 0.65)
-        except: pass
-        return None
+    def seal(self, signal):
+        return signal_envelope.default_envelope(ENABLE_ENCRYPTION).seal(signal)
+
+    def generate_registry_signals(self, frames, strategies=None):
+        """Evaluate every registered strategy against every symbol's latest bars in one vectorized pass."""
+        strategies = strategy_registry.REGISTRY if strategies is None else strategies
+        rows = strategy_registry.latest_rows(frames)
+        fired = strategy_registry.evaluate(rows, strategies)
+        signals = []
+        # Row-major order keeps signals grouped by symbol, then by registration order.
+        for row, col in zip(*fired.nonzero()):
+            symbol, strategy = rows.index[row], strategies[col]
+            try:
+                signals.append(self.build_signal(symbol, strategy.direction, strategy.reason, strategy.confidence))
+            except Exception as e:
+                print(f"[Module B] {strategy.reason} signal for {symbol} failed: {e}")
+        return signals
 
     def include_ai_weekly_signal(self):
         try:
@@ -100,79 +239,106 @@ class SignalGenerator:
                 direction, confidence = line.split(",")
                 signal = self.build_signal("EURUSD", int(direction), "AI Weekly Signal", float(confidence))
                 self.signals.append(signal)
+                self.active_signals["ai_weekly"] = [signal]
         except Exception as e:
             print(f"[AI SIGNAL] Error: {e}")
 
     def log_signal_to_db(self, signal):
-        try:
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-            cursor.execute('''INSERT INTO signals (timestamp, symbol, direction, reason, confidence, expires)
-                              VALUES (?, ?, ?, ?, ?, ?)''',
-                           (signal["timestamp"], signal["symbol"], signal["direction"],
-                            signal["reason"], signal["confidence"], signal["expires"]))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"[DB] Logging error: {e}")
+        """Queue the row for the batched writer; it is committed with the rest of its batch."""
+        self.db_writer.write((signal["timestamp"], signal["symbol"], signal["direction"],
+                              signal["reason"], signal["confidence"], signal["expires"]))
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def send_to_module_c(self, signal):
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=8))
+    def send_to_module_c(self, signal, payload=None):
         try:
-            payload = json.dumps(signal)
-            if ENABLE_ENCRYPTION:
-                payload = fernet.encrypt(payload.encode()).decode()
-            res = requests.post(MODULE_C_ENDPOINT, json={"payload": payload}, timeout=3)
+            payload = payload or self.seal(signal)
+            res = self.http().post(MODULE_C_ENDPOINT, json={"payload": payload.text}, timeout=3)
             res.raise_for_status()
 
             if res.ok and AUTO_TRIGGER_MODULE_I:
-                self.auto_trigger_module_i(signal)
+                if self.dispatcher:
+                    self.dispatcher.submit(signal, payload, sinks=["module_i"])
+                else:
+                    self.auto_trigger_module_i(signal, payload)
         except Exception as e:
             print(f"[Module C] Send error: {e}")
             raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def auto_trigger_module_i(self, signal):
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=8))
+    def auto_trigger_module_i(self, signal, payload=None):
         try:
-            payload = json.dumps(signal)
-            if ENABLE_ENCRYPTION:
-                payload = fernet.encrypt(payload.encode()).decode()
-            res = requests.post(MODULE_I_ENDPOINT, json={"payload": payload}, timeout=3)
+            payload = payload or self.seal(signal)
+            res = self.http().post(MODULE_I_ENDPOINT, json={"payload": payload.text}, timeout=3)
             res.raise_for_status()
         except Exception as e:
             print(f"[Module I] Trigger failed: {e}")
             raise
 
-    @retry(stop=stop_after_attempt(2), wait=wait_fixed(2))
-    def push_to_redis(self, signal):
+    @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=0.5, max=8))
+    def push_to_redis(self, signal, payload=None):
         if redis_client:
             try:
-                payload = json.dumps(signal)
-                if ENABLE_ENCRYPTION:
-                    payload = fernet.encrypt(payload.encode()).decode()
-                redis_client.publish(REDIS_CHANNEL, payload)
+                payload = payload or self.seal(signal)
+                redis_client.publish(REDIS_CHANNEL, payload.raw)
             except Exception as e:
                 print(f"[REDIS] Publish error: {e}")
                 raise
 
-    def run(self):
-        print("[Module B] Running...")
-        for symbol in SYMBOLS:
-            df = self.load_data(symbol)
-            if df is None: continue
+    def run_cycle(self, symbols=None):
+        """Evaluate strategies for the symbols whose data changed; returns the changed symbols."""
+        self.signals = []
+        changed = self.refresh_frames(symbols or SYMBOLS)
+        if not changed:
+            return changed
+
+        frames = {symbol: self.frames[symbol] for symbol in changed if symbol in self.frames}
+        self.signals = self.generate_registry_signals(frames)
+        for symbol in changed:
+            self.active_signals[symbol] = [signal for signal in self.signals if signal["symbol"] == symbol]
+        return changed
 
-            for strategy in [self.generate_momentum_signal, self.generate_ma_crossover]:
-                signal = strategy(df, symbol)
-                if signal:
-                    self.signals.append(signal)
+    def export_signals(self):
+        now = datetime.datetime.utcnow().isoformat()
+        active = [signal for signals in self.active_signals.values() for signal in signals if signal["expires"] > now]
+        active.sort(key=lambda x: x["confidence"], reverse=True)
+        with open(SIGNAL_OUTPUT_FILE, "w") as f:
+            json.dump(active, f, indent=2)
+        return active
 
+    def run(self):
+        print("[Module B] Running...")
+        self.fingerprints.clear()  # a full run re-evaluates every symbol
+        self.active_signals.clear()
+        self.run_cycle(SYMBOLS)
         self.include_ai_weekly_signal()
-        self.signals.sort(key=lambda x: x["confidence"], reverse=True)
+        exported = self.export_signals()
+        print(f"[Module B] {len(exported)} signals exported.")
 
-        with open(SIGNAL_OUTPUT_FILE, "w") as f:
-            json.dump(self.signals, f, indent=2)
+    def run_daemon(self, poll_interval=DAEMON_POLL_INTERVAL, max_cycles=None):
+        """
+        Stay resident: poll the bar store and re-evaluate only symbols with new bars,
+        keeping frames, sink sessions and the DB writer warm between cycles.
+        """
+        self.run()
+        print(f"[Module B] Watching {DATA_FOLDER} every {poll_interval}s...")
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            started = time.monotonic()
+            changed = self.run_cycle(SYMBOLS)
+            if not changed:
+                time.sleep(poll_interval)
+                continue
+            cycles += 1
+            exported = self.export_signals()
+            elapsed_ms = (time.monotonic() - started) * 1000
+            print(f"[Module B] {', '.join(changed)} updated: {len(self.signals)} new, {len(exported)} active ({elapsed_ms:.1f} ms)")
 
-        print(f"[Module B] {len(self.signals)} signals exported.")
+    def shutdown(self, timeout=30):
+        """Flush queued signals to every sink and stop the dispatch workers and DB writer."""
+        if self.dispatcher and not self.dispatcher.close(timeout):
+            print("[Module B] Dispatch did not drain before shutdown timeout")
+        if not self.db_writer.close(timeout):
+            print("[Module B] DB writer did not flush before shutdown timeout")
 
 # === MONITORING DASHBOARD ===
 app = Flask(__name__)
@@ -194,7 +360,12 @@ def dashboard():
 
 # === MAIN ENTRY ===
 if __name__ == "__main__":
-    import threading
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Module B signal generator")
+    parser.add_argument("--daemon", action="store_true", help="stay resident and re-run on new bar data")
+    parser.add_argument("--poll-interval", type=float, default=DAEMON_POLL_INTERVAL)
+    args = parser.parse_args()
 
     init_db()
     gen = SignalGenerator()
@@ -204,4 +375,12 @@ if __name__ == "__main__":
     flask_thread.start()
 
     # Run signal generator
-    gen.run()
+    try:
+        if args.daemon:
+            gen.run_daemon(args.poll_interval)
+        else:
+            gen.run()
+    except KeyboardInterrupt:
+        print("[Module B] Shutdown requested.")
+    finally:
+        gen.shutdown()
@@ -0,0 +1,153 @@
+# Async serving mode for Module C's signal routes.
+# Same decision logic as module_c_decision_filter, served as a plain ASGI app: forwards to
+# Module I share one pooled httpx.AsyncClient with strict timeouts and a cap on in-flight
+# requests, filtering runs in worker threads, and decisions go to a batched SQLite writer
+# so neither ever blocks the event loop. The Flask app keeps serving the dashboard.
+#
+#   uvicorn module_c_asgi:app --port 8002 --workers 4
+import asyncio
+import json
+
+import httpx
+
+import module_c_decision_filter as module_c
+import sqlite_writer
+
+# === CONFIG ===
+FORWARD_TIMEOUT = httpx.Timeout(2.0, connect=0.5)
+MAX_CONNECTIONS = 100  # pooled connections to Module I
+MAX_KEEPALIVE = 50
+MAX_IN_FLIGHT = 500  # concurrent forwards; further forwards wait for a slot
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class DecisionFilterApp:
+    def __init__(self, transport=None):
+        self.transport = transport  # injectable for tests
+        self.client = None
+        self.in_flight = None
+        self.writer = None
+        self._starting = None
+
+    # === LIFECYCLE ===
+    async def startup(self):
+        """Idempotent; concurrent first requests share one startup, and a failed one is retried."""
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(self._start())
+        try:
+            await self._starting
+        except Exception:
+            self._starting = None
+            raise
+
+    async def _start(self):
+        await asyncio.to_thread(module_c.init_db)
+        self.client = httpx.AsyncClient(
+            timeout=FORWARD_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE),
+            transport=self.transport,
+        )
+        self.in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self.writer = sqlite_writer.BatchedWriter(module_c.DB_FILE, module_c.INSERT_DECISION_SQL,
+                                                  name="decision-writer")
+
+    async def shutdown(self, timeout=30):
+        if self._starting is None:
+            return
+        await self.client.aclose()
+        await asyncio.to_thread(self.writer.close, timeout)
+        self._starting = None
+
+    # === PIPELINE ===
+    async def forward_to_module_i(self, signal, payload=None):
+        if payload is None:
+            payload = module_c.envelope().seal(signal).text
+        async with self.in_flight:
+            try:
+                res = await self.client.post(module_c.MODULE_I_ENDPOINT, json={"payload": payload})
+                return res.is_success
+            except httpx.HTTPError as e:
+                print(f"[ERROR] Forward failed: {e!r}")
+                return False
+
+    async def process_signals(self, signals, payloads=None):
+        payloads = payloads or [None] * len(signals)
+        results, decisions, accepted = await asyncio.to_thread(module_c.filter_signals, signals)
+        triggered = await asyncio.gather(*(self.forward_to_module_i(signals[i], payloads[i]) for i in accepted))
+        module_c.accept_signals(signals, accepted, triggered, results, decisions)
+        for row in decisions:
+            self.writer.write(row)
+        return results
+
+    async def receive_signal(self, body):
+        payload = body.get("payload")
+        signal = await asyncio.to_thread(module_c.envelope().open, payload)
+        return (await self.process_signals([signal], [payload]))[0]
+
+    async def receive_signals(self, body):
+        signals = await asyncio.to_thread(module_c.envelope().open, body.get("payload"))
+        return {"results": await self.process_signals(signals)}
+
+    # === ASGI ===
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        routes = {"/receive_signal": self.receive_signal, "/receive_signals": self.receive_signals}
+        route = routes.get(scope["path"])
+        if route is None or scope["method"] != "POST":
+            return await self.respond(send, 404, {"error": "not found"})
+
+        try:
+            await self.startup()
+            body = json.loads(await self.read_body(receive))
+            status, result = 200, await route(body)
+        except Exception as e:
+            status, result = 500, {"error": str(e)}
+        await self.respond(send, status, result)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def read_body(receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise ValueError("Request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def respond(send, status, result):
+        body = json.dumps(result).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+app = DecisionFilterApp()
+
+# === MAIN ENTRY ===
+if __name__ == "__main__":
+    import uvicorn
+
+    print("[Module C] Async signal routes on port 8002")
+    uvicorn.run(app, host="0.0.0.0", port=8002)
@@ -1,19 +1,13 @@
-import json, sqlite3, datetime, threading, time, unittest
-from flask import Flask, request, jsonify, render_template_string
-import pandas as pd
-import matplotlib.pyplot as plt
+import sqlite3, datetime, threading, time, unittest
 import io, base64
-import requests
-import redis
-import yagmail
-from cryptography.fernet import Fernet
-from telegram import Bot
+
+import alert_dispatcher
+import event_index
+import signal_envelope
 
 # === CONFIG ===
 DB_FILE = "decision_log.db"
 CONFIDENCE_THRESHOLD = 0.6
-ENCRYPTION_KEY = b'YourGeneratedEncryptionKeyHere'
-fernet = Fernet(ENCRYPTION_KEY)
 MODULE_I_ENDPOINT = "http://localhost:8004/execute_trade"
 EVENT_FILE = "event_calendar.json"
 EVENT_FILTER = True
@@ -22,13 +16,71 @@ TELEGRAM_CHAT_ID = "your_chat_id"
 EMAIL_USER = "you@gmail.com"
 EMAIL_PASSWORD = "your_email_app_password"
 EMAIL_RECEIVER = "target@example.com"
-ENABLE_ENCRYPTION = True
+ENABLE_ENCRYPTION = True  # key and cipher come from signal_envelope configuration
+FORWARD_WORKERS = 16  # max concurrent forwards to Module I, shared by all requests
+FORWARD_TIMEOUT = 3  # seconds; a hung Module I must not hold a worker indefinitely
+ALERT_CONFIDENCE = 0.85
+ALERT_DIGEST_WINDOW = 5  # seconds; alerts arriving together go out as one digest
+
+# === SERVICES ===
+# Clients and heavy libraries (Flask, Redis, requests, pandas, matplotlib, Telegram, SMTP)
+# are created on first use, so importing this module stays fast and works offline.
+class Services:
+    def __init__(self, **factories):
+        self.factories = factories
+        self.instances = {}
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        instance = self.instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self.instances.get(name)
+                if instance is None:
+                    instance = self.instances[name] = self.factories[name]()
+        return instance
+
+    def override(self, name, instance):
+        """Install a ready-made instance (e.g. a local stand-in) instead of building one."""
+        with self._lock:
+            self.instances[name] = instance
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get("factories", {}):
+            return self.get(name)
+        raise AttributeError(name)
+
+def _redis_client():
+    import redis
+    return redis.Redis(host='localhost', port=6379, db=0)
+
+def _forward_pool():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=FORWARD_WORKERS, thread_name_prefix="forward")
+
+def _alert_dispatcher():
+    return alert_dispatcher.AlertDispatcher([
+        alert_dispatcher.TelegramChannel(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID),
+        alert_dispatcher.EmailChannel(EMAIL_USER, EMAIL_PASSWORD, EMAIL_RECEIVER),
+    ], window=ALERT_DIGEST_WINDOW)
+
+def create_app():
+    from flask import Flask
+    app = Flask(__name__)
+    app.add_url_rule("/receive_signal", view_func=receive_signal, methods=["POST"])
+    app.add_url_rule("/receive_signals", view_func=receive_signals, methods=["POST"])
+    app.add_url_rule("/", view_func=dashboard)
+    return app
 
-# === INIT ===
-app = Flask(__name__)
-r = redis.Redis(host='localhost', port=6379, db=0)
-bot = Bot(token=TELEGRAM_BOT_TOKEN)
-yag = yagmail.SMTP(EMAIL_USER, EMAIL_PASSWORD)
+services = Services(app=create_app, redis=_redis_client, forward_pool=_forward_pool, alerts=_alert_dispatcher)
+
+def __getattr__(name):
+    # Module-level `app` and `r` still work, built on first access.
+    if name == "app":
+        return services.app
+    if name == "r":
+        return services.redis
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def init_db():
     conn = sqlite3.connect(DB_FILE)
@@ -46,110 +98,145 @@ def init_db():
     conn.commit()
     conn.close()
 
-def log_decision(signal, decision, triggered):
+INSERT_DECISION_SQL = '''INSERT INTO decisions (timestamp, symbol, direction, decision, reason, confidence, triggered)
+                         VALUES (?, ?, ?, ?, ?, ?, ?)'''
+
+def decision_row(signal, decision, triggered):
+    return (signal.get("timestamp"), signal.get("symbol"), signal.get("direction"), decision,
+            signal.get("reason"), signal.get("confidence"), triggered)
+
+def log_decisions(rows):
+    """Write a batch of decision rows in one transaction."""
     conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute('''INSERT INTO decisions (timestamp, symbol, direction, decision, reason, confidence, triggered)
-                      VALUES (?, ?, ?, ?, ?, ?, ?)''',
-                   (signal["timestamp"], signal["symbol"], signal["direction"], decision,
-                    signal["reason"], signal["confidence"], triggered))
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            conn.executemany(INSERT_DECISION_SQL, rows)
+    finally:
+        conn.close()
 
-def is_valid(signal):
+def log_decision(signal, decision, triggered):
+    log_decisions([decision_row(signal, decision, triggered)])
+
+def is_valid(signal, now=None):
     try:
         expiry = datetime.datetime.fromisoformat(signal["expires"])
-        if datetime.datetime.utcnow() > expiry:
+        if (now or datetime.datetime.utcnow()) > expiry:
             return False
         return signal["confidence"] >= CONFIDENCE_THRESHOLD
     except:
         return False
 
-def correlate_with_event(symbol, timestamp):
+def event_calendar():
+    """Hot-reloading index of EVENT_FILE, shared by every request."""
+    return event_index.shared_index(EVENT_FILE)
+
+def correlate_with_event(symbol, timestamp, events=None):
+    """`events` lets a batch share one index refresh; looked up from EVENT_FILE when omitted."""
     if not EVENT_FILTER: return True
     try:
-        with open(EVENT_FILE) as f:
-            events = json.load(f).get("events", [])
-        for e in events:
-            if symbol in e["affected_symbols"]:
-                event_time = datetime.datetime.fromisoformat(e["time"])
-                sig_time = datetime.datetime.fromisoformat(timestamp)
-                if abs((sig_time - event_time).total_seconds()) < 3600:
-                    return False
-    except:
-        pass
+        if events is None:
+            events = event_calendar()
+        return not events.in_blackout(symbol, timestamp)
+    except Exception as e:
+        print(f"[Event] Check failed for {symbol}: {e}")
     return True
 
-def forward_to_module_i(signal):
+def envelope():
+    return signal_envelope.default_envelope(ENABLE_ENCRYPTION)
+
+def forward_to_module_i(signal, payload=None):
+    """`payload` is the token the signal arrived in; it is forwarded as-is instead of re-encrypting."""
     try:
-        payload = json.dumps(signal)
-        if ENABLE_ENCRYPTION:
-            payload = fernet.encrypt(payload.encode()).decode()
-        res = requests.post(MODULE_I_ENDPOINT, json={"payload": payload})
+        if payload is None:
+            payload = envelope().seal(signal).text
+        import requests
+        res = requests.post(MODULE_I_ENDPOINT, json={"payload": payload}, timeout=FORWARD_TIMEOUT)
         return res.ok
     except Exception as e:
         print(f"[ERROR] Forward failed: {e}")
         return False
 
+def alerts():
+    """Process-wide alert dispatcher, started on the first alert."""
+    return services.alerts
+
 def send_alerts(signal):
-    msg = f"""
-    🔔 Signal Alert!
-    {signal['symbol']} - {signal['direction']} ({signal['reason']})
-    Confidence: {signal['confidence']}
-    Time: {signal['timestamp']}
-    """
-    try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=msg)
-    except Exception as e:
-        print(f"[Alert] Telegram failed: {e}")
-    try:
-        yag.send(to=EMAIL_RECEIVER, subject="Signal Alert", contents=msg)
-    except Exception as e:
-        print(f"[Alert] Email failed: {e}")
+    """Queue a Telegram/email alert; returns immediately, delivery is batched and rate-limited."""
+    alerts().submit(signal)
 
-def process_signal(signal):
-    if not is_valid(signal):
-        log_decision(signal, "REJECTED", 0)
-        return {"status": "rejected"}
+def process_signal(signal, payload=None):
+    return process_signals([signal], [payload])[0]
 
-    if not correlate_with_event(signal["symbol"], signal["timestamp"]):
-        log_decision(signal, "REJECTED: news event", 0)
-        return {"status": "rejected_event"}
+def process_signals(signals, payloads=None):
+    """
+    Filter a batch with one clock read and one calendar lookup, forward the accepted
+    signals concurrently on `forward_pool`, and log every decision in one transaction.
+    Results are returned in input order.
+    """
+    payloads = payloads or [None] * len(signals)
+    results, decisions, accepted = filter_signals(signals)
+    forwards = [services.forward_pool.submit(forward_to_module_i, signals[i], payloads[i]) for i in accepted]
+    accept_signals(signals, accepted, [future.result() for future in forwards], results, decisions)
+    log_decisions(decisions)
+    return results
 
-    triggered = forward_to_module_i(signal)
-    log_decision(signal, "ACCEPTED", int(triggered))
+def filter_signals(signals):
+    """Validate and event-filter a batch; returns (results, decision rows, indexes still to forward)."""
+    now = datetime.datetime.utcnow()
+    events = event_calendar() if EVENT_FILTER else None
+    results = [None] * len(signals)
+    decisions = [None] * len(signals)
+    accepted = []
 
-    if signal["confidence"] >= 0.85:
-        threading.Thread(target=send_alerts, args=(signal,)).start()
+    for i, signal in enumerate(signals):
+        if signal.get("replayed"):
+            # Journal replays are for inspection only; forwarding one would repeat a live trade.
+            decisions[i] = decision_row(signal, "REPLAYED", 0)
+            results[i] = {"status": "replayed"}
+        elif not is_valid(signal, now):
+            decisions[i] = decision_row(signal, "REJECTED", 0)
+            results[i] = {"status": "rejected"}
+        elif not correlate_with_event(signal["symbol"], signal["timestamp"], events):
+            decisions[i] = decision_row(signal, "REJECTED: news event", 0)
+            results[i] = {"status": "rejected_event"}
+        else:
+            accepted.append(i)
+    return results, decisions, accepted
 
-    return {"status": "accepted", "triggered": triggered}
+def accept_signals(signals, accepted, triggered, results, decisions):
+    """Fill in results and decision rows for forwarded signals and fire high-confidence alerts."""
+    for i, was_triggered in zip(accepted, triggered):
+        decisions[i] = decision_row(signals[i], "ACCEPTED", int(was_triggered))
+        results[i] = {"status": "accepted", "triggered": was_triggered}
+
+        if signals[i]["confidence"] >= ALERT_CONFIDENCE:
+            send_alerts(signals[i])
 
 # === ROUTES ===
-@app.route("/receive_signal", methods=["POST"])
 def receive_signal():
+    from flask import request, jsonify
     try:
         payload = request.json.get("payload")
-        if ENABLE_ENCRYPTION:
-            payload = fernet.decrypt(payload.encode()).decode()
-        signal = json.loads(payload)
-        return jsonify(process_signal(signal)), 200
+        signal = envelope().open(payload)
+        return jsonify(process_signal(signal, payload)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/receive_signals", methods=["POST"])
 def receive_signals():
+    from flask import request, jsonify
     try:
-        payload = request.json.get("payload")
-        if ENABLE_ENCRYPTION:
-            payload = fernet.decrypt(payload.encode()).decode()
-        signals = json.loads(payload)
-        results = [process_signal(sig) for sig in signals]
+        signals = envelope().open(request.json.get("payload"))
+        results = process_signals(signals)
         return jsonify({"results": results}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/")
 def dashboard():
+    from flask import render_template_string
+    import pandas as pd
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
     try:
         df = pd.read_sql_query("SELECT * FROM decisions ORDER BY id DESC LIMIT 100", sqlite3.connect(DB_FILE))
         # Plot confidence vs triggered
@@ -160,6 +247,7 @@ def dashboard():
         buf = io.BytesIO()
         plt.tight_layout()
         plt.savefig(buf, format="png")
+        plt.close(fig)
         buf.seek(0)
         encoded = base64.b64encode(buf.read()).decode("utf-8")
         html_table = df.to_html(classes="table table-striped", index=False)
@@ -204,4 +292,4 @@ if __name__ == "__main__":
     init_db()
     unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestSignalFilter))
     print("[Module C] Running with dashboard on port 8002")
-    app.run(host="0.0.0.0", port=8002)
+    services.app.run(host="0.0.0.0", port=8002)
@@ -5,71 +5,238 @@ import requests
 import redis
 import logging
 import hashlib
+import itertools
+import queue
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from cryptography.fernet import Fernet
+
+import batch_queue
+import circuit_breaker
+import routing_journal
+import signal_envelope
+import timeutil
 
 # === CONFIG ===
 ROUTING_TARGETS = {
-    "rest": "http://localhost:8002/receive_signal",
+    "rest": "http://localhost:8002/receive_signals",  # Module C batch endpoint
     "redis": "module_d:signals",
-    "logfile": "routed_signals.log"
+    "journal": "routing_journal"  # folder of rotated, indexed segments (see routing_journal.py)
 }
 MAX_SIGNAL_AGE_MINUTES = 5
-FERNET_KEY = b'YourGeneratedKeyHere'  # 32 url-safe base64-encoded bytes
-ENABLE_ENCRYPTION = True
-MODULE_F_FEEDBACK_ENDPOINT = "http://localhost:8006/feedback"
+ENABLE_ENCRYPTION = True  # key and cipher come from signal_envelope configuration
+MODULE_F_FEEDBACK_CHANNEL = "trade_feedback"  # Redis channel Module F subscribes to
+REPLAY_TARGET = "module_d:replay"  # Redis list journal replays go to; never a live destination
 DEDUPLICATION_WINDOW_SECONDS = 300  # 5 minutes
+DEDUP_BACKEND = "memory"  # "redis" shares one dedup window across router replicas
+DEDUP_CAPACITY = 100_000  # hard cap on remembered hashes; the oldest are evicted first
+DEDUP_REDIS_PREFIX = "module_d:dedup:"
+ROUTING_WORKERS = 4  # threads routing signals concurrently
+# Each sink batches on its own thread: a batch is sent when it reaches max_batch signals
+# or flush_interval seconds after its first signal, whichever comes first.
+SINK_SETTINGS = {
+    "rest": {"flush_interval": 0.05, "max_batch": 100},
+    "redis": {"flush_interval": 0.01, "max_batch": 500},
+    "journal": {"flush_interval": 0.1, "max_batch": 1000},
+}
+SINK_QUEUE_SIZE = 10_000  # per sink; signals beyond this are dropped for that sink
+REST_TIMEOUT = 5
+RETRY_INTERVAL = 1.0  # seconds between retries of buffered signals while a destination is unhealthy
+FEEDBACK_SETTINGS = {"flush_interval": 1.0, "max_batch": 500}  # failure reports published to Module F per batch
+# Backpressure: when the router backlog or any sink passes this fraction of its capacity,
+# enqueue sheds signals below BACKPRESSURE_MIN_CONFIDENCE and tells the caller.
+MAX_QUEUED_SIGNALS = 10_000
+BACKPRESSURE_HIGH_WATER = 0.8
+BACKPRESSURE_MIN_CONFIDENCE = 0.85
 
 # === INIT ===
 redis_client = redis.Redis(host="localhost", port=6379, db=0)
-fernet = Fernet(FERNET_KEY)
 logging.basicConfig(filename="router_audit.log", level=logging.INFO)
 
 # === Signal Queue and Deduplication ===
-signal_queue = []
-dedup_cache = {}  # {hash: timestamp}
+class SignalScheduler:
+    """
+    Thread-safe priority queue of signals: highest confidence first, FIFO among equal
+    confidence. Waiting workers wake as soon as a signal arrives. Expired signals are handed
+    to `on_expired` instead of being queued: on arrival, when they reach the front, and in a
+    sweep of the whole queue whenever it holds `capacity` signals and one may have expired.
+    """
 
+    def __init__(self, on_expired=None, clock=time.time, capacity=None):
+        self.heap = []  # (-confidence, seq, expiry epoch, signal)
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.on_expired = on_expired
+        self.clock = clock
+        self.capacity = capacity
+        self.earliest_expiry = float("inf")  # lower bound on the expiries still queued
+        self.closed = False
+        self.expired = 0
 
-# === Utilities ===
-def generate_signal_hash(signal: dict) -> str:
-    """Create a unique hash of the signal content for deduplication."""
-    hashable = f"{signal['symbol']}|{signal['direction']}|{signal['confidence']}|{signal['reason']}|{signal['timestamp']}"
-    return hashlib.sha256(hashable.encode()).hexdigest()
+    def put(self, signal):
+        """Queue a signal; returns False if it had already expired."""
+        confidence = float(signal.get("confidence", 0))
+        try:
+            expiry = timeutil.to_epoch(signal["expires"])
+        except (KeyError, TypeError, ValueError):
+            expiry = float("inf")  # left to is_signal_valid to reject
+        with self.cond:
+            if self.closed:
+                raise RuntimeError("Scheduler is closed")
+            now = self.clock()
+            accepted = expiry > now
+            if not accepted:
+                self.expired += 1
+                dropped = [signal]
+            else:
+                dropped = self._sweep(now) if self.capacity and len(self.heap) >= self.capacity else []
+                heapq.heappush(self.heap, (-confidence, next(self.seq), expiry, signal))
+                self.earliest_expiry = min(self.earliest_expiry, expiry)
+                self.cond.notify()
+        self._report(dropped)
+        return accepted
 
+    def _sweep(self, now):
+        """Remove every expired signal from the queue (lock held); returns them."""
+        if self.earliest_expiry > now:
+            return []
+        live, dropped = [], []
+        for entry in self.heap:
+            (live if entry[2] > now else dropped).append(entry)
+        heapq.heapify(live)
+        self.heap = live
+        self.earliest_expiry = min((entry[2] for entry in live), default=float("inf"))
+        self.expired += len(dropped)
+        return [entry[3] for entry in dropped]
 
-def is_duplicate(signal_hash: str) -> bool:
-    """Check for recent duplicate signals."""
-    now = time.time()
-    if signal_hash in dedup_cache:
-        if now - dedup_cache[signal_hash] <= DEDUPLICATION_WINDOW_SECONDS:
-            return True
-        else:
-            del dedup_cache[signal_hash]
-    return False
+    def _report(self, signals):
+        # Outside the lock: the callback may do network I/O.
+        if self.on_expired:
+            for signal in signals:
+                self.on_expired(signal)
+
+    def get(self, timeout=None):
+        """Next live signal, or None on timeout or once closed and drained."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.cond:
+                while not self.heap and not self.closed:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self.cond.wait(remaining)
+                if not self.heap:
+                    return None
+                _, _, expiry, signal = heapq.heappop(self.heap)
+                if expiry > self.clock():
+                    return signal
+                self.expired += 1
+            self._report([signal])
+
+    def close(self):
+        """Stop accepting signals; workers drain what is queued, then get() returns None."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        with self.cond:
+            return len(self.heap)
+
+
+class DedupWindow:
+    """
+    Signal hashes seen within the window, kept in insertion (= time) order so expiry
+    only ever pops from the oldest end: amortized O(1) per check, bounded by `capacity`.
+    """
 
+    def __init__(self, window_seconds=DEDUPLICATION_WINDOW_SECONDS, capacity=DEDUP_CAPACITY, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self.clock = clock
+        self.entries = OrderedDict()  # {hash: first seen}
+        self.evicted = 0
+        self.lock = threading.Lock()
 
-def mark_as_seen(signal_hash: str):
-    """Store the signal hash for deduplication purposes."""
-    dedup_cache[signal_hash] = time.time()
+    def _expire(self, now):
+        entries = self.entries
+        while entries:
+            oldest = next(iter(entries))
+            if now - entries[oldest] <= self.window_seconds:
+                break
+            del entries[oldest]
+
+    def seen(self, signal_hash: str) -> bool:
+        """True if the hash is a duplicate within the window; otherwise records it and returns False."""
+        with self.lock:
+            now = self.clock()
+            self._expire(now)
+            if signal_hash in self.entries:
+                return True
+            self.entries[signal_hash] = now
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evicted += 1
+            return False
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class RedisDedupWindow:
+    """Dedup window shared by every router replica: SET NX EX claims a hash for the window."""
+
+    def __init__(self, client, window_seconds=DEDUPLICATION_WINDOW_SECONDS, prefix=DEDUP_REDIS_PREFIX, fallback=None):
+        self.client = client
+        self.window_seconds = window_seconds
+        self.prefix = prefix
+        self.fallback = fallback or DedupWindow(window_seconds)
+
+    def seen(self, signal_hash: str) -> bool:
+        try:
+            return not self.client.set(self.prefix + signal_hash, 1, nx=True, ex=self.window_seconds)
+        except redis.RedisError as e:
+            logging.warning(f"[Router] Redis dedup unavailable, using local window: {e}")
+            return self.fallback.seen(signal_hash)
 
 
-def cleanup_dedup_cache():
-    """Clean up expired entries from dedup cache."""
-    now = time.time()
-    expired_keys = [k for k, ts in dedup_cache.items() if now - ts > DEDUPLICATION_WINDOW_SECONDS]
-    for k in expired_keys:
-        del dedup_cache[k]
+def make_dedup_window(backend=DEDUP_BACKEND):
+    if backend == "redis":
+        return RedisDedupWindow(redis_client)
+    if backend == "memory":
+        return DedupWindow()
+    raise ValueError(f"Unknown dedup backend: {backend}")
+
+
+scheduler = SignalScheduler(on_expired=lambda signal: feedback_to_module_f(signal, "expired"),
+                            capacity=MAX_QUEUED_SIGNALS)
+dedup = make_dedup_window()
+
+
+# === Utilities ===
+def generate_signal_hash(signal: dict) -> str:
+    """Create a unique hash of the signal content for deduplication."""
+    key = (signal['symbol'], signal['direction'], signal['confidence'], signal['reason'], signal['timestamp'])
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
 
 
 # === Signal Processing ===
 
 def enqueue_signal(signal):
-    """Add a signal to the priority queue based on confidence (descending)."""
+    """
+    Add a signal to the priority queue based on confidence (descending). Under backpressure
+    only signals at or above BACKPRESSURE_MIN_CONFIDENCE are accepted; returns False if shed
+    or already expired.
+    """
     try:
-        confidence = float(signal.get("confidence", 0))
-        heapq.heappush(signal_queue, (-confidence, signal))
+        if backpressure() and float(signal.get("confidence", 0)) < BACKPRESSURE_MIN_CONFIDENCE:
+            logging.warning(f"[Router] Backpressure: shed {signal.get('symbol')} signal")
+            feedback_to_module_f(signal, "shed under router backpressure")
+            return False
+        return scheduler.put(signal)
     except Exception as e:
         print(f"[Router] Enqueue Error: {e}")
+        return False
 
 def is_signal_valid(signal):
     """Check if signal is still valid based on timestamp and expiry."""
@@ -85,74 +252,342 @@ def is_signal_valid(signal):
         return False
 
 def encrypt_payload(payload):
-    if ENABLE_ENCRYPTION:
-        return fernet.encrypt(json.dumps(payload).encode()).decode()
-    return json.dumps(payload)
+    return signal_envelope.default_envelope(ENABLE_ENCRYPTION).seal(payload).text
 
-def route_signal(signal):
-    """Route signal to destinations and log failures."""
-    signal_hash = generate_signal_hash(signal)
-    if is_duplicate(signal_hash):
-        logging.warning(f"[Router] Duplicate signal skipped: {signal['symbol']}")
-        return
-    mark_as_seen(signal_hash)
+# === Destination Sinks ===
+class BatchingSink:
+    """
+    Queue in front of one destination; a dedicated thread drains it in batches, so sinks
+    never wait on each other. With a `breaker`, calls fail fast while the destination is
+    down; with a `retry` SpillBuffer, failed batches are kept and retried once it recovers.
+    """
 
-    payload = encrypt_payload(signal)
+    name = "sink"
 
-    # 1. REST Forward
-    try:
-        res = requests.post(ROUTING_TARGETS["rest"], json={"payload": payload}, timeout=5)
+    def __init__(self, flush_interval=0.05, max_batch=100, maxsize=SINK_QUEUE_SIZE, breaker=None, retry=None,
+                 retry_interval=RETRY_INTERVAL):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.queue = batch_queue.BatchQueue(maxsize)
+        self.breaker = breaker
+        self.retry = retry
+        self.retry_interval = retry_interval
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, signal, payload):
+        try:
+            self.queue.put_nowait((signal, payload))
+        except queue.Full:
+            self.dropped += 1
+            logging.error(f"[Router] {self.name} sink queue full, dropped {signal['symbol']} signal")
+
+    @property
+    def saturated(self):
+        """Backlog (queued or awaiting retry) past the backpressure high-water mark."""
+        if self.queue.maxsize and self.queue.qsize() >= BACKPRESSURE_HIGH_WATER * self.queue.maxsize:
+            return True
+        return self.retry is not None and len(self.retry) >= BACKPRESSURE_HIGH_WATER * self.retry.max_items
+
+    def write_batch(self, items):
+        raise NotImplementedError
+
+    def is_live(self, item):
+        """Whether a buffered item is still worth retrying; replayed signals are historical by design."""
+        return item[0].get("replayed", False) or is_signal_valid(item[0])
+
+    def on_failure(self, items, error):
+        logging.error(f"[Router] {self.name} batch of {len(items)} failed: {error}")
+        for signal, _ in items:
+            if not signal.get("replayed"):
+                feedback_to_module_f(signal, f"{self.name} forward failed: {error}")
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far has been written, buffered for retry, or failed."""
+        return self.queue.wait_done(timeout)
+
+    def close(self, timeout=None):
+        flushed = self.flush(timeout)
+        self.queue.put(batch_queue.STOP)
+        self.thread.join(timeout)
+        return flushed
+
+    def _write(self, items):
+        """Send one batch through the breaker; returns the error, or None on success."""
+        if self.breaker is not None and not self.breaker.allow():
+            return circuit_breaker.CircuitOpenError(f"{self.name} circuit open")
+        try:
+            self.write_batch(items)
+        except Exception as e:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            return e
+        if self.breaker is not None:
+            self.breaker.record_success()
+        return None
+
+    def _deliver(self, items):
+        # Buffered signals go first so a recovered destination sees them in order.
+        self._retry_buffered()
+        if self.retry is not None and len(self.retry):
+            error = circuit_breaker.CircuitOpenError(f"{self.name} still has a retry backlog")
+        else:
+            error = self._write(items)
+        if error is None:
+            return
+        if self.retry is None:
+            return self.on_failure(items, error)
+        dropped = self.retry.push(items)
+        if dropped:
+            self.on_failure(dropped, f"retry buffer full after {error}")
+
+    def _retry_buffered(self):
+        while self.retry is not None and len(self.retry):
+            items = self.retry.pop(self.max_batch)
+            live, expired = [], []
+            for item in items:
+                (live if self.is_live(item) else expired).append(item)
+            if expired:
+                self.on_failure(expired, "expired awaiting retry")
+            if not live:
+                continue
+            if self._write(live) is not None:
+                self.retry.push_front(live)
+                return
+
+    def _run(self):
+        while True:
+            # Wake periodically while there is buffered work to retry.
+            idle = self.retry_interval if self.retry is not None and len(self.retry) else None
+            batch = self.queue.next_batch(self.max_batch, self.flush_interval, idle)
+            items, stopped = batch_queue.split(batch)
+            try:
+                if items:
+                    self._deliver(items)
+                else:
+                    self._retry_buffered()
+            except Exception as e:
+                logging.exception(f"[Router] {self.name} sink error: {e}")
+            finally:
+                self.queue.batch_done(batch)
+            if stopped:
+                self.shutdown()
+                return
+
+    def shutdown(self):
+        pass
+
+
+class RestSink(BatchingSink):
+    """Posts each batch as one encrypted list to Module C's /receive_signals."""
+
+    name = "rest"
+
+    def __init__(self, url, timeout=REST_TIMEOUT, **settings):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        super().__init__(**settings)
+
+    def write_batch(self, items):
+        signals = [signal for signal, _ in items]
+        res = self.session.post(self.url, json={"payload": encrypt_payload(signals)}, timeout=self.timeout)
         if not res.ok:
             raise Exception(f"HTTP {res.status_code}")
-    except Exception as e:
-        logging.error(f"[Router] REST route failed: {e}")
-        feedback_to_module_f(signal, f"REST forward failed: {e}")
 
-    # 2. Redis Forward
-    try:
-        redis_client.rpush(ROUTING_TARGETS["redis"], payload)
-    except Exception as e:
-        logging.error(f"[Router] Redis push failed: {e}")
-        feedback_to_module_f(signal, f"Redis forward failed: {e}")
+    def shutdown(self):
+        self.session.close()
 
-    # 3. File Log
-    try:
-        with open(ROUTING_TARGETS["logfile"], "a") as f:
-            f.write(json.dumps(signal) + "\n")
-    except Exception as e:
-        logging.error(f"[Router] Logfile write failed: {e}")
+
+class RedisSink(BatchingSink):
+    """Pushes each batch with a single multi-value RPUSH: one round trip per batch."""
+
+    name = "redis"
+
+    def __init__(self, client, key, **settings):
+        self.client = client
+        self.key = key
+        super().__init__(**settings)
+
+    def write_batch(self, items):
+        self.client.rpush(self.key, *(payload for _, payload in items))
+
+
+class JournalSink(BatchingSink):
+    """Appends each batch to the routing journal, then flushes it under the journal's fsync policy."""
+
+    name = "journal"
+
+    def __init__(self, journal, **settings):
+        self.journal = journal
+        super().__init__(**settings)
+
+    def write_batch(self, items):
+        self.journal.append_many([signal for signal, _ in items])
+        self.journal.flush()
+
+    def on_failure(self, items, error):
+        logging.error(f"[Router] Journal write of {len(items)} signals failed: {error}")
+
+    def shutdown(self):
+        self.journal.close()
+
+
+class FeedbackSink(BatchingSink):
+    """
+    Publishes failure reports to Module F's Redis channel, one message per report in the
+    usual format, but pipelined: one round trip per batch instead of one per failure.
+    """
+
+    name = "module_f"
+
+    def __init__(self, client, channel, **settings):
+        self.client = client
+        self.channel = channel
+        super().__init__(**settings)
+
+    def write_batch(self, items):
+        pipe = self.client.pipeline(transaction=False)
+        for record, _ in items:
+            pipe.publish(self.channel, json.dumps(record))
+        pipe.execute()
+
+    def is_live(self, item):
+        return True
+
+    def on_failure(self, items, error):
+        logging.error(f"[Router] Feedback to Module F failed, {len(items)} reports lost: {error}")
+
+
+def resilient(name):
+    """Circuit breaker and disk-spilling retry buffer for one destination."""
+    return {"breaker": circuit_breaker.CircuitBreaker(name), "retry": circuit_breaker.SpillBuffer(name)}
+
+
+_sinks = None
+_feedback = None
+_replay = None
+_sinks_lock = threading.Lock()
+
+def sinks():
+    """Destination sinks for this process, started on first use."""
+    global _sinks
+    with _sinks_lock:
+        if _sinks is None:
+            _sinks = {
+                "rest": RestSink(ROUTING_TARGETS["rest"], **SINK_SETTINGS["rest"], **resilient("rest")),
+                "redis": RedisSink(redis_client, ROUTING_TARGETS["redis"], **SINK_SETTINGS["redis"],
+                                   **resilient("redis")),
+                "journal": JournalSink(routing_journal.RoutingJournal(ROUTING_TARGETS["journal"]),
+                                       **SINK_SETTINGS["journal"]),
+            }
+        return _sinks
+
+def feedback_sink():
+    global _feedback
+    with _sinks_lock:
+        if _feedback is None:
+            _feedback = FeedbackSink(redis_client, MODULE_F_FEEDBACK_CHANNEL, **FEEDBACK_SETTINGS, **resilient("module_f"))
+        return _feedback
+
+def replay_sink():
+    global _replay
+    with _sinks_lock:
+        if _replay is None:
+            _replay = RedisSink(redis_client, REPLAY_TARGET, **SINK_SETTINGS["redis"], **resilient("replay"))
+        return _replay
+
+def backpressure():
+    """True when the routing backlog or any destination sink is near capacity."""
+    if len(scheduler) >= BACKPRESSURE_HIGH_WATER * MAX_QUEUED_SIGNALS:
+        return True
+    return _sinks is not None and any(sink.saturated for sink in _sinks.values())
+
+def route_signal(signal):
+    """Hand the signal to every destination sink; delivery and failure feedback happen on the sink threads."""
+    if dedup.seen(generate_signal_hash(signal)):
+        logging.warning(f"[Router] Duplicate signal skipped: {signal['symbol']}")
+        return
+
+    payload = encrypt_payload(signal)
+    for sink in sinks().values():
+        sink.submit(signal, payload)
+
+def replay_signal(signal):
+    """
+    Send a journaled signal, marked "replayed", to REPLAY_TARGET. It never reaches Module C or
+    the live Redis list, so a replay cannot repeat trades; it skips the freshness, expiry and
+    dedup checks, which would reject any historical signal, and is not journaled again.
+    """
+    signal = dict(signal, replayed=True)
+    replay_sink().submit(signal, encrypt_payload(signal))
 
 def feedback_to_module_f(signal, reason):
-    """Send failed signals to Module F for learning."""
-    try:
-        data = {
-            "signal": signal,
-            "status": "failed",
-            "reason": reason,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        requests.post(MODULE_F_FEEDBACK_ENDPOINT, json=data, timeout=3)
-    except Exception as e:
-        logging.error(f"[Router] Feedback to Module F failed: {e}")
+    """Queue a failed signal for Module F; the feedback sink publishes reports in batches."""
+    data = {
+        "signal": signal,
+        "status": "failed",
+        "reason": reason,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    feedback_sink().submit(data, None)
 
-def router_loop():
-    print("[Router] Started signal router loop.")
+def routing_worker():
     while True:
-        cleanup_dedup_cache()
-        if signal_queue:
-            _, signal = heapq.heappop(signal_queue)
-            if not is_signal_valid(signal):
-                feedback_to_module_f(signal, "expired")
-                continue
+        signal = scheduler.get()
+        if signal is None:
+            return
+        if not is_signal_valid(signal):
+            feedback_to_module_f(signal, "expired")
+            continue
+        try:
             route_signal(signal)
-        else:
-            time.sleep(1)
+        except Exception as e:
+            logging.exception(f"[Router] Routing failed for {signal.get('symbol')}: {e}")
+
+router_threads = []
+
+def start_router(workers=ROUTING_WORKERS):
+    threads = [threading.Thread(target=routing_worker, name=f"router-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    router_threads.extend(threads)
+    return threads
+
+def stop_router(timeout=30):
+    """Stop taking signals, let the workers drain the queue, then flush every sink."""
+    scheduler.close()
+    for thread in router_threads:
+        thread.join(timeout)
+    if _sinks is not None:
+        for sink in _sinks.values():
+            sink.close(timeout)
+    if _replay is not None:
+        _replay.close(timeout)
+    if _feedback is not None:
+        _feedback.close(timeout)
+
+def router_loop(workers=ROUTING_WORKERS):
+    print(f"[Router] Started signal router with {workers} workers.")
+    for thread in start_router(workers):
+        thread.join()
 
 # === Entry API ===
 
 def receive_signal(signal):
-    """External API to receive new signals (from Module B)."""
-    enqueue_signal(signal)
+    """External API to receive new signals (from Module B). Returns False if the router shed or expired the signal."""
+    return enqueue_signal(signal)
+
+def replay_signals(start=None, end=None, symbol=None, folder=None, target=None):
+    """
+    Stream journaled signals for a time range and/or symbol to `target` (replay_signal by
+    default), reading only the journal blocks whose index can match.
+    """
+    journal = routing_journal.RoutingJournal(folder or ROUTING_TARGETS["journal"])
+    count = routing_journal.replay(journal, target or replay_signal, start, end, symbol)
+    logging.info(f"[Router] Replayed {count} signals (start={start}, end={end}, symbol={symbol})")
+    return count
 
 # === Example Simulation ===
 if __name__ == "__main__":
@@ -5,58 +5,66 @@ import requests
 import redis
 import logging
 
+import economic_filter
+import strategy_memory
+
 # === CONFIG ===
 REDIS_HOST = 'localhost'
 SIGNAL_EVAL_QUEUE = 'module_e:evaluation'
 ROUTE_TO_MODULE_I = "http://localhost:8009/execute_trade"
 FEEDBACK_TO_MODULE_F = "http://localhost:8006/feedback"
 ECONOMIC_FILTER_ENDPOINT = "http://localhost:8010/filter_signal"
+ECONOMIC_FILTER_BATCH_ENDPOINT = "http://localhost:8010/filter_signals"
+ECONOMIC_FILTER_CALENDAR = None  # path to an event calendar snapshot to filter locally instead of over HTTP
+EVAL_BATCH_SIZE = 50  # signals taken from the queue per evaluation round
 STRATEGY_FAILURE_LOG = 'failed_strategies.json'
+STRATEGY_MEMORY_BACKEND = "snapshot"  # "snapshot": local dict written behind to STRATEGY_FAILURE_LOG; "redis": shared hash
+STRATEGY_MEMORY_KEY = "module_e:failed_strategies"
+STRATEGY_SNAPSHOT_INTERVAL = 5  # seconds between snapshots of changed counts
 
 # === INIT ===
 redis_client = redis.Redis(host=REDIS_HOST, port=6379, decode_responses=True)
 logging.basicConfig(filename="module_e.log", level=logging.INFO)
 
 # === STRATEGY FAILURE MEMORY ===
-def load_failed_strategies():
-    try:
-        with open(STRATEGY_FAILURE_LOG, 'r') as f:
-            return json.load(f)
-    except:
-        return {}
+def make_strategy_memory(backend=STRATEGY_MEMORY_BACKEND):
+    if backend == "redis":
+        return strategy_memory.RedisStrategyMemory(redis_client, STRATEGY_MEMORY_KEY)
+    return strategy_memory.SnapshotStrategyMemory(STRATEGY_FAILURE_LOG, STRATEGY_SNAPSHOT_INTERVAL)
 
-def save_failed_strategies(failed_strategies):
-    with open(STRATEGY_FAILURE_LOG, 'w') as f:
-        json.dump(failed_strategies, f, indent=4)
-
-failed_strategies = load_failed_strategies()
+strategy_store = make_strategy_memory()
+# The snapshot store's live counts dict. None with the Redis backend, whose counts live only
+# in the Redis hash: go through strategy_store.failures() there.
+failed_strategies = getattr(strategy_store, "counts", None)
 
 
 # === ECONOMIC FILTER ===
+economic_filter_client = economic_filter.EconomicFilterClient(
+    ECONOMIC_FILTER_ENDPOINT,
+    ECONOMIC_FILTER_BATCH_ENDPOINT,
+    local=economic_filter.LocalEconomicFilter(ECONOMIC_FILTER_CALENDAR) if ECONOMIC_FILTER_CALENDAR else None,
+)
+
 def passes_economic_filter(signal):
-    try:
-        res = requests.post(ECONOMIC_FILTER_ENDPOINT, json=signal, timeout=3)
-        data = res.json()
-        return data.get("pass", False), data.get("adjustment", 0.0)
-    except Exception as e:
-        logging.error(f"[EconomicFilter] Error: {e}")
-        return False, -0.2  # Penalize confidence on failure
+    """
+    Cached per symbol and minute. If the filter service is down, a recent answer stands in,
+    else (None, 0.0): pass unknown.
+    """
+    return economic_filter_client.check(signal)
 
 # === STRATEGY TRACKING ===
 def strategy_failed_before(strategy_name):
-    return failed_strategies.get(strategy_name, 0) >= 2
+    return strategy_store.failures(strategy_name) >= 2
 
 def mark_strategy_failure(strategy_name):
-    failed_strategies[strategy_name] = failed_strategies.get(strategy_name, 0) + 1
-    save_failed_strategies(failed_strategies)
+    strategy_store.mark_failure(strategy_name)
 
 def mark_strategy_success(strategy_name):
-    if strategy_name in failed_strategies:
-        del failed_strategies[strategy_name]
-        save_failed_strategies(failed_strategies)
+    strategy_store.mark_success(strategy_name)
 
 # === MAIN EVALUATION ===
-def evaluate_signal(signal):
+def evaluate_signal(signal, economic=None):
+    """`economic` is a (pass, adjustment) answer already fetched for this signal, e.g. by evaluate_signals."""
     strategy = signal.get("strategy", "unknown")
     confidence = float(signal.get("confidence", 0))
     
@@ -67,8 +75,11 @@ def evaluate_signal(signal):
         return
 
     # 2. Check economic context
-    eco_pass, confidence_adj = passes_economic_filter(signal)
-    if not eco_pass:
+    eco_pass, confidence_adj = economic if economic is not None else passes_economic_filter(signal)
+    if eco_pass is None:
+        # Filter unavailable: not a verdict on the signal, so neither block nor count a failure.
+        logging.warning(f"[Eval] Economic filter unknown for {signal.get('symbol')}, evaluating without it")
+    elif not eco_pass:
         reason = "blocked by economic filter"
         send_feedback(signal, reason)
         mark_strategy_failure(strategy)
@@ -87,6 +98,16 @@ def evaluate_signal(signal):
     route_to_module_i(signal)
     mark_strategy_success(strategy)
 
+def evaluate_signals(signals):
+    """Evaluate a batch, resolving the economic filter for all of them in one lookup."""
+    pending = [signal for signal in signals if not strategy_failed_before(signal.get("strategy", "unknown"))]
+    answers = dict(zip(map(id, pending), economic_filter_client.check_many(pending))) if pending else {}
+    for signal in signals:
+        try:
+            evaluate_signal(signal, answers.get(id(signal)))
+        except Exception as e:
+            logging.error(f"[Evaluator] Evaluation failed: {e}")
+
 # === ROUTING ===
 def route_to_module_i(signal):
     try:
@@ -115,16 +136,24 @@ def send_feedback(signal, reason):
 def evaluator_loop():
     print("[Module E] Strategy evaluator running...")
     while True:
-        signal_data = redis_client.lpop(SIGNAL_EVAL_QUEUE)
-        if signal_data:
-            try:
-                signal = json.loads(signal_data)
-                evaluate_signal(signal)
-            except Exception as e:
-                logging.error(f"[Evaluator] Bad signal: {e}")
+        pipe = redis_client.pipeline()
+        pipe.lrange(SIGNAL_EVAL_QUEUE, 0, EVAL_BATCH_SIZE - 1)
+        pipe.ltrim(SIGNAL_EVAL_QUEUE, EVAL_BATCH_SIZE, -1)
+        batch, _ = pipe.execute()
+        if batch:
+            signals = []
+            for signal_data in batch:
+                try:
+                    signals.append(json.loads(signal_data))
+                except Exception as e:
+                    logging.error(f"[Evaluator] Bad signal: {e}")
+            evaluate_signals(signals)
         else:
             time.sleep(1)
 
 # === ENTRY POINT ===
 if __name__ == "__main__":
-    evaluator_loop()
+    try:
+        evaluator_loop()
+    finally:
+        strategy_store.close()
@@ -1,42 +1,157 @@
-import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
 import json
 import redis
 import time
-from ta.trend import MACD
-from ta.momentum import RSIIndicator
+
+import data_sources
+import indicator_kernels as kernels
 
 TIMEFRAMES = {
-    "M5": mt5.TIMEFRAME_M5,
-    "M15": mt5.TIMEFRAME_M15,
-    "H1": mt5.TIMEFRAME_H1,
+    "M5": data_sources.TIMEFRAME_M5,
+    "M15": data_sources.TIMEFRAME_M15,
+    "H1": data_sources.TIMEFRAME_H1,
+}
+MOMENTUM_PERIOD = 4
+# Only this timeframe is fetched; every other timeframe is resampled from it.
+TIMEFRAME_CODES = {label: code for code, label in data_sources.TIMEFRAME_LABELS.items()}
+BASE_TIMEFRAME = "M5"
+# Confirmations closer together than this reuse the cached base bars without a fetch.
+MIN_REFRESH_SECONDS = 1.0
+OHLC_AGGREGATION = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "tick_volume": "sum",
+    "spread": "max",
+    "real_volume": "sum",
 }
 
+
+def resample_bars(df, seconds):
+    buckets = df['time'].dt.floor(f"{seconds}s")
+    agg = {column: how for column, how in OHLC_AGGREGATION.items() if column in df.columns}
+    return df.groupby(buckets).agg(agg).reset_index()
+
+
+class BarResampler:
+    """Base-timeframe bars for one symbol plus higher timeframes derived from them incrementally."""
+
+    def __init__(self, base_seconds, timeframe_seconds, lookback):
+        self.base_seconds = base_seconds
+        self.timeframe_seconds = timeframe_seconds
+        self.lookback = lookback
+        # One extra bucket so the oldest derived bar kept is never a partial one.
+        self.max_base_bars = (lookback + 1) * max(timeframe_seconds.values()) // base_seconds
+        self.base = None
+        self.frames = {}
+        self.fetched_at = 0.0
+
+    @property
+    def last_time(self):
+        return None if self.base is None else self.base['time'].iloc[-1]
+
+    def update(self, new_bars):
+        first = new_bars['time'].iloc[0]
+        if self.base is None:
+            self.base = new_bars
+        else:
+            # Newly fetched bars replace any cached ones they overlap (revised or still-forming bars).
+            self.base = pd.concat([self.base[self.base['time'] < first], new_bars], ignore_index=True)
+        self.base = self.base.iloc[-self.max_base_bars:].reset_index(drop=True)
+
+        for label, seconds in self.timeframe_seconds.items():
+            if seconds == self.base_seconds:
+                self.frames[label] = self.base.iloc[-self.lookback:]
+                continue
+            bucket_start = first.floor(f"{seconds}s")
+            kept = self.frames.get(label)
+            fresh = resample_bars(self.base[self.base['time'] >= bucket_start], seconds)
+            if kept is not None:
+                fresh = pd.concat([kept[kept['time'] < bucket_start], fresh], ignore_index=True)
+            self.frames[label] = fresh.iloc[-self.lookback:].reset_index(drop=True)
+
+
 class MTFConfirmation:
-    def __init__(self, symbol="EURUSD", lookback=100, redis_host="localhost", redis_port=6379):
+    timeframes = TIMEFRAMES
+
+    def __init__(self, symbol="EURUSD", lookback=100, redis_host="localhost", redis_port=6379, data_source=None,
+                 timeframes=None, base_timeframe=BASE_TIMEFRAME):
         self.symbol = symbol
         self.lookback = lookback
         self.redis = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
-        if not mt5.initialize():
+        self.data_source = data_source or data_sources.MT5DataSource()
+        if timeframes is not None:
+            self.timeframes = {label: TIMEFRAME_CODES[label] for label in timeframes}
+        self.base_timeframe = base_timeframe
+        self.resamplers = {}
+        if not self.data_source.initialize():
             raise ConnectionError("MetaTrader5 initialization failed.")
 
-    def get_data(self, timeframe):
-        rates = mt5.copy_rates_from_pos(self.symbol, timeframe, 0, self.lookback)
+    def fetch_rates(self, timeframe, count):
+        rates = self.data_source.copy_rates_from_pos(self.symbol, timeframe, 0, count)
+        if rates is None or len(rates) == 0:
+            raise ValueError(f"No {data_sources.TIMEFRAME_LABELS[timeframe]} data for {self.symbol}")
         df = pd.DataFrame(rates)
         df['time'] = pd.to_datetime(df['time'], unit='s')
         return df
 
+    def resampler(self):
+        if self.symbol not in self.resamplers:
+            base_code = TIMEFRAME_CODES[self.base_timeframe]
+            seconds = {label: data_sources.TIMEFRAME_SECONDS[code] for label, code in self.timeframes.items()}
+            for label, tf_seconds in seconds.items():
+                if tf_seconds % data_sources.TIMEFRAME_SECONDS[base_code]:
+                    raise ValueError(f"{label} is not a multiple of base timeframe {self.base_timeframe}")
+            self.resamplers[self.symbol] = BarResampler(data_sources.TIMEFRAME_SECONDS[base_code], seconds, self.lookback)
+        return self.resamplers[self.symbol]
+
+    def refresh(self, resampler):
+        """Fetch base bars newer than the cache (with one bar of overlap), widening only on gaps."""
+        base_code = TIMEFRAME_CODES[self.base_timeframe]
+        if resampler.last_time is None:
+            df = self.fetch_rates(base_code, resampler.max_base_bars)
+        else:
+            elapsed_bars = int((time.monotonic() - resampler.fetched_at) // resampler.base_seconds)
+            count = min(elapsed_bars + 2, resampler.max_base_bars)
+            df = self.fetch_rates(base_code, count)
+            while df['time'].iloc[0] > resampler.last_time and count < resampler.max_base_bars:
+                count = min(count * 4, resampler.max_base_bars)
+                df = self.fetch_rates(base_code, count)
+        resampler.update(df)
+        resampler.fetched_at = time.monotonic()
+
+    def get_data(self, timeframe):
+        label = data_sources.TIMEFRAME_LABELS.get(timeframe, timeframe)
+        resampler = self.resampler()
+        if resampler.base is None or time.monotonic() - resampler.fetched_at >= MIN_REFRESH_SECONDS:
+            self.refresh(resampler)
+        return resampler.frames[label].copy()
+
     def compute_indicators(self, df):
-        df['macd'] = MACD(df['close']).macd()
-        df['rsi'] = RSIIndicator(df['close']).rsi()
-        df['momentum'] = df['close'] - df['close'].shift(4)
-        df.dropna(inplace=True)
-        return df
+        return self.compute_indicators_batch([df])[0]
+
+    def compute_indicators_batch(self, frames):
+        """Add MACD, RSI and momentum to several frames with one (frames x bars) kernel pass."""
+        close = kernels.stack([df['close'].to_numpy() for df in frames])
+        columns = {
+            'macd': kernels.macd(close),
+            'rsi': kernels.rsi(close),
+            'momentum': kernels.momentum(close, MOMENTUM_PERIOD),
+        }
+        for row, df in enumerate(frames):
+            offset = close.shape[1] - len(df)
+            for name, values in columns.items():
+                df[name] = values[row, offset:]
+            df.dropna(inplace=True)
+        return frames
 
     def determine_trend(self, df):
         df = self.compute_indicators(df)
-        recent = df.iloc[-1]
+        return self.score_trend(df.iloc[-1])
+
+    def score_trend(self, recent):
         score = 0
 
         if recent['macd'] > 0:
@@ -68,9 +183,11 @@ class MTFConfirmation:
         trend_summary = {}
         score_sum = 0
 
-        for label, tf in TIMEFRAMES.items():
-            df = self.get_data(tf)
-            trend, score = self.determine_trend(df)
+        frames = {label: self.get_data(tf) for label, tf in self.timeframes.items()}
+        self.compute_indicators_batch(list(frames.values()))
+
+        for label, df in frames.items():
+            trend, score = self.score_trend(df.iloc[-1])
             trend_summary[label] = {"trend": trend, "score": score}
             score_sum += score
 
@@ -133,4 +250,4 @@ class MTFConfirmation:
                 continue
 
     def shutdown(self):
-        mt5.shutdown()
+        self.data_source.shutdown()
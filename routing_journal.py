@@ -0,0 +1,196 @@
+# Append-only journal of routed signals.
+# Signals are written as JSON lines into numbered segment files that rotate by size or age.
+# Every `index_every` records, a sparse index entry (byte range, min/max timestamp, symbols)
+# is appended to the segment's `.idx` sidecar, so a replay for a time range or symbol
+# reads only the blocks that can match instead of scanning whole segments.
+import os
+import json
+import time
+import threading
+
+import timeutil
+
+# === CONFIGURATION ===
+JOURNAL_FOLDER = "routing_journal"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+SEGMENT_MAX_SECONDS = 3600
+INDEX_EVERY = 256  # records per sparse index block
+WRITE_BUFFER_BYTES = 1024 * 1024
+# "always": fsync on every flush; "interval": at most every FSYNC_INTERVAL seconds; "never": leave it to the OS.
+FSYNC_POLICY = "interval"
+FSYNC_INTERVAL = 1.0
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def record_time(signal):
+    try:
+        return timeutil.to_epoch(signal["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RoutingJournal:
+    def __init__(self, folder=JOURNAL_FOLDER, segment_max_bytes=SEGMENT_MAX_BYTES,
+                 segment_max_seconds=SEGMENT_MAX_SECONDS, index_every=INDEX_EVERY,
+                 fsync=FSYNC_POLICY, fsync_interval=FSYNC_INTERVAL):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.folder = folder
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_seconds = segment_max_seconds
+        self.index_every = index_every
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.lock = threading.RLock()
+        self.file = None
+        self.index_file = None
+        os.makedirs(folder, exist_ok=True)
+
+    # === SEGMENTS ===
+    def segment_path(self, seq, suffix=".jsonl"):
+        return os.path.join(self.folder, f"segment-{seq:08d}{suffix}")
+
+    def segments(self):
+        names = (name for name in os.listdir(self.folder) if name.startswith("segment-") and name.endswith(".jsonl"))
+        return sorted(int(name[len("segment-"):-len(".jsonl")]) for name in names)
+
+    def _open_segment(self):
+        existing = self.segments()
+        # A restarted writer never appends to an old segment; its unindexed tail stays readable.
+        self.seq = existing[-1] + 1 if existing else 1
+        self.file = open(self.segment_path(self.seq), "ab", buffering=WRITE_BUFFER_BYTES)
+        self.index_file = open(self.segment_path(self.seq, ".idx"), "a", buffering=1)
+        self.offset = 0
+        self.opened_at = time.monotonic()
+        self.last_fsync = time.monotonic()
+        self._new_block()
+
+    def _new_block(self):
+        self.block = {"offset": self.offset, "count": 0, "min_ts": None, "max_ts": None, "symbols": set()}
+
+    def _close_block(self):
+        block = self.block
+        if block["count"]:
+            entry = dict(block, end=self.offset, symbols=sorted(block["symbols"]))
+            self.index_file.write(json.dumps(entry) + "\n")
+        self._new_block()
+
+    def _close_segment(self):
+        self._close_block()
+        self.file.flush()
+        if self.fsync != "never":
+            os.fsync(self.file.fileno())
+        self.file.close()
+        self.index_file.close()
+        self.file = self.index_file = None
+
+    # === WRITES ===
+    def append(self, signal):
+        self.append_many([signal])
+
+    def append_many(self, signals):
+        with self.lock:
+            if self.file is None:
+                self._open_segment()
+            for signal in signals:
+                if (self.offset >= self.segment_max_bytes
+                        or time.monotonic() - self.opened_at >= self.segment_max_seconds):
+                    self._close_segment()
+                    self._open_segment()
+                line = (json.dumps(signal) + "\n").encode()
+                self.file.write(line)
+                self.offset += len(line)
+
+                block = self.block
+                ts = record_time(signal)
+                if ts is not None:
+                    block["min_ts"] = ts if block["min_ts"] is None else min(block["min_ts"], ts)
+                    block["max_ts"] = ts if block["max_ts"] is None else max(block["max_ts"], ts)
+                else:
+                    block["unindexed"] = True
+                block["symbols"].add(signal.get("symbol"))
+                block["count"] += 1
+                if block["count"] >= self.index_every:
+                    self._close_block()
+
+    def flush(self):
+        """Hand buffered records to the OS, and fsync according to the policy."""
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.flush()
+            now = time.monotonic()
+            if self.fsync == "always" or (self.fsync == "interval" and now - self.last_fsync >= self.fsync_interval):
+                os.fsync(self.file.fileno())
+                self.last_fsync = now
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self._close_segment()
+
+    # === READS ===
+    def load_index(self, seq):
+        blocks = []
+        try:
+            with open(self.segment_path(seq, ".idx")) as f:
+                for line in f:
+                    try:
+                        blocks.append(json.loads(line))
+                    except ValueError:
+                        break  # torn last line after a crash; the rest is read as the tail
+        except FileNotFoundError:
+            pass
+        return blocks
+
+    @staticmethod
+    def block_matches(block, start, end, symbol):
+        if symbol is not None and symbol not in block["symbols"]:
+            return False
+        if block.get("unindexed") or block["min_ts"] is None:
+            return True
+        if start is not None and block["max_ts"] < start:
+            return False
+        if end is not None and block["min_ts"] >= end:
+            return False
+        return True
+
+    @staticmethod
+    def _matching(lines, start, end, symbol):
+        for line in lines:
+            try:
+                signal = json.loads(line)
+            except ValueError:
+                continue  # partial line from an interrupted write
+            if symbol is not None and signal.get("symbol") != symbol:
+                continue
+            if start is not None or end is not None:
+                ts = record_time(signal)
+                if ts is None or (start is not None and ts < start) or (end is not None and ts >= end):
+                    continue
+            yield signal
+
+    def read(self, start=None, end=None, symbol=None):
+        """Stream journaled signals in routing order with `start <= timestamp < end` and/or the given symbol."""
+        start = None if start is None else timeutil.to_epoch(start)
+        end = None if end is None else timeutil.to_epoch(end)
+        self.flush()
+        for seq in self.segments():
+            blocks = self.load_index(seq)
+            with open(self.segment_path(seq), "rb") as f:
+                for block in blocks:
+                    if self.block_matches(block, start, end, symbol):
+                        f.seek(block["offset"])
+                        yield from self._matching(f.read(block["end"] - block["offset"]).splitlines(), start, end, symbol)
+                # Records after the last index entry: the open block, or a segment cut short by a crash.
+                f.seek(blocks[-1]["end"] if blocks else 0)
+                yield from self._matching(f.read().splitlines(), start, end, symbol)
+
+
+def replay(journal, receive, start=None, end=None, symbol=None):
+    """Feed matching journaled signals to `receive` (e.g. Module D's replay_signal); returns the count."""
+    count = 0
+    for signal in journal.read(start, end, symbol):
+        receive(signal)
+        count += 1
+    return count
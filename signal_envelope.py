@@ -0,0 +1,109 @@
+import os
+import json
+import base64
+import functools
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# === CONFIGURATION ===
+# Every module must share the same key. It is read from the environment, or from KEY_FILE,
+# as a url-safe base64 string of 32 bytes (the format Fernet.generate_key() produces).
+MODE_ENV_VAR = "SIGNAL_ENVELOPE_MODE"
+KEY_ENV_VAR = "SIGNAL_ENVELOPE_KEY"
+KEY_FILE = "signal_envelope.key"
+DEFAULT_MODE = "fernet"
+MODES = ("none", "fernet", "aesgcm", "chacha20")
+
+# Leading byte of a raw AEAD token. Decoded Fernet tokens start with 0x80, so tokens are self-describing.
+AEAD_VERSIONS = {"aesgcm": 0xA1, "chacha20": 0xC2}
+AEAD_MODES = {version: mode for mode, version in AEAD_VERSIONS.items()}
+NONCE_SIZE = 12
+# HKDF labels: each cipher gets its own subkey of the shared secret, never the secret itself.
+KEY_LABELS = {"fernet": b"signal-envelope/fernet", "aesgcm": b"signal-envelope/aesgcm",
+              "chacha20": b"signal-envelope/chacha20"}
+
+
+def load_key():
+    key = os.environ.get(KEY_ENV_VAR)
+    if not key and os.path.exists(KEY_FILE):
+        with open(KEY_FILE) as f:
+            key = f.read().strip()
+    if not key:
+        raise ValueError(f"No envelope key configured: set {KEY_ENV_VAR} or create {KEY_FILE}")
+    return key.encode() if isinstance(key, str) else key
+
+
+def derive_key(secret, mode):
+    """32-byte subkey of `secret` for one cipher mode."""
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=KEY_LABELS[mode]).derive(secret)
+
+
+class SealedPayload:
+    """One serialized + encrypted signal; `raw` for binary transports, `text` for JSON bodies."""
+
+    def __init__(self, raw, text=None):
+        self.raw = raw
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = base64.urlsafe_b64encode(self.raw).decode()
+        return self._text
+
+
+class Envelope:
+    def __init__(self, mode=DEFAULT_MODE, key=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown envelope mode: {mode}")
+        self.mode = mode
+        self._fernet = None
+        self._aead = {}
+        if mode != "none":
+            key = key if key is not None else load_key()
+            self._secret = base64.urlsafe_b64decode(key)
+            self._fernet = Fernet(base64.urlsafe_b64encode(derive_key(self._secret, "fernet")))
+
+    def _aead_cipher(self, mode):
+        if mode not in self._aead:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+            key = derive_key(self._secret, mode)
+            self._aead[mode] = AESGCM(key) if mode == "aesgcm" else ChaCha20Poly1305(key)
+        return self._aead[mode]
+
+    def seal(self, obj):
+        data = json.dumps(obj, separators=(",", ":")).encode()
+        if self.mode == "none":
+            return SealedPayload(data, data.decode())
+        if self.mode == "fernet":
+            token = self._fernet.encrypt(data)
+            return SealedPayload(token, token.decode())
+        nonce = os.urandom(NONCE_SIZE)
+        sealed = self._aead_cipher(self.mode).encrypt(nonce, data, None)
+        return SealedPayload(bytes([AEAD_VERSIONS[self.mode]]) + nonce + sealed)
+
+    def open(self, token):
+        """Decrypt a token produced by `seal` in any mode (text or raw form)."""
+        if self.mode == "none":
+            return json.loads(token)
+        if isinstance(token, str):
+            token = token.encode()
+        if token[0] not in AEAD_MODES:
+            if token.startswith(b"gAAAA"):
+                return json.loads(self._fernet.decrypt(token))
+            token = base64.urlsafe_b64decode(token)
+        mode = AEAD_MODES.get(token[0])
+        if mode is None:
+            raise ValueError("Unrecognised envelope token")
+        nonce, sealed = token[1:1 + NONCE_SIZE], token[1 + NONCE_SIZE:]
+        return json.loads(self._aead_cipher(mode).decrypt(nonce, sealed, None))
+
+
+@functools.lru_cache(maxsize=None)
+def default_envelope(enabled=True):
+    """Envelope for this process, built from configuration on first use."""
+    if not enabled:
+        return Envelope("none")
+    return Envelope(os.environ.get(MODE_ENV_VAR, DEFAULT_MODE))
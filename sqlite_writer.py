@@ -0,0 +1,88 @@
+import queue
+import sqlite3
+import threading
+
+import batch_queue
+
+# === CONFIGURATION ===
+BATCH_SIZE = 500  # rows per transaction at most
+FLUSH_INTERVAL = 0.25  # seconds a queued row may wait for its batch to fill
+QUEUE_SIZE = 100000
+
+
+def connect(db_file, **kwargs):
+    """SQLite connection in WAL mode: readers never block the writer and commits skip the per-transaction fsync."""
+    conn = sqlite3.connect(db_file, **kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class BatchedWriter:
+    """
+    Long-lived writer thread that owns one connection and group-commits queued rows:
+    each transaction inserts up to `batch_size` rows with executemany, or whatever
+    arrived within `flush_interval` of the first row.
+    """
+
+    def __init__(self, db_file, insert_sql, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 maxsize=QUEUE_SIZE, name="sqlite-writer"):
+        self.db_file = db_file
+        self.insert_sql = insert_sql
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = batch_queue.BatchQueue(maxsize)
+        self.dropped = 0
+        self.rejected = 0  # rows that failed even when inserted on their own
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def write(self, row):
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            print(f"[DB] Write queue full, dropped row ({self.dropped} total)")
+
+    def flush(self, timeout=None):
+        """Block until every row queued so far is committed; returns False on timeout."""
+        return self.queue.wait_done(timeout)
+
+    def close(self, timeout=None):
+        flushed = self.flush(timeout)
+        self.queue.put(batch_queue.STOP)
+        self.thread.join(timeout)
+        return flushed
+
+    def _insert(self, conn, rows):
+        try:
+            with conn:
+                conn.executemany(self.insert_sql, rows)
+            return
+        except Exception as e:
+            if len(rows) > 1:
+                print(f"[DB] Batch insert of {len(rows)} rows failed ({e}), retrying row by row")
+        # The failed transaction was rolled back; insert one row per transaction so a bad row costs only itself.
+        for row in rows:
+            try:
+                with conn:
+                    conn.execute(self.insert_sql, row)
+            except Exception as e:
+                self.rejected += 1
+                print(f"[DB] Rejected row {row!r}: {e}")
+
+    def _run(self):
+        conn = connect(self.db_file)
+        try:
+            while True:
+                batch = self.queue.next_batch(self.batch_size, self.flush_interval)
+                rows, stopped = batch_queue.split(batch)
+                try:
+                    if rows:
+                        self._insert(conn, rows)
+                finally:
+                    self.queue.batch_done(batch)
+                if stopped:
+                    return
+        finally:
+            conn.close()
@@ -0,0 +1,98 @@
+# Failure counts per strategy for Module E.
+# SnapshotStrategyMemory keeps the counts in a dict and writes them behind, at most every
+# `snapshot_interval` seconds and only when they changed, via a temp file and os.replace so
+# a crash never leaves a torn file. RedisStrategyMemory keeps them in a Redis hash updated
+# with HINCRBY/HDEL, so several evaluator processes share one view.
+import os
+import json
+import atexit
+import logging
+import threading
+
+# === CONFIGURATION ===
+SNAPSHOT_PATH = "failed_strategies.json"
+SNAPSHOT_INTERVAL = 5.0
+REDIS_KEY = "module_e:failed_strategies"
+
+
+def load_counts(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_counts(path, counts):
+    """Atomic write: readers see the old file or the new one, never a partial one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(counts, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+class SnapshotStrategyMemory:
+    def __init__(self, path=SNAPSHOT_PATH, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.counts = load_counts(path)
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="strategy-snapshot", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def failures(self, strategy_name):
+        return self.counts.get(strategy_name, 0)
+
+    def mark_failure(self, strategy_name):
+        with self._lock:
+            self.counts[strategy_name] = self.counts.get(strategy_name, 0) + 1
+            self.dirty = True
+
+    def mark_success(self, strategy_name):
+        with self._lock:
+            if self.counts.pop(strategy_name, None) is not None:
+                self.dirty = True
+
+    def snapshot(self):
+        """Write the counts if they changed since the last snapshot."""
+        with self._lock:
+            if not self.dirty:
+                return False
+            counts = dict(self.counts)
+            self.dirty = False
+        try:
+            save_counts(self.path, counts)
+        except OSError as e:
+            logging.error(f"[StrategyMemory] Snapshot failed: {e}")
+            self.dirty = True
+            return False
+        return True
+
+    def close(self):
+        self._stop.set()
+        self.snapshot()
+
+    def _run(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self.snapshot()
+
+
+class RedisStrategyMemory:
+    def __init__(self, client, key=REDIS_KEY):
+        self.client = client
+        self.key = key
+
+    def failures(self, strategy_name):
+        return int(self.client.hget(self.key, strategy_name) or 0)
+
+    def mark_failure(self, strategy_name):
+        self.client.hincrby(self.key, strategy_name, 1)
+
+    def mark_success(self, strategy_name):
+        self.client.hdel(self.key, strategy_name)
+
+    def close(self):
+        pass
@@ -0,0 +1,87 @@
+# Declarative strategy rules shared by Module B and its backtest.
+# A rule is a `DataFrame.eval` condition over indicator columns; `prev_<column>` refers to
+# the bar before. Each rule is evaluated for every symbol at once, so adding a strategy
+# costs one column expression rather than another loop over symbols.
+import numpy as np
+import pandas as pd
+
+
+class Strategy:
+    def __init__(self, name, reason, condition, direction, confidence):
+        self.name = name
+        self.reason = reason
+        self.condition = condition
+        self.direction = direction
+        self.confidence = confidence
+
+    def __repr__(self):
+        return f"Strategy({self.reason!r}: {self.condition!r} -> {self.direction:+d} @ {self.confidence})"
+
+
+REGISTRY = []
+
+
+def register_strategy(name, reason, condition, direction, confidence, registry=None):
+    strategy = Strategy(name, reason, condition, direction, confidence)
+    (REGISTRY if registry is None else registry).append(strategy)
+    return strategy
+
+
+# === STRATEGIES ===
+# Module B's original momentum and MA-crossover rules.
+register_strategy("Momentum", "Momentum Long", "momentum > 0 and rsi > 55", 1, 0.75)
+register_strategy("Momentum", "Momentum Short", "momentum < 0 and rsi < 45", -1, 0.75)
+register_strategy("MA Crossover", "MA Bullish Crossover", "prev_ma_20 < prev_ma_50 and ma_20 > ma_50", 1, 0.65)
+register_strategy("MA Crossover", "MA Bearish Crossover", "prev_ma_20 > prev_ma_50 and ma_20 < ma_50", -1, 0.65)
+
+
+# === EVALUATION ===
+def latest_rows(frames):
+    """{symbol: frame} -> one row per symbol with the last bar's columns plus `prev_` columns for the bar before."""
+    symbols = list(frames)
+    if not symbols:
+        return pd.DataFrame()
+    tails = pd.concat([frames[symbol].iloc[-2:] for symbol in symbols], keys=symbols)
+    grouped = tails.groupby(level=0, sort=False)
+    last = grouped.nth(-1).droplevel(1).reindex(symbols)
+    prev = grouped.nth(-2).droplevel(1).reindex(symbols)
+    return pd.concat([last, prev.add_prefix("prev_")], axis=1)
+
+
+def wide_rows(wide):
+    """{column: DataFrame(bars x symbols)} -> long frame indexed by (time, symbol) with `prev_` columns."""
+    columns = {}
+    for column, frame in wide.items():
+        columns[column] = frame.stack(future_stack=True)
+        columns[f"prev_{column}"] = frame.shift(1).stack(future_stack=True)
+    return pd.DataFrame(columns)
+
+
+def evaluate(rows, strategies=None):
+    """Boolean matrix (rows x strategies): whether each strategy fires on each row. NaN inputs never fire."""
+    strategies = REGISTRY if strategies is None else strategies
+    fired = np.zeros((len(rows), len(strategies)), dtype=bool)
+    if len(rows):
+        for col, strategy in enumerate(strategies):
+            fired[:, col] = rows.eval(strategy.condition).to_numpy(dtype=bool)
+    return fired
+
+
+def group_masks(wide, strategies=None):
+    """{name: (long, short, confidence)} as (bars x symbols) masks, OR-ing the rules that share a name."""
+    strategies = REGISTRY if strategies is None else strategies
+    rows = wide_rows(wide)
+    fired = evaluate(rows, strategies)
+    template = wide[next(iter(wide))]
+    empty = pd.DataFrame(False, index=template.index, columns=template.columns)
+    masks = {}
+    for col, strategy in enumerate(strategies):
+        mask = pd.Series(fired[:, col], index=rows.index).unstack()
+        mask = mask.reindex(index=template.index, columns=template.columns, fill_value=False).astype(bool)
+        long, short, confidence = masks.get(strategy.name, (empty, empty, strategy.confidence))
+        if strategy.direction > 0:
+            long = long | mask
+        else:
+            short = short | mask
+        masks[strategy.name] = (long, short, max(confidence, strategy.confidence))
+    return masks
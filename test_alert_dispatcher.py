@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+from alert_dispatcher import AlertDispatcher, MemoryChannel, TelegramChannel
+
+
+def make_signal(i):
+    return {"symbol": "EURUSD", "direction": "BUY", "reason": f"alert {i}", "confidence": 0.9,
+            "timestamp": "2024-01-01T00:00:00"}
+
+
+def test_burst_becomes_one_digest_per_channel():
+    telegram, email = MemoryChannel("telegram"), MemoryChannel("email")
+    dispatcher = AlertDispatcher([telegram, email], window=0.1, rate_limits={})
+
+    started = time.perf_counter()
+    for i in range(30):
+        dispatcher.submit(make_signal(i))
+    assert time.perf_counter() - started < 0.05
+    assert dispatcher.close(timeout=5)
+
+    for channel in (telegram, email):
+        assert len(channel.messages) == 1
+        subject, text = channel.messages[0]
+        assert subject == "30 Signal Alerts"
+        assert "alert 0" in text and "alert 29" in text
+
+
+def test_rate_limited_channel_merges_pending_digests():
+    limited, unlimited = MemoryChannel("email"), MemoryChannel("log")
+    dispatcher = AlertDispatcher([limited, unlimited], window=0.02, rate_limits={"email": (1, 60)})
+
+    for i in range(3):
+        dispatcher.submit(make_signal(i))
+        time.sleep(0.15)
+    assert dispatcher.close(timeout=5)
+
+    assert len(unlimited.messages) == 3
+    assert [subject for subject, _ in limited.messages] == ["Signal Alert", "2 Signal Alerts"]
+
+
+def test_merged_digests_are_split_to_fit_one_message():
+    limited = MemoryChannel("telegram")
+    dispatcher = AlertDispatcher([limited], window=0.01, max_digest=50, max_chars=1000,
+                                 rate_limits={"telegram": (1, 0.2)})
+
+    dispatcher.submit(make_signal("first"))
+    time.sleep(0.05)
+    for i in range(60):
+        dispatcher.submit(make_signal(i))
+    time.sleep(0.05)
+    assert len(limited.messages) == 1  # the rest wait for a token
+    assert dispatcher.close(timeout=5)
+
+    texts = [text for _, text in limited.messages]
+    assert all(len(text) <= 1000 for text in texts) and len(texts) > 2
+    assert sum(text.count("Confidence") for text in texts) == 61
+    assert "alert 59" in texts[-1]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    channel = MemoryChannel()
+    dispatcher = AlertDispatcher([channel], window=0.2, maxsize=2, max_digest=1, rate_limits={})
+
+    for i in range(10):
+        dispatcher.submit(make_signal(i))
+    dispatcher.close(timeout=5)
+
+    assert dispatcher.dropped > 0
+    assert sum(text.count("Confidence") for _, text in channel.messages) == 10 - dispatcher.dropped
+
+
+class LoopBoundBot:
+    """Async bot whose connection pool, like python-telegram-bot's, only works on its first loop."""
+
+    def __init__(self):
+        self.loop = None
+        self.sent = []
+        self.shut_down = False
+
+    async def send_message(self, chat_id, text):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        if loop is not self.loop or self.loop.is_closed():
+            raise RuntimeError("Event loop is closed")
+        self.sent.append(text)
+
+    async def shutdown(self):
+        self.shut_down = True
+
+
+def test_telegram_channel_sends_consecutive_messages_on_one_loop():
+    channel = TelegramChannel("token", "chat")
+    channel.bot = LoopBoundBot()
+    dispatcher = AlertDispatcher([channel], window=0.01, rate_limits={})
+
+    for i in range(3):
+        dispatcher.submit(make_signal(i))
+        time.sleep(0.1)
+    assert dispatcher.close(timeout=5)
+
+    assert dispatcher.sent["telegram"] == 3
+    assert ["alert 0" in text for text in channel.bot.sent] == [True, False, False]
+    assert channel.bot.shut_down and channel.loop is None
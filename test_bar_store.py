@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_store import ColumnarBarStore, CsvBarStore, open_store
+
+
+def make_frame(start, periods):
+    index = pd.date_range(start, periods=periods, freq="h", name="time")
+    return pd.DataFrame({
+        "close": np.linspace(1.1, 1.2, periods),
+        "tick_volume": np.arange(periods, dtype=np.uint64),
+        "spread": np.full(periods, 2, dtype=np.int32),
+        "rsi": np.linspace(40, 60, periods),
+    }, index=index)
+
+
+@pytest.mark.parametrize("store_cls", [ColumnarBarStore, CsvBarStore])
+def test_append_and_projection(tmp_path, store_cls):
+    store = store_cls(str(tmp_path))
+    first, second = make_frame("2024-01-01", 5), make_frame("2024-01-01 05:00", 3)
+
+    store.write("EURUSD", first)
+    store.append("EURUSD", second)
+
+    df = store.read("EURUSD", columns=["rsi"])
+    assert list(df.columns) == ["rsi"]
+    assert len(df) == 8
+    assert df.index[-1] == pd.Timestamp("2024-01-01 07:00")
+    assert store.last_time("EURUSD") == pd.Timestamp("2024-01-01 07:00")
+
+
+def test_columnar_keeps_types_and_ignores_uncommitted_bytes(tmp_path):
+    store = ColumnarBarStore(str(tmp_path))
+    store.write("EURUSD", make_frame("2024-01-01", 4))
+
+    # Simulate an append interrupted before meta.json was committed.
+    with open(tmp_path / "EURUSD_H1" / "close.bin", "ab") as f:
+        f.write(np.float64(9.9).tobytes())
+
+    df = store.read("EURUSD")
+    assert len(df) == 4
+    assert df["spread"].dtype == np.int32
+    assert df["tick_volume"].dtype == np.uint64
+
+    store.append("EURUSD", make_frame("2024-01-01 04:00", 1))
+    assert store.read("EURUSD", columns=["close"])["close"].iloc[-1] == pytest.approx(1.1)
+
+
+@pytest.mark.parametrize("store_cls", [ColumnarBarStore, CsvBarStore])
+def test_fingerprint_changes_on_append(tmp_path, store_cls):
+    store = store_cls(str(tmp_path))
+    assert store.fingerprint("EURUSD") is None
+
+    store.write("EURUSD", make_frame("2024-01-01", 5))
+    before = store.fingerprint("EURUSD")
+    assert before == store.fingerprint("EURUSD")
+
+    store.append("EURUSD", make_frame("2024-01-01 05:00", 1))
+    assert store.fingerprint("EURUSD") != before
+
+
+@pytest.mark.parametrize("store_cls", [ColumnarBarStore, CsvBarStore])
+def test_rewrite_replaces_files_instead_of_editing_them(tmp_path, store_cls):
+    store = store_cls(str(tmp_path))
+    store.write("EURUSD", make_frame("2024-01-01", 5))
+    before = store.read("EURUSD", columns=["close"])  # memory-mapped for the columnar store
+
+    store.write("EURUSD", make_frame("2024-02-01", 2))
+
+    assert len(before) == 5 and before["close"].iloc[-1] == pytest.approx(1.2)
+    assert len(store.read("EURUSD")) == 2
+    assert not [p for p in tmp_path.rglob("*.tmp")]
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        open_store("hdf5", str(tmp_path))
+
+
+@pytest.mark.parametrize("store_cls", [ColumnarBarStore, CsvBarStore])
+def test_truncate_then_append(tmp_path, store_cls):
+    store = store_cls(str(tmp_path))
+    store.write("EURUSD", make_frame("2024-01-01", 5))
+
+    store.truncate("EURUSD", 3)
+    assert len(store.read("EURUSD")) == 3
+    assert store.last_time("EURUSD") == pd.Timestamp("2024-01-01 02:00")
+
+    store.append("EURUSD", make_frame("2024-01-01 03:00", 2))
+    df = store.read("EURUSD")
+    assert len(df) == 5 and df.index.is_monotonic_increasing
+    assert df["close"].iloc[-1] == pytest.approx(make_frame("2024-01-01 03:00", 2)["close"].iloc[-1])
+    assert df["spread"].tolist() == [2] * 5
+
+
+def test_rewind_leaves_frames_already_read_intact(tmp_path):
+    store = ColumnarBarStore(str(tmp_path))
+    store.write("EURUSD", make_frame("2024-01-01", 5))
+    before = store.read("EURUSD")
+
+    store.truncate("EURUSD", 2)
+    store.append("EURUSD", make_frame("2024-02-01", 1))
+
+    assert list(before.index) == list(make_frame("2024-01-01", 5).index)
+    assert before["close"].iloc[-1] == pytest.approx(1.2)
+    assert list(store.read("EURUSD").index[-2:]) == [pd.Timestamp("2024-01-01 01:00"), pd.Timestamp("2024-02-01")]
@@ -0,0 +1,39 @@
+import threading
+import time
+
+import batch_queue
+from batch_queue import STOP, BatchQueue
+
+
+def test_batch_closes_when_full_or_at_stop():
+    q = BatchQueue()
+    for i in range(5):
+        q.put(i)
+    q.put(STOP)
+    q.put("after stop")
+
+    assert q.next_batch(3, flush_interval=10) == [0, 1, 2]
+    batch = q.next_batch(10, flush_interval=10)
+    assert batch == [3, 4, STOP] and batch_queue.split(batch) == ([3, 4], True)
+
+
+def test_batch_waits_flush_interval_after_first_item():
+    q = BatchQueue()
+    assert q.next_batch(10, flush_interval=0.05, idle_timeout=0.01) == []
+
+    threading.Timer(0.01, q.put, args=("late",)).start()
+    q.put("first")
+    started = time.monotonic()
+    assert q.next_batch(10, flush_interval=0.1) == ["first", "late"]
+    assert time.monotonic() - started >= 0.09
+
+
+def test_wait_done_tracks_whole_batches():
+    q = BatchQueue()
+    q.put(1)
+    q.put(2)
+    batch = q.next_batch(10, flush_interval=0)
+
+    assert not q.wait_done(timeout=0.01)
+    q.batch_done(batch)
+    assert q.wait_done(timeout=0.01)
@@ -0,0 +1,50 @@
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, SpillBuffer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_and_lets_one_trial_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker("rest", failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one trial in flight
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_spill_buffer_keeps_order_across_memory_and_disk(tmp_path):
+    buffer = SpillBuffer("rest", str(tmp_path), memory_items=3, max_items=8)
+    assert buffer.push([(i, f"p{i}") for i in range(10)]) == [(8, "p8"), (9, "p9")]
+    assert len(buffer) == 8 and buffer.spilled == 5
+
+    first = buffer.pop(2)
+    buffer.push_front(first[1:])
+    assert first == [(0, "p0"), (1, "p1")]
+    assert [item[0] for item in buffer.pop(10)] == [1, 2]
+    assert [item[0] for item in buffer.pop(10)] == [3, 4, 5]
+
+
+def test_spilled_items_survive_restart(tmp_path):
+    SpillBuffer("redis", str(tmp_path), memory_items=0).push([({"id": i}, "payload") for i in range(3)])
+
+    restarted = SpillBuffer("redis", str(tmp_path), memory_items=0)
+    assert len(restarted) == 3
+    assert restarted.pop(5) == [({"id": 0}, "payload")]
+    assert [item[0]["id"] for item in restarted.pop(5)] == [1]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from bar_store import ColumnarBarStore
+from data_sources import RATES_DTYPE, TIMEFRAME_H1, ReplayDataSource
+
+
+def write_history(folder, periods=10):
+    index = pd.date_range("2024-01-01", periods=periods, freq="h", name="time")
+    close = np.linspace(1.1, 1.2, periods)
+    df = pd.DataFrame({"open": close, "high": close, "low": close, "close": close}, index=index)
+    ColumnarBarStore(folder).write("EURUSD", df)
+    return df
+
+
+def test_replay_returns_mt5_records_without_lookahead(tmp_path):
+    df = write_history(str(tmp_path))
+    source = ReplayDataSource(str(tmp_path))
+
+    times = list(source.play("EURUSD", TIMEFRAME_H1))
+    assert len(times) == 10
+
+    source.now = times[2]  # third bar has just closed
+    rates = source.copy_rates_from_pos("EURUSD", TIMEFRAME_H1, 0, 100)
+    assert rates.dtype == RATES_DTYPE
+    assert len(rates) == 3
+    assert rates["close"][-1] == df["close"].iloc[2]
+
+
+def test_replay_missing_symbol_returns_none(tmp_path):
+    write_history(str(tmp_path))
+    assert ReplayDataSource(str(tmp_path)).copy_rates_from_pos("GBPUSD", TIMEFRAME_H1, 0, 10) is None
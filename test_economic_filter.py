@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+
+import economic_filter
+from economic_filter import EconomicFilterClient, LocalEconomicFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise economic_filter.requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class FakeService:
+    def __init__(self, delay=0.0, batch=True, answer=None):
+        self.calls = []
+        self.answer = answer or {"pass": True, "adjustment": 0.1}
+        self.delay = delay
+        self.down = False
+        self.batch = batch
+
+    def post(self, url, json, timeout):
+        self.calls.append((url, json))
+        time.sleep(self.delay)
+        if self.down:
+            raise ConnectionError("down")
+        if "signals" in json:
+            if not self.batch:
+                return FakeResponse({"detail": "Not Found"}, status_code=404)
+            return FakeResponse({"results": [{"pass": True, "adjustment": 0.05} for _ in json["signals"]]})
+        return FakeResponse(self.answer)
+
+
+def make_signal(symbol="EURUSD", timestamp="2024-01-01T10:00:05"):
+    return {"symbol": symbol, "strategy": "momentum", "confidence": 0.8, "timestamp": timestamp}
+
+
+def test_same_symbol_and_minute_is_cached(monkeypatch):
+    service, clock = FakeService(), FakeClock()
+    monkeypatch.setattr(economic_filter.requests, "post", service.post)
+    client = EconomicFilterClient(ttl=60, clock=clock)
+
+    assert client.check(make_signal()) == (True, 0.1)
+    assert client.check(make_signal(timestamp="2024-01-01T10:00:55")) == (True, 0.1)
+    assert len(service.calls) == 1
+    client.check(make_signal(timestamp="2024-01-01T10:01:00"))  # next minute
+    clock.now = 61
+    client.check(make_signal())  # expired
+    assert len(service.calls) == 3
+
+
+def test_concurrent_identical_lookups_share_one_request(monkeypatch):
+    service = FakeService(delay=0.1)
+    monkeypatch.setattr(economic_filter.requests, "post", service.post)
+    client = EconomicFilterClient()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.check(make_signal()))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(service.calls) == 1
+    assert results == [(True, 0.1)] * 8 and not client.in_flight
+
+
+def test_batch_posts_one_request_for_uncached_keys(monkeypatch):
+    service = FakeService()
+    monkeypatch.setattr(economic_filter.requests, "post", service.post)
+    client = EconomicFilterClient()
+    client.check(make_signal("EURUSD"))
+
+    signals = [make_signal(symbol) for symbol in ("EURUSD", "GBPUSD", "USDJPY", "GBPUSD")]
+    assert client.check_many(signals) == [(True, 0.1), (True, 0.05), (True, 0.05), (True, 0.05)]
+    url, body = service.calls[-1]
+    assert url == economic_filter.BATCH_ENDPOINT
+    assert [s["symbol"] for s in body["signals"]] == ["GBPUSD", "USDJPY"]
+
+
+def test_missing_batch_endpoint_falls_back_to_single_lookups(monkeypatch):
+    service = FakeService(batch=False)
+    monkeypatch.setattr(economic_filter.requests, "post", service.post)
+    client = EconomicFilterClient()
+
+    signals = [make_signal(symbol) for symbol in ("EURUSD", "GBPUSD", "USDJPY")]
+    assert client.check_many(signals) == [(True, 0.1)] * 3
+    assert [url for url, _ in service.calls] == [economic_filter.BATCH_ENDPOINT] + [economic_filter.FILTER_ENDPOINT] * 3
+
+    client.check_many([make_signal("AUDUSD"), make_signal("NZDUSD")])  # batch endpoint not retried
+    assert [url for url, _ in service.calls[4:]] == [economic_filter.FILTER_ENDPOINT] * 2
+
+
+def test_outage_serves_recent_answer_for_the_same_key_only(monkeypatch):
+    service, clock = FakeService(), FakeClock()
+    monkeypatch.setattr(economic_filter.requests, "post", service.post)
+    client = EconomicFilterClient(ttl=60, stale_if_error=300, clock=clock)
+    client.check(make_signal())
+
+    service.down = True
+    clock.now = 120
+    assert client.check(make_signal(timestamp="2024-01-01T10:00:30")) == (True, 0.1)
+    assert client.check(make_signal(timestamp="2024-01-01T10:02:00")) == economic_filter.UNKNOWN_RESULT
+    assert client.check(make_signal("GBPUSD")) == economic_filter.UNKNOWN_RESULT
+    clock.now = 400
+    assert client.check(make_signal()) == economic_filter.UNKNOWN_RESULT
+
+
+def test_outage_after_a_cached_block_does_not_ban_the_strategy(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Module E logs relative to the working directory
+    import module_e_strategy_selector as evaluator
+    import strategy_memory
+
+    service, clock = FakeService(answer={"pass": False, "adjustment": 0.0}), FakeClock()
+    monkeypatch.setattr(economic_filter.requests, "post", service.post)
+    client = EconomicFilterClient(ttl=60, clock=clock)
+    assert client.check(make_signal()) == (False, 0.0)
+
+    service.down = True
+    routed = []
+    store = strategy_memory.SnapshotStrategyMemory(str(tmp_path / "failed.json"), snapshot_interval=3600)
+    monkeypatch.setattr(evaluator, "strategy_store", store)
+    monkeypatch.setattr(evaluator, "route_to_module_i", routed.append)
+    monkeypatch.setattr(evaluator, "send_feedback", lambda signal, reason: None)
+
+    clock.now = 90
+    for minute in range(1, 4):
+        signal = make_signal(timestamp=f"2024-01-01T10:0{minute}:00")
+        evaluator.evaluate_signal(signal, client.check(signal))
+
+    assert len(routed) == 3 and store.failures("momentum") == 0
+    store.close()
+
+
+def test_local_filter_answers_from_synced_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(economic_filter.requests, "post", None)  # no round trips allowed
+    path = tmp_path / "calendar.json"
+    path.write_text(json.dumps({"events": [{"time": "2024-01-01T10:30:00", "affected_symbols": ["EURUSD"]}]}))
+    clock = FakeClock()
+    client = EconomicFilterClient(local=LocalEconomicFilter(str(path), sync_interval=30, clock=clock))
+
+    assert client.check(make_signal("EURUSD")) == (False, 0.0)
+    assert client.check(make_signal("GBPUSD")) == (True, 0.0)
+
+    path.write_text(json.dumps({"events": []}))
+    assert client.check(make_signal("EURUSD")) == (False, 0.0)  # not re-synced yet
+    clock.now = 30
+    assert client.check(make_signal("EURUSD")) == (True, 0.0)
+
+
+def test_unknown_answer_neither_blocks_nor_counts_as_failure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Module E logs relative to the working directory
+    import module_e_strategy_selector as evaluator
+    import strategy_memory
+
+    routed, feedback = [], []
+    store = strategy_memory.SnapshotStrategyMemory(str(tmp_path / "failed.json"), snapshot_interval=3600)
+    monkeypatch.setattr(evaluator, "strategy_store", store)
+    monkeypatch.setattr(evaluator, "route_to_module_i", routed.append)
+    monkeypatch.setattr(evaluator, "send_feedback", lambda signal, reason: feedback.append(reason))
+
+    for _ in range(3):
+        evaluator.evaluate_signal(make_signal(), economic_filter.UNKNOWN_RESULT)
+
+    assert len(routed) == 3 and not feedback
+    assert store.failures("momentum") == 0
+    store.close()
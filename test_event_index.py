@@ -0,0 +1,66 @@
+import datetime
+import json
+import os
+import random
+
+from event_index import EventIndex, to_epoch
+
+
+def write_calendar(path, events):
+    with open(path, "w") as f:
+        json.dump({"events": events}, f)
+
+
+def linear_blackout(events, symbol, timestamp, window=3600):
+    sig_time = datetime.datetime.fromisoformat(timestamp)
+    return any(symbol in e["affected_symbols"]
+               and abs((sig_time - datetime.datetime.fromisoformat(e["time"])).total_seconds()) < window
+               for e in events)
+
+
+def test_bisect_matches_linear_scan(tmp_path):
+    rng = random.Random(3)
+    start = datetime.datetime(2024, 1, 1)
+    symbols = ["EURUSD", "GBPUSD", "USDJPY"]
+    events = [{"time": (start + datetime.timedelta(minutes=rng.randrange(60 * 24 * 365))).isoformat(),
+               "affected_symbols": rng.sample(symbols, 2)} for _ in range(3000)]
+    path = tmp_path / "calendar.json"
+    write_calendar(path, events)
+    index = EventIndex(str(path))
+    index.refresh()
+
+    for _ in range(500):
+        symbol = rng.choice(symbols)
+        timestamp = (start + datetime.timedelta(seconds=rng.randrange(3600 * 24 * 365))).isoformat()
+        assert index.in_blackout(symbol, timestamp) == linear_blackout(events, symbol, timestamp)
+
+
+def test_window_per_importance():
+    index = EventIndex("unused.json", blackout_seconds={"high": 3600, "low": 600})
+    index.load([
+        {"time": "2024-03-01T12:00:00", "affected_symbols": ["EURUSD"], "importance": "low"},
+        {"time": "2024-03-01T18:00:00", "affected_symbols": ["EURUSD"], "importance": "high"},
+    ])
+
+    assert index.in_blackout("EURUSD", "2024-03-01T12:09:00")
+    assert not index.in_blackout("EURUSD", "2024-03-01T12:11:00")
+    assert index.in_blackout("EURUSD", "2024-03-01T17:01:00")
+    assert not index.in_blackout("GBPUSD", "2024-03-01T18:00:00")
+    assert to_epoch("2024-03-01T18:00:00+00:00") == to_epoch("2024-03-01T18:00:00")
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / "calendar.json"
+    index = EventIndex(str(path))
+    assert index.refresh() and not index.in_blackout("EURUSD", "2024-03-01T12:00:00")
+
+    write_calendar(path, [{"time": "2024-03-01T12:00:00", "affected_symbols": ["EURUSD"]}, {"time": "bad"}])
+    assert index.refresh()
+    assert index.in_blackout("EURUSD", "2024-03-01T12:30:00")
+    assert index.skipped == 1
+    assert not index.refresh()
+
+    write_calendar(path, [])
+    os.utime(path, ns=(0, 10**9))
+    assert index.refresh()
+    assert not index.in_blackout("EURUSD", "2024-03-01T12:30:00")
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_engine import INDICATOR_COLUMNS, IndicatorEngine, compute_indicators
+
+
+def make_bars(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.001, n))
+    return pd.DataFrame(
+        {"open": close, "high": close + 0.001, "low": close - 0.001, "close": close},
+        index=pd.date_range("2024-01-01", periods=n, freq="h", name="time"),
+    )
+
+
+def test_incremental_matches_batch():
+    df = make_bars()
+    batch = compute_indicators(df.copy())
+
+    engine = IndicatorEngine()
+    incremental = engine.update_frame("EURUSD", df).dropna()
+
+    assert list(incremental.index) == list(batch.index)
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(incremental[column], batch[column], rtol=1e-9, atol=1e-12)
+
+
+def test_seeded_state_extends_history():
+    df = make_bars(400)
+    engine = IndicatorEngine()
+    engine.compute_batch("EURUSD", df.iloc[:300].copy())
+
+    extended = engine.update_frame("EURUSD", df.iloc[300:])
+    full = compute_indicators(df.copy())
+
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(extended[column], full[column].iloc[-100:], rtol=1e-9, atol=1e-12)
+
+
+def test_not_ready_before_warmup():
+    engine = IndicatorEngine()
+    row = None
+    for close in make_bars(10)["close"]:
+        row = engine.update("EURUSD", close)
+    assert np.isnan(row["ma_50"])
+    assert not engine.states["EURUSD"].ready
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicator_kernels as kernels
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(11)
+    return [pd.Series(1.1 + np.cumsum(rng.normal(0, 0.001, n))) for n in (300, 120, 60)]
+
+
+def row_of(matrix, row, series):
+    return matrix[row, matrix.shape[1] - len(series):]
+
+
+def test_rolling_kernels_match_pandas(closes):
+    x = kernels.stack(closes)
+    for row, close in enumerate(closes):
+        np.testing.assert_allclose(row_of(kernels.rolling_mean(x, 20), row, close), close.rolling(20).mean(), rtol=1e-12)
+        np.testing.assert_allclose(row_of(kernels.rolling_std(x, 14), row, close), close.rolling(14).std(), rtol=1e-9)
+        np.testing.assert_allclose(row_of(kernels.momentum(x, 10), row, close), close - close.shift(10), atol=1e-15)
+        np.testing.assert_allclose(row_of(kernels.pct_change(x), row, close), close.pct_change(), rtol=1e-12)
+
+
+def test_ewm_kernels_match_ta(closes):
+    ta = pytest.importorskip("ta")
+    x = kernels.stack(closes)
+    for row, close in enumerate(closes):
+        np.testing.assert_allclose(row_of(kernels.rsi(x), row, close), ta.momentum.RSIIndicator(close).rsi(), rtol=1e-9)
+        np.testing.assert_allclose(row_of(kernels.macd(x), row, close), ta.trend.MACD(close).macd(), rtol=1e-9, atol=1e-12)
+
+
+def test_rsi_is_100_without_losses():
+    x = np.arange(1.0, 31.0)[None, :]
+    assert kernels.rsi(x)[0, -1] == 100.0
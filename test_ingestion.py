@@ -0,0 +1,116 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicator_engine
+from bar_store import ColumnarBarStore
+from data_sources import TIMEFRAME_H1, ReplayDataSource
+from ingestion import Ingestor
+
+
+def write_history(folder, symbols=("EURUSD", "GBPUSD"), periods=320, seed=5):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=periods, freq="h", name="time")
+    for symbol in symbols:
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, periods))
+        df = pd.DataFrame({"open": close, "high": close + 0.001, "low": close - 0.001, "close": close,
+                           "tick_volume": np.arange(periods, dtype=np.uint64)}, index=index)
+        ColumnarBarStore(folder).write(symbol, df)
+    return index
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    write_history(str(tmp_path / "history"))
+    source = ReplayDataSource(str(tmp_path / "history"))
+    return Ingestor(source, ColumnarBarStore(str(tmp_path / "market_data")), indicator_engine.IndicatorEngine(),
+                    TIMEFRAME_H1, bars=300)
+
+
+@pytest.mark.parametrize("compute_workers", [0, 2])
+def test_ingest_stores_indicators_and_seeds_engine(pipeline, compute_workers):
+    report = pipeline.ingest_symbols(["EURUSD", "GBPUSD", "USDJPY"], compute_workers=compute_workers)
+
+    assert report["USDJPY"]["status"] == "error" and report["USDJPY"]["stage"] == "fetch"
+    for symbol in ("EURUSD", "GBPUSD"):
+        entry = report[symbol]
+        assert entry["status"] == "ok" and entry["compute_s"] >= 0
+        expected = indicator_engine.compute_indicators(pipeline.get_data(symbol, 300))
+        stored = pipeline.store.read(symbol)
+        assert entry["rows"] == len(expected) == len(stored)
+        np.testing.assert_allclose(stored["rsi"], expected["rsi"])
+        assert pipeline.engine.has_state(symbol)
+
+
+def test_compute_time_is_measured_around_the_work(pipeline, monkeypatch):
+    import ingestion
+
+    real = indicator_engine.compute_indicators_batch
+
+    def slow_batch(frames):
+        time.sleep(0.05)
+        return real(frames)
+
+    monkeypatch.setattr(ingestion.indicator_engine, "compute_indicators_batch", slow_batch)
+    report = pipeline.ingest_symbols(["EURUSD", "GBPUSD"], compute_workers=0)
+
+    assert [report[symbol]["compute_s"] >= 0.05 for symbol in ("EURUSD", "GBPUSD")] == [True, True]
+
+
+def close_time(index, position):
+    """Replay clock at which the bar at `position` has just closed."""
+    return int((index[position] + pd.Timedelta(hours=1)).timestamp())
+
+
+@pytest.fixture
+def history(tmp_path):
+    return write_history(str(tmp_path / "history"))
+
+
+def test_fetch_delta_covers_the_gap_or_asks_for_a_full_fetch(pipeline, history):
+    pipeline.source.now = close_time(history, 309)
+
+    df = pipeline.fetch_delta("EURUSD", history[299])
+    assert df.index[0] <= history[299] and df.index[-1] == history[309]
+    assert (df.index > history[299]).sum() == 10
+
+    df = pipeline.fetch_delta("EURUSD", history[308])
+    assert list(df.index) == list(history[307:310])
+
+    assert pipeline.fetch_delta("EURUSD", history[0]) is None
+
+
+@pytest.mark.parametrize("restart", [False, True])
+def test_update_after_restart_matches_warm_engine_and_batch(pipeline, history, restart):
+    pipeline.source.now = close_time(history, 299)
+    pipeline.ingest_symbols(["EURUSD"], compute_workers=0)
+    if restart:
+        pipeline.engine = indicator_engine.IndicatorEngine()
+
+    pipeline.source.now = close_time(history, 309)
+    assert pipeline.update_symbol("EURUSD") == 10
+
+    stored = pipeline.store.read("EURUSD")
+    expected = indicator_engine.compute_indicators(pipeline.get_data("EURUSD", 310))
+    assert stored.index[-1] == history[309]
+    np.testing.assert_allclose(stored["rsi"].iloc[-10:], expected["rsi"].iloc[-10:])
+
+
+def test_revised_bar_rewinds_and_reseeds_from_raw_closes(pipeline, history, tmp_path):
+    pipeline.source.now = close_time(history, 299)
+    pipeline.ingest_symbols(["EURUSD"], compute_workers=0)
+
+    revised = ColumnarBarStore(str(tmp_path / "history")).read("EURUSD")
+    revised.iloc[299, revised.columns.get_loc("close")] += 0.01
+    ColumnarBarStore(str(tmp_path / "history")).write("EURUSD", revised)
+    pipeline.source = ReplayDataSource(str(tmp_path / "history"), start=close_time(history, 304))
+
+    assert pipeline.update_symbol("EURUSD") == 6
+
+    stored = pipeline.store.read("EURUSD")
+    expected = indicator_engine.compute_indicators(pipeline.get_data("EURUSD", 305))
+    assert stored.index.is_unique and stored.index[-1] == history[304]
+    assert stored["close"].loc[history[299]] == pytest.approx(revised["close"].iloc[299])
+    np.testing.assert_allclose(stored["rsi"].iloc[-6:], expected["rsi"].iloc[-6:])
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+import strategy_registry
+from module_b_backtest import run_backtest, summarize, to_wide
+
+
+def make_frame(closes, momentum, rsi):
+    index = pd.date_range("2024-01-01", periods=len(closes), freq="h", name="time")
+    return pd.DataFrame({
+        "close": closes,
+        "momentum": momentum,
+        "rsi": rsi,
+        "ma_20": closes,
+        "ma_50": closes,
+    }, index=index)
+
+
+def test_momentum_trades_and_stats():
+    # Long signal on bar 1, price rises on bar 2; short signal on bar 3, price rises on bar 4 (a loss).
+    frames = {"EURUSD": make_frame(
+        closes=[1.0, 1.0, 1.1, 1.1, 1.21],
+        momentum=[0, 1, 0, -1, 0],
+        rsi=[50, 60, 50, 40, 50],
+    )}
+    result = run_backtest(frames)["Momentum"]
+
+    assert result["entries"]["EURUSD"].tolist() == [False, True, False, True, False]
+    assert result["exits"]["EURUSD"].tolist() == [False, False, True, False, True]
+    assert result["stats"]["trades"] == 2
+    assert result["stats"]["hit_rate"] == 0.5
+    np.testing.assert_allclose(result["stats"]["pnl"], 0.0, atol=1e-12)
+    np.testing.assert_allclose(result["stats"]["max_drawdown"], -0.1)
+
+
+def test_last_bar_mask_matches_live_rule():
+    rng = np.random.default_rng(5)
+    frames = {symbol: make_frame(np.linspace(1, 2, 50), rng.normal(0, 1, 50), rng.uniform(30, 70, 50))
+              for symbol in ("EURUSD", "GBPUSD")}
+    long, short, _ = strategy_registry.group_masks(to_wide(frames))["Momentum"]
+    for symbol, df in frames.items():
+        assert long[symbol].iloc[-1] == (df["momentum"].iloc[-1] > 0 and df["rsi"].iloc[-1] > 55)
+        assert short[symbol].iloc[-1] == (df["momentum"].iloc[-1] < 0 and df["rsi"].iloc[-1] < 45)
+
+    # The live path (latest rows per symbol) fires exactly where the backtest masks end.
+    fired = strategy_registry.evaluate(strategy_registry.latest_rows(frames))
+    for row, symbol in enumerate(frames):
+        for col, strategy in enumerate(strategy_registry.REGISTRY):
+            long, short, _ = strategy_registry.group_masks(to_wide(frames), [strategy])[strategy.name]
+            assert fired[row, col] == (long if strategy.direction > 0 else short)[symbol].iloc[-1]
+    assert set(summarize(run_backtest(frames)).index) == {"Momentum", "MA Crossover"}
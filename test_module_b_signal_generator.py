@@ -0,0 +1,195 @@
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+from cryptography.fernet import Fernet
+
+import module_b_signal_generator as module_b
+import module_c_decision_filter as module_c
+import signal_envelope
+import strategy_registry
+
+
+@pytest.fixture
+def envelope_key(monkeypatch):
+    monkeypatch.setenv(signal_envelope.KEY_ENV_VAR, Fernet.generate_key().decode())
+    signal_envelope.default_envelope.cache_clear()
+    yield
+    signal_envelope.default_envelope.cache_clear()
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    # Module B's bar store and signal database live relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    # Sinks run inline and Redis is off, so a signal goes only where the test points it.
+    monkeypatch.setattr(module_b, "ASYNC_DISPATCH", False)
+    monkeypatch.setattr(module_b, "redis_client", None)
+    module_b.init_db()
+    gen = module_b.SignalGenerator()
+    yield gen
+    gen.shutdown(timeout=5)
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class FlaskSession:
+    """requests-style session that posts into a Flask app's test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def post(self, url, json, timeout):
+        return Response(self.client.post("/" + url.rsplit("/", 1)[-1], json=json).status_code)
+
+
+@pytest.mark.parametrize("mode", ["fernet", "aesgcm", "chacha20"])
+def test_module_c_unwraps_module_b_envelope(envelope_key, generator, monkeypatch, mode):
+    monkeypatch.setenv(signal_envelope.MODE_ENV_VAR, mode)
+    monkeypatch.setattr(module_b, "AUTO_TRIGGER_MODULE_I", False)
+    received = []
+    monkeypatch.setattr(module_c, "process_signal", lambda signal, payload: received.append(signal) or {})
+    generator._http.session = FlaskSession(module_c.create_app())
+
+    signal = generator.build_signal("EURUSD", 1, "Momentum Long", 0.75)  # sealed and sent to Module C
+
+    assert received == [signal]
+
+
+def make_signal(i=0):
+    return {"symbol": "EURUSD", "id": i}
+
+
+def test_dispatcher_fans_out_to_selected_sinks():
+    received = {"module_c": [], "redis": []}
+    dispatcher = module_b.SignalDispatcher({name: (lambda s, p, name=name: received[name].append((s["id"], p)))
+                                            for name in received})
+    dispatcher.submit(make_signal(1), "payload")
+    dispatcher.submit(make_signal(2), "payload", sinks=["redis"])
+    assert dispatcher.close(timeout=5)
+
+    assert received["module_c"] == [(1, "payload")]
+    assert sorted(received["redis"]) == [(1, "payload"), (2, "payload")]
+
+
+def test_full_dispatch_queue_drops_without_blocking():
+    started, release = threading.Event(), threading.Event()
+
+    def slow(signal, payload):
+        started.set()
+        release.wait(5)
+
+    dispatcher = module_b.SignalDispatcher({"slow": slow}, maxsize=1, workers_per_sink=1)
+    dispatcher.submit(make_signal(0))
+    assert started.wait(5)  # the worker holds signal 0; the queue has room for one more
+    began = time.perf_counter()
+    for i in range(1, 4):
+        dispatcher.submit(make_signal(i))
+    assert time.perf_counter() - began < 0.1
+    assert dispatcher.dropped == {"slow": 2}
+    release.set()
+    assert dispatcher.close(timeout=5)
+
+
+def test_close_delivers_work_handed_downstream():
+    delivered = []
+    sinks = {}
+
+    def module_c(signal, payload):
+        time.sleep(0.02)
+        dispatcher.submit(signal, payload, sinks=["module_i"])
+
+    sinks["module_c"] = module_c
+    sinks["module_i"] = lambda signal, payload: delivered.append(signal["id"])
+    dispatcher = module_b.SignalDispatcher(sinks, workers_per_sink=2)
+    for i in range(20):
+        dispatcher.submit(make_signal(i), sinks=["module_c"])
+
+    # Module C is still busy after the timeout, so module_i must be left running.
+    assert not dispatcher.close(timeout=0.05)
+    assert "module_i" not in dispatcher.closed
+    assert dispatcher.close(timeout=5)
+
+    assert sorted(delivered) == list(range(20))
+    assert dispatcher.dropped == {"module_c": 0, "module_i": 0}
+    dispatcher.submit(make_signal(99))
+    assert dispatcher.dropped == {"module_c": 1, "module_i": 1}
+
+
+def make_bars(momentum, rsi, periods=3, start="2024-01-01"):
+    index = pd.date_range(start, periods=periods, freq="h", name="time")
+    return pd.DataFrame({"momentum": [0.0] * (periods - 1) + [momentum], "rsi": [50.0] * (periods - 1) + [rsi],
+                         "ma_20": 1.1, "ma_50": 1.1}, index=index)
+
+
+def test_daemon_reevaluates_only_symbols_with_new_bars(envelope_key, generator, monkeypatch):
+    monkeypatch.setattr(module_b, "SYMBOLS", ["EURUSD", "GBPUSD"])
+    monkeypatch.setattr(generator, "send_to_module_c", lambda signal, payload=None: None)
+    generator.store.write("EURUSD", make_bars(momentum=0.0, rsi=50))
+    generator.store.write("GBPUSD", make_bars(momentum=1.0, rsi=60))
+    cycles = []
+    original = generator.run_cycle
+
+    def run_cycle(symbols=None):
+        changed = original(symbols)
+        cycles.append(changed)
+        return changed
+
+    def new_bars_arrive(seconds):
+        # Stands in for Module A writing between polls.
+        generator.store.append("EURUSD", make_bars(momentum=-1.0, rsi=40, periods=1, start="2024-01-01 03:00"))
+
+    monkeypatch.setattr(generator, "run_cycle", run_cycle)
+    monkeypatch.setattr(module_b.time, "sleep", new_bars_arrive)
+    generator.run_daemon(poll_interval=0.01, max_cycles=1)
+
+    assert cycles == [["EURUSD", "GBPUSD"], [], ["EURUSD"]]
+    with open(module_b.SIGNAL_OUTPUT_FILE) as f:
+        exported = json.load(f)
+    assert {(s["symbol"], s["reason"]) for s in exported} == {("EURUSD", "Momentum Short"), ("GBPUSD", "Momentum Long")}
+
+
+def test_frame_written_mid_read_is_retried(generator, monkeypatch):
+    generator.store.write("EURUSD", make_bars(momentum=1.0, rsi=60))
+    original = generator.store.read
+
+    def read_during_write(symbol, **kwargs):
+        df = original(symbol, **kwargs)
+        generator.store.append(symbol, make_bars(momentum=1.0, rsi=60, periods=1, start="2024-01-01 03:00"))
+        return df
+
+    monkeypatch.setattr(generator.store, "read", read_during_write)
+    assert generator.refresh_frames(["EURUSD"]) == []
+    assert "EURUSD" not in generator.frames and "EURUSD" not in generator.fingerprints
+
+    monkeypatch.setattr(generator.store, "read", original)
+    assert generator.refresh_frames(["EURUSD"]) == ["EURUSD"]
+    assert len(generator.frames["EURUSD"]) == 4
+
+
+def test_registry_signals_follow_symbol_then_registration_order(envelope_key, generator, monkeypatch):
+    monkeypatch.setattr(generator, "send_to_module_c", lambda signal, payload=None: None)
+    bullish_cross = make_bars(momentum=1.0, rsi=60)
+    bullish_cross["ma_20"] = [1.0, 1.0, 1.2]
+    bullish_cross["ma_50"] = [1.1, 1.1, 1.1]
+    frames = {"EURUSD": bullish_cross, "USDJPY": make_bars(momentum=-1.0, rsi=40), "GBPUSD": make_bars(0.0, 50)}
+
+    signals = generator.generate_registry_signals(frames)
+
+    assert [(s["symbol"], s["reason"], s["direction"]) for s in signals] == [
+        ("EURUSD", "Momentum Long", "BUY"),
+        ("EURUSD", "MA Bullish Crossover", "BUY"),
+        ("USDJPY", "Momentum Short", "SELL"),
+    ]
+    strategy = strategy_registry.Strategy("Oversold", "RSI Oversold", "rsi < 45", 1, 0.6)
+    assert [s["reason"] for s in generator.generate_registry_signals(frames, [strategy])] == ["RSI Oversold"]
@@ -0,0 +1,160 @@
+import asyncio
+import datetime
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+
+import module_c_decision_filter as module_c
+from module_c_asgi import DecisionFilterApp
+
+
+def make_signal(symbol="EURUSD", confidence=0.7, expires_in=10):
+    now = datetime.datetime.utcnow()
+    return {
+        "symbol": symbol,
+        "timestamp": now.isoformat(),
+        "direction": "BUY",
+        "reason": "test",
+        "confidence": confidence,
+        "expires": (now + datetime.timedelta(minutes=expires_in)).isoformat(),
+    }
+
+
+IMPORT_GUARD = """
+import json, sys, time
+started = time.perf_counter()
+import module_c_decision_filter as module_c
+elapsed = time.perf_counter() - started
+heavy = ["flask", "pandas", "matplotlib", "redis", "requests", "telegram", "yagmail"]
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [name for name in heavy if name in sys.modules],
+    "valid": module_c.is_valid({"expires": "2999-01-01T00:00:00", "confidence": 0.7}),
+}))
+"""
+
+
+def test_import_is_fast_and_offline():
+    # A fresh interpreter, so modules imported by other tests don't count.
+    out = subprocess.run([sys.executable, "-c", IMPORT_GUARD], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(module_c.__file__)))
+    report = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert report["loaded"] == []
+    assert report["valid"] is True
+    assert report["seconds"] < 0.5
+
+
+@pytest.fixture
+def decision_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(module_c, "DB_FILE", str(tmp_path / "decisions.db"))
+    monkeypatch.setattr(module_c, "EVENT_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr(module_c, "send_alerts", lambda signal: None)
+    module_c.init_db()
+    return module_c.DB_FILE
+
+
+def test_batch_results_in_input_order(decision_db, monkeypatch):
+    with open(module_c.EVENT_FILE, "w") as f:
+        json.dump({"events": [{"time": datetime.datetime.utcnow().isoformat(), "affected_symbols": ["GBPUSD"]}]}, f)
+    monkeypatch.setattr(module_c, "forward_to_module_i", lambda signal, payload=None: signal["symbol"] != "USDJPY")
+
+    signals = [
+        make_signal("EURUSD"),
+        make_signal("EURUSD", confidence=0.1),
+        make_signal("GBPUSD"),
+        make_signal("USDJPY"),
+        make_signal("EURUSD", expires_in=-1),
+    ]
+    results = module_c.process_signals(signals)
+
+    assert results == [
+        {"status": "accepted", "triggered": True},
+        {"status": "rejected"},
+        {"status": "rejected_event"},
+        {"status": "accepted", "triggered": False},
+        {"status": "rejected"},
+    ]
+    conn = sqlite3.connect(decision_db)
+    rows = conn.execute("SELECT symbol, decision, triggered FROM decisions ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [
+        ("EURUSD", "ACCEPTED", 1),
+        ("EURUSD", "REJECTED", 0),
+        ("GBPUSD", "REJECTED: news event", 0),
+        ("USDJPY", "ACCEPTED", 0),
+        ("EURUSD", "REJECTED", 0),
+    ]
+
+
+def test_replayed_signal_is_logged_but_never_forwarded(decision_db, monkeypatch):
+    forwarded = []
+    monkeypatch.setattr(module_c, "forward_to_module_i", lambda signal, payload=None: forwarded.append(signal) or True)
+
+    replayed = dict(make_signal(expires_in=60), replayed=True)
+    assert module_c.process_signals([replayed, make_signal()]) == [
+        {"status": "replayed"},
+        {"status": "accepted", "triggered": True},
+    ]
+
+    assert len(forwarded) == 1 and "replayed" not in forwarded[0]
+    conn = sqlite3.connect(decision_db)
+    assert conn.execute("SELECT decision FROM decisions ORDER BY id").fetchall() == [("REPLAYED",), ("ACCEPTED",)]
+    conn.close()
+
+
+def test_batch_forwards_concurrently(decision_db, monkeypatch):
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_forward(signal, payload=None):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return True
+
+    monkeypatch.setattr(module_c, "forward_to_module_i", slow_forward)
+    results = module_c.process_signals([make_signal() for _ in range(8)])
+
+    assert all(result == {"status": "accepted", "triggered": True} for result in results)
+    assert 1 < peak[0] <= module_c.FORWARD_WORKERS
+
+
+def test_async_app_forwards_through_pooled_client(decision_db, monkeypatch):
+    monkeypatch.setattr(module_c, "ENABLE_ENCRYPTION", False)
+    forwarded = []
+
+    def module_i(request):
+        forwarded.append(json.loads(request.content)["payload"])
+        return httpx.Response(200 if len(forwarded) == 1 else 503)
+
+    app = DecisionFilterApp(transport=httpx.MockTransport(module_i))
+    signals = [make_signal("EURUSD"), make_signal("GBPUSD", confidence=0.1), make_signal("USDJPY")]
+
+    async def exchange():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://module-c") as client:
+            single = await client.post("/receive_signal", json={"payload": json.dumps(signals[0])})
+            batch = await client.post("/receive_signals", json={"payload": json.dumps(signals[1:])})
+            missing = await client.post("/nowhere", json={})
+        await app.shutdown()
+        return single, batch, missing
+
+    single, batch, missing = asyncio.run(exchange())
+
+    assert single.json() == {"status": "accepted", "triggered": True}
+    assert batch.json() == {"results": [{"status": "rejected"}, {"status": "accepted", "triggered": False}]}
+    assert missing.status_code == 404
+    assert forwarded[0] == json.dumps(signals[0])
+    conn = sqlite3.connect(decision_db)
+    assert conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0] == 3
+    conn.close()
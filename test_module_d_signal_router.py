@@ -0,0 +1,345 @@
+import importlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import redis
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    # Module D opens its audit log relative to the working directory on import.
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("module_d_signal_router")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_signal(symbol="EURUSD", confidence=0.9, timestamp="2024-01-01T00:00:00"):
+    return {"symbol": symbol, "direction": "BUY", "confidence": confidence, "reason": "test", "timestamp": timestamp}
+
+
+def test_dedup_window_expires_in_order(router):
+    clock = FakeClock()
+    window = router.DedupWindow(window_seconds=10, capacity=100, clock=clock)
+
+    assert not window.seen("a")
+    clock.now = 5
+    assert not window.seen("b")
+    assert window.seen("a")
+
+    clock.now = 12  # "a" is past the window, "b" is not
+    assert window.seen("b")
+    assert list(window.entries) == ["b"]
+    assert not window.seen("a")
+
+
+def test_dedup_window_is_capped(router):
+    window = router.DedupWindow(window_seconds=60, capacity=3, clock=FakeClock())
+    for key in "abcde":
+        window.seen(key)
+
+    assert len(window) == 3 and window.evicted == 2
+    assert list(window.entries) == ["c", "d", "e"]
+
+
+def test_signal_hash_distinguishes_fields(router):
+    base = router.generate_signal_hash(make_signal())
+    assert base == router.generate_signal_hash(make_signal())
+    assert base != router.generate_signal_hash(make_signal(confidence=0.91))
+    assert base != router.generate_signal_hash(make_signal(symbol="GBPUSD"))
+
+
+class FakeRedis:
+    def __init__(self, down=False):
+        self.keys = {}
+        self.down = down
+
+    def set(self, key, value, nx=False, ex=None):
+        if self.down:
+            raise redis.ConnectionError("down")
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = (value, ex)
+        return True
+
+
+def test_redis_dedup_shared_between_replicas(router):
+    shared = FakeRedis()
+    first, second = router.RedisDedupWindow(shared, 300), router.RedisDedupWindow(shared, 300)
+
+    assert not first.seen("abc")
+    assert second.seen("abc")
+    assert shared.keys[router.DEDUP_REDIS_PREFIX + "abc"][1] == 300
+
+    offline = router.RedisDedupWindow(FakeRedis(down=True), 300)
+    assert not offline.seen("abc") and offline.seen("abc")
+
+
+def test_scheduler_orders_by_confidence_then_arrival(router):
+    scheduler = router.SignalScheduler()
+    for i, confidence in enumerate([0.7, 0.9, 0.7, 0.9]):
+        scheduler.put({"id": i, "confidence": confidence, "expires": "2999-01-01T00:00:00"})
+
+    assert [scheduler.get(timeout=0)["id"] for _ in range(4)] == [1, 3, 0, 2]
+    assert scheduler.get(timeout=0) is None
+
+
+def test_scheduler_drops_signals_that_expire_while_queued(router):
+    clock = FakeClock()
+    expired = []
+    scheduler = router.SignalScheduler(on_expired=expired.append, clock=clock)
+    scheduler.put({"id": "stale", "confidence": 0.9, "expires": "1970-01-01T00:00:10"})
+    scheduler.put({"id": "fresh", "confidence": 0.5, "expires": "1970-01-01T00:01:00"})
+
+    clock.now = 20
+    assert scheduler.get(timeout=0)["id"] == "fresh"
+    assert [s["id"] for s in expired] == ["stale"] and scheduler.expired == 1
+
+
+def test_scheduler_rejects_signals_already_expired_on_arrival(router):
+    clock = FakeClock()
+    clock.now = 20
+    expired = []
+    scheduler = router.SignalScheduler(on_expired=expired.append, clock=clock)
+
+    assert scheduler.put({"id": "stale", "confidence": 0.9, "expires": "1970-01-01T00:00:10"}) is False
+    assert scheduler.put({"id": "fresh", "confidence": 0.5, "expires": "1970-01-01T00:01:00"}) is True
+
+    assert len(scheduler) == 1 and [s["id"] for s in expired] == ["stale"] and scheduler.expired == 1
+
+
+def test_full_scheduler_sweeps_expired_signals_behind_the_front(router):
+    clock = FakeClock()
+    expired = []
+    scheduler = router.SignalScheduler(on_expired=expired.append, clock=clock, capacity=3)
+    scheduler.put({"id": "live", "confidence": 0.9, "expires": "1970-01-01T01:00:00"})
+    scheduler.put({"id": "old-1", "confidence": 0.5, "expires": "1970-01-01T00:00:10"})
+    scheduler.put({"id": "old-2", "confidence": 0.4, "expires": "1970-01-01T00:00:10"})
+
+    clock.now = 20
+    assert scheduler.put({"id": "new", "confidence": 0.6, "expires": "1970-01-01T01:00:00"})
+
+    assert len(scheduler) == 2 and sorted(s["id"] for s in expired) == ["old-1", "old-2"]
+    assert [scheduler.get(timeout=0)["id"] for _ in range(2)] == ["live", "new"]
+
+
+def test_scheduler_wakes_waiting_worker_and_drains_on_close(router):
+    scheduler = router.SignalScheduler()
+    received = []
+
+    def worker():
+        while True:
+            signal = scheduler.get()
+            if signal is None:
+                return
+            received.append((signal["id"], time.perf_counter() - signal["sent"]))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    scheduler.put({"id": 1, "confidence": 0.9, "expires": "2999-01-01T00:00:00", "sent": time.perf_counter()})
+    scheduler.close()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert received[0][0] == 1 and received[0][1] < 0.05
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.calls = []
+
+    def rpush(self, key, *values):
+        self.calls.append((key, values))
+
+
+def test_redis_sink_pushes_batches_in_one_call(router):
+    client = RecordingRedis()
+    sink = router.RedisSink(client, "signals", flush_interval=0.05, max_batch=10)
+    for i in range(25):
+        sink.submit(make_signal(), f"payload-{i}")
+    assert sink.close(timeout=5)
+
+    assert [len(values) for _, values in client.calls] == [10, 10, 5]
+    assert [v for _, values in client.calls for v in values] == [f"payload-{i}" for i in range(25)]
+
+
+def test_slow_sink_does_not_hold_back_others(router, monkeypatch):
+    class SlowSink(router.BatchingSink):
+        name = "slow"
+
+        def write_batch(self, items):
+            time.sleep(0.5)
+
+    monkeypatch.setattr(router, "feedback_to_module_f", lambda signal, reason: None)
+    client = RecordingRedis()
+    slow = SlowSink(flush_interval=0.01, max_batch=10)
+    fast = router.RedisSink(client, "signals", flush_interval=0.01, max_batch=10)
+
+    started = time.perf_counter()
+    for sink in (slow, fast):
+        sink.submit(make_signal(), "payload")
+    assert fast.flush(timeout=5)
+    assert time.perf_counter() - started < 0.3
+    assert client.calls == [("signals", ("payload",))]
+    slow.close(timeout=5)
+
+
+def test_rest_sink_posts_batches_to_module_c(router, monkeypatch):
+    posted = []
+
+    class FakeSession:
+        def post(self, url, json, timeout):
+            posted.append((url, json["payload"]))
+            return type("Response", (), {"ok": True, "status_code": 200})()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(router, "ENABLE_ENCRYPTION", False)
+    sink = router.RestSink("http://module-c/receive_signals", flush_interval=0.05, max_batch=50)
+    sink.session = FakeSession()
+    for i in range(3):
+        sink.submit(make_signal(confidence=i), None)
+    sink.close(timeout=5)
+
+    assert len(posted) == 1
+    url, payload = posted[0]
+    assert url == "http://module-c/receive_signals"
+    assert [s["confidence"] for s in json.loads(payload)] == [0, 1, 2]
+
+
+def test_unhealthy_destination_buffers_then_drains(router, tmp_path, monkeypatch):
+    import circuit_breaker
+
+    class FlakySink(router.BatchingSink):
+        name = "flaky"
+        down = True
+        calls = 0
+        written = []
+
+        def write_batch(self, items):
+            self.calls += 1
+            if self.down:
+                raise ConnectionError("down")
+            self.written.extend(payload for _, payload in items)
+
+    failed = []
+    monkeypatch.setattr(router, "feedback_to_module_f", lambda signal, reason: failed.append(reason))
+    breaker = circuit_breaker.CircuitBreaker("flaky", failure_threshold=1, reset_timeout=0.1)
+    retry = circuit_breaker.SpillBuffer("flaky", str(tmp_path), memory_items=2)
+    sink = FlakySink(flush_interval=0.01, max_batch=10, breaker=breaker, retry=retry, retry_interval=0.02)
+
+    signal = dict(make_signal(timestamp=datetime.utcnow().isoformat()), expires="2999-01-01T00:00:00")
+    for i in range(5):
+        sink.submit(signal, f"payload-{i}")
+        assert sink.flush(timeout=5)
+    assert breaker.state == circuit_breaker.OPEN
+    assert sink.calls < 5  # the open circuit fails fast instead of calling the destination
+    assert len(retry) == 5 and retry.spilled == 3 and not failed
+
+    sink.down = False
+    deadline = time.monotonic() + 5
+    while len(retry) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    sink.submit(signal, "payload-5")
+    sink.close(timeout=5)
+
+    assert sink.written == [f"payload-{i}" for i in range(6)]
+    assert breaker.state == circuit_breaker.CLOSED
+
+
+class RecordingPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.messages = []
+
+    def publish(self, channel, message):
+        self.messages.append((channel, json.loads(message)))
+
+    def execute(self):
+        self.client.batches.append(self.messages)
+
+
+class PublishingRedis:
+    def __init__(self):
+        self.batches = []
+
+    def pipeline(self, transaction=True):
+        return RecordingPipeline(self)
+
+
+def test_feedback_reports_are_published_per_batch(router, monkeypatch):
+    client = PublishingRedis()
+    sink = router.FeedbackSink(client, "trade_feedback", flush_interval=0.05, max_batch=100)
+    monkeypatch.setattr(router, "_feedback", sink)
+    for i in range(20):
+        router.feedback_to_module_f(make_signal(confidence=i), "expired")
+    sink.close(timeout=5)
+
+    assert len(client.batches) == 1
+    assert {channel for channel, _ in client.batches[0]} == {"trade_feedback"}
+    records = [record for _, record in client.batches[0]]
+    assert [record["signal"]["confidence"] for record in records] == list(range(20))
+    assert {(record["status"], record["reason"]) for record in records} == {("failed", "expired")}
+
+
+def test_backpressure_sheds_low_confidence_signals(router, monkeypatch):
+    shed = []
+    monkeypatch.setattr(router, "feedback_to_module_f", lambda signal, reason: shed.append(signal["confidence"]))
+    monkeypatch.setattr(router, "scheduler", router.SignalScheduler())
+    monkeypatch.setattr(router, "MAX_QUEUED_SIGNALS", 5)
+
+    accepted = [router.receive_signal(make_signal(confidence=c)) for c in (0.5, 0.6, 0.7, 0.8, 0.5, 0.9, 0.6)]
+
+    assert accepted == [True, True, True, True, False, True, False]
+    assert shed == [0.5, 0.6] and len(router.scheduler) == 5
+
+
+def test_replay_streams_to_the_replay_target_not_live_destinations(router, tmp_path, monkeypatch):
+    import routing_journal
+
+    class RecordingSink(router.BatchingSink):
+        def __init__(self, name):
+            self.name = name
+            self.written = []
+            super().__init__(flush_interval=0.01)
+
+        def write_batch(self, items):
+            self.written.extend(items)
+
+    feedback = []
+    monkeypatch.setattr(router, "feedback_to_module_f", lambda signal, reason: feedback.append(reason))
+    monkeypatch.setattr(router, "ENABLE_ENCRYPTION", False)
+    client = RecordingRedis()
+    replay_sink = router.RedisSink(client, router.REPLAY_TARGET, flush_interval=0.01)
+    live = {name: RecordingSink(name) for name in ("rest", "redis", "journal")}
+    monkeypatch.setattr(router, "_sinks", live)
+    monkeypatch.setattr(router, "_replay", replay_sink)
+
+    folder = str(tmp_path / "journal")
+    journal = routing_journal.RoutingJournal(folder, fsync="never")
+    old = make_signal(timestamp="2024-01-01T00:00:00")
+    now = datetime.utcnow()
+    unexpired = dict(make_signal(timestamp=now.isoformat()), expires=(now + timedelta(minutes=60)).isoformat())
+    journal.append_many([old, old, unexpired])  # also a duplicate: replay re-sends what was journaled
+    journal.close()
+
+    assert router.replay_signals(symbol="EURUSD", folder=folder) == 3
+    for sink in [replay_sink, *live.values()]:
+        sink.close(timeout=5)
+
+    assert {key for key, _ in client.calls} == {router.REPLAY_TARGET}
+    payloads = [json.loads(v) for _, values in client.calls for v in values]
+    assert len(payloads) == 3 and all(p["replayed"] for p in payloads)
+    assert [p["timestamp"] for p in payloads] == [old["timestamp"], old["timestamp"], unexpired["timestamp"]]
+    assert not any(sink.written for sink in live.values()) and not feedback and len(router.scheduler) == 0
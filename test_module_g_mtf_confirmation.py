@@ -1,6 +1,10 @@
 import pytest
+import time
+
+import numpy as np
 import pandas as pd
-from module_g_mtf_confirmation import MTFConfirmation
+from data_sources import TIMEFRAME_H1, TIMEFRAME_M5
+from module_g_mtf_confirmation import BASE_TIMEFRAME, TIMEFRAME_CODES, MTFConfirmation, resample_bars
 
 # Mock MTFConfirmation for local testing without MT5
 class DummyMTF(MTFConfirmation):
@@ -45,3 +49,63 @@ def test_confirm_signal(dummy_mtf):
     assert isinstance(result, dict)
     assert "confirmed" in result
     assert "trend_summary" in result
+
+class FakeM5Source:
+    """Serves synthetic M5 bars and records every fetch."""
+    def __init__(self, bars=30000):
+        from data_sources import RATES_DTYPE
+        self.rates = np.zeros(bars, dtype=RATES_DTYPE)
+        self.rates['time'] = 1704067200 + 300 * np.arange(bars)
+        close = 1.1 + np.cumsum(np.random.default_rng(3).normal(0, 0.0005, bars))
+        for field in ('open', 'high', 'low', 'close'):
+            self.rates[field] = close
+        self.rates['tick_volume'] = 1
+        self.visible = bars - 10
+        self.calls = []
+
+    def initialize(self):
+        return True
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self.calls.append((timeframe, count))
+        return self.rates[max(0, self.visible - count):self.visible].copy()
+
+
+class ResampledMTF(MTFConfirmation):
+    def __init__(self, source, timeframes=None):
+        self.symbol = "EURUSD"
+        self.lookback = 100
+        self.data_source = source
+        self.base_timeframe = BASE_TIMEFRAME
+        self.resamplers = {}
+        if timeframes:
+            self.timeframes = {label: TIMEFRAME_CODES[label] for label in timeframes}
+
+
+def test_confirm_signal_fetches_base_timeframe_once():
+    source = FakeM5Source()
+    mtf = ResampledMTF(source)
+    mtf.confirm_signal("buy")
+    assert [tf for tf, _ in source.calls] == [TIMEFRAME_M5]
+
+    mtf.resampler().fetched_at = time.monotonic() - 900  # three M5 bars later
+    source.visible += 3
+    mtf.confirm_signal("buy")
+    assert source.calls[1:] == [(TIMEFRAME_M5, 5)]
+
+
+def test_resampled_timeframes_match_direct_aggregation():
+    source = FakeM5Source()
+    mtf = ResampledMTF(source, timeframes=("M15", "H1", "H4", "D1"))
+    mtf.get_data(TIMEFRAME_H1)
+    mtf.resampler().fetched_at = time.monotonic() - 2100
+    source.visible += 7
+    h1 = mtf.get_data(TIMEFRAME_H1)
+    d1 = mtf.get_data("D1")
+
+    full = pd.DataFrame(source.rates[:source.visible])
+    full['time'] = pd.to_datetime(full['time'], unit='s')
+    expected = resample_bars(full, 3600).iloc[-100:].reset_index(drop=True)
+    pd.testing.assert_frame_equal(h1, expected, check_dtype=False)
+    assert len(d1) == 100
+    assert len(source.calls) == 2
@@ -0,0 +1,64 @@
+import datetime
+
+import pytest
+
+from routing_journal import RoutingJournal, replay
+
+START = datetime.datetime(2024, 1, 1)
+
+
+def make_signal(i, symbol="EURUSD"):
+    return {"id": i, "symbol": symbol, "timestamp": (START + datetime.timedelta(minutes=i)).isoformat()}
+
+
+def test_rotates_and_replays_time_range(tmp_path):
+    journal = RoutingJournal(str(tmp_path), segment_max_bytes=2000, index_every=10, fsync="never")
+    journal.append_many(make_signal(i, "EURUSD" if i % 2 else "GBPUSD") for i in range(200))
+    journal.flush()
+
+    assert len(journal.segments()) > 1
+    window = list(journal.read(START + datetime.timedelta(minutes=50), START + datetime.timedelta(minutes=60)))
+    assert [s["id"] for s in window] == list(range(50, 60))
+    assert [s["id"] for s in journal.read(symbol="EURUSD")] == list(range(1, 200, 2))
+    journal.close()
+
+
+def test_sparse_index_skips_blocks(tmp_path, monkeypatch):
+    journal = RoutingJournal(str(tmp_path), index_every=10, fsync="never")
+    journal.append_many([make_signal(i) for i in range(100)] + [make_signal(i, "USDJPY") for i in range(100, 105)])
+    journal.close()
+
+    parsed = []
+    original = RoutingJournal._matching
+
+    def counting(lines, *args):
+        parsed.extend(lines)
+        return original(lines, *args)
+
+    monkeypatch.setattr(RoutingJournal, "_matching", staticmethod(counting))
+
+    assert [s["id"] for s in journal.read(symbol="USDJPY")] == list(range(100, 105))
+    assert len(parsed) == 5
+    parsed.clear()
+    assert [s["id"] for s in journal.read(START + datetime.timedelta(minutes=42),
+                                          START + datetime.timedelta(minutes=44))] == [42, 43]
+    assert len(parsed) == 10
+
+
+def test_unindexed_tail_survives_restart_and_replays(tmp_path):
+    writer = RoutingJournal(str(tmp_path), index_every=100, fsync="always")
+    writer.append_many(make_signal(i) for i in range(5))
+    writer.flush()  # no index block yet: simulates a crash before the segment closed
+
+    restarted = RoutingJournal(str(tmp_path), index_every=100)
+    restarted.append(make_signal(5))
+
+    received = []
+    assert replay(restarted, received.append) == 6
+    assert [s["id"] for s in received] == list(range(6))
+    assert len(restarted.segments()) == 2
+
+
+def test_rejects_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        RoutingJournal(str(tmp_path), fsync="sometimes")
@@ -0,0 +1,46 @@
+import base64
+
+import pytest
+from cryptography.fernet import Fernet
+
+from signal_envelope import Envelope, derive_key
+
+SIGNAL = {"symbol": "EURUSD", "direction": "BUY", "confidence": 0.75, "reason": "Momentum Long"}
+
+
+@pytest.mark.parametrize("mode", ["fernet", "aesgcm", "chacha20"])
+def test_round_trip_in_text_and_raw_form(mode):
+    key = Fernet.generate_key()
+    sealed = Envelope(mode, key).seal(SIGNAL)
+
+    # Any receiver holding the key can open any mode, whichever form it was sent in.
+    receiver = Envelope("fernet", key)
+    assert receiver.open(sealed.text) == SIGNAL
+    assert receiver.open(sealed.raw) == SIGNAL
+
+
+def test_wrong_key_is_rejected():
+    sealed = Envelope("aesgcm", Fernet.generate_key()).seal(SIGNAL)
+    with pytest.raises(Exception):
+        Envelope("aesgcm", Fernet.generate_key()).open(sealed.text)
+
+
+def test_each_cipher_uses_its_own_subkey():
+    secret = Fernet.generate_key()
+    raw = base64.urlsafe_b64decode(secret)
+    keys = {mode: derive_key(raw, mode) for mode in ("fernet", "aesgcm", "chacha20")}
+
+    assert len(set(keys.values())) == 3 and raw not in keys.values()
+    with pytest.raises(Exception):
+        Fernet(secret).decrypt(Envelope("fernet", secret).seal(SIGNAL).raw)  # not the shared secret
+
+
+def test_plain_mode_is_json():
+    assert Envelope("none").open(Envelope("none").seal(SIGNAL).text) == SIGNAL
+
+
+def test_missing_key_fails(monkeypatch, tmp_path):
+    monkeypatch.delenv("SIGNAL_ENVELOPE_KEY", raising=False)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        Envelope("fernet")
@@ -0,0 +1,52 @@
+import sqlite3
+
+from sqlite_writer import BatchedWriter, connect
+
+
+def make_db(path):
+    conn = connect(str(path))
+    conn.execute("CREATE TABLE signals (symbol TEXT, confidence REAL)")
+    conn.commit()
+    conn.close()
+
+
+def test_rows_are_group_committed(tmp_path):
+    db = tmp_path / "signals.db"
+    make_db(db)
+    writer = BatchedWriter(str(db), "INSERT INTO signals VALUES (?, ?)", batch_size=100, flush_interval=0.05)
+    for i in range(250):
+        writer.write(("EURUSD", i / 250))
+    assert writer.flush(timeout=5)
+
+    conn = sqlite3.connect(str(db))
+    assert conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 250
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    assert writer.close(timeout=5)
+    assert not writer.thread.is_alive()
+
+
+def test_failed_batch_does_not_stop_writer(tmp_path):
+    db = tmp_path / "signals.db"
+    make_db(db)
+    writer = BatchedWriter(str(db), "INSERT INTO signals VALUES (?, ?)", flush_interval=0.01)
+    writer.write(("EURUSD",))  # wrong arity: this batch fails
+    writer.flush(timeout=5)
+    writer.write(("GBPUSD", 0.7))
+    writer.close(timeout=5)
+    assert sqlite3.connect(str(db)).execute("SELECT symbol FROM signals").fetchall() == [("GBPUSD",)]
+
+
+def test_poisoned_row_does_not_sink_its_batch(tmp_path):
+    db = tmp_path / "signals.db"
+    conn = connect(str(db))
+    conn.execute("CREATE TABLE signals (symbol TEXT NOT NULL, confidence REAL CHECK (confidence <= 1))")
+    conn.close()
+    writer = BatchedWriter(str(db), "INSERT INTO signals VALUES (?, ?)", batch_size=500, flush_interval=0.05)
+    for i in range(100):
+        writer.write(("EURUSD", 2.0) if i == 40 else ("EURUSD", i / 100))
+    assert writer.close(timeout=5)
+
+    rows = sqlite3.connect(str(db)).execute("SELECT confidence FROM signals").fetchall()
+    assert len(rows) == 99 and (0.4,) not in rows
+    assert writer.rejected == 1
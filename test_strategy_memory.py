@@ -0,0 +1,53 @@
+import json
+import os
+
+from strategy_memory import RedisStrategyMemory, SnapshotStrategyMemory
+
+
+def test_snapshot_store_writes_behind_atomically(tmp_path):
+    path = str(tmp_path / "failed_strategies.json")
+    store = SnapshotStrategyMemory(path, snapshot_interval=3600)
+    for _ in range(3):
+        store.mark_failure("momentum")
+    store.mark_failure("crossover")
+    store.mark_success("crossover")
+
+    assert store.failures("momentum") == 3 and store.failures("crossover") == 0
+    assert not os.path.exists(path)  # nothing written per call
+    assert store.snapshot() and not store.snapshot()  # unchanged counts are not rewritten
+    assert not os.path.exists(path + ".tmp")
+
+    store.mark_failure("breakout")
+    store.close()
+    with open(path) as f:
+        assert json.load(f) == {"momentum": 3, "breakout": 1}
+    assert SnapshotStrategyMemory(path, snapshot_interval=3600).failures("momentum") == 3
+
+
+class FakeRedisHash:
+    def __init__(self):
+        self.hashes = {}
+
+    def hget(self, key, field):
+        value = self.hashes.get(key, {}).get(field)
+        return None if value is None else str(value)
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+        return fields[field]
+
+    def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+
+def test_redis_store_is_shared_between_workers():
+    client = FakeRedisHash()
+    first, second = RedisStrategyMemory(client, "failed"), RedisStrategyMemory(client, "failed")
+
+    first.mark_failure("momentum")
+    second.mark_failure("momentum")
+    assert first.failures("momentum") == 2 == second.failures("momentum")
+
+    second.mark_success("momentum")
+    assert first.failures("momentum") == 0 and client.hashes["failed"] == {}
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import strategy_registry
+
+
+def make_frame(momentum, rsi, ma_20, ma_50):
+    return pd.DataFrame({"momentum": momentum, "rsi": rsi, "ma_20": ma_20, "ma_50": ma_50})
+
+
+def test_latest_rows_stacks_last_and_previous_bar():
+    frames = {
+        "EURUSD": make_frame([1, 2, 3], [50, 60, 70], [1.0, 1.1, 1.2], [1.0, 1.0, 1.0]),
+        "USDJPY": make_frame([-1], [40], [150.0], [151.0]),
+    }
+    rows = strategy_registry.latest_rows(frames)
+
+    assert list(rows.index) == ["EURUSD", "USDJPY"]
+    assert rows.loc["EURUSD", "momentum"] == 3 and rows.loc["EURUSD", "prev_momentum"] == 2
+    assert rows.loc["USDJPY", "rsi"] == 40 and np.isnan(rows.loc["USDJPY", "prev_rsi"])
+
+
+def test_evaluate_matches_original_rules():
+    frames = {
+        "EURUSD": make_frame([0, 1], [50, 60], [0.9, 1.1], [1.0, 1.0]),    # momentum long + bullish cross
+        "GBPUSD": make_frame([0, -1], [50, 40], [1.1, 1.1], [1.0, 1.0]),   # momentum short, no cross
+        "USDJPY": make_frame([-1], [40], [150.0], [151.0]),                # single bar: crossover cannot fire
+    }
+    fired = strategy_registry.evaluate(strategy_registry.latest_rows(frames))
+    reasons = [s.reason for s in strategy_registry.REGISTRY]
+
+    def fired_for(row):
+        return {reasons[col] for col in np.flatnonzero(fired[row])}
+
+    assert fired_for(0) == {"Momentum Long", "MA Bullish Crossover"}
+    assert fired_for(1) == {"Momentum Short"}
+    assert fired_for(2) == {"Momentum Short"}
+
+
+def test_custom_registry_is_one_more_column():
+    registry = list(strategy_registry.REGISTRY)
+    strategy_registry.register_strategy("RSI", "RSI Oversold", "rsi < 30 and prev_rsi >= 30", 1, 0.5, registry=registry)
+    frames = {"EURUSD": make_frame([0, 0], [35, 25], [1, 1], [1, 1])}
+
+    fired = strategy_registry.evaluate(strategy_registry.latest_rows(frames), registry)
+
+    assert fired.shape == (1, len(strategy_registry.REGISTRY) + 1)
+    assert fired[0, -1]
@@ -0,0 +1,13 @@
+# Time conversions shared by the router, the routing journal, the economic filter and the event index.
+import datetime
+
+
+def to_epoch(value):
+    """ISO string, datetime or epoch seconds -> epoch seconds. Naive times are taken as UTC."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()